@@ -0,0 +1,267 @@
+"""
+Times and memory-profiles every pipeline engine on synthetic data at several input sizes,
+saves the results as JSON and compares them with a saved baseline.
+
+    python -m benchmarks.bench_engines --save-baseline           # record benchmarks/baseline.json
+    python -m benchmarks.bench_engines --threshold 20            # exit 1 on a >20% regression
+    python -m benchmarks.bench_engines --sizes 200 --engines physics,eraser
+"""
+import os
+import io
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+from datetime import datetime
+from statistics import median
+from typing import Callable, Dict, List, Sequence
+import numpy as np
+import pandas as pd
+from src.synthetic_data import SyntheticDataGenerator
+from src.load_data import DataLoader
+from src.data_preprocessor import DataPreProcessor
+from src.physics_engine import PhysicsEngine
+from src.context_engine import ContextEngine
+from src.eraser_engine import EraserEngine
+from src.benchmarking_engine import BenchmarkingEngine
+from src.data_exporter import DataExporter
+from src.analysis.table_generator import TableGenerator
+from src.analysis.animation_engine import AnimationEngine
+from src.telemetry import peak_rss_mb
+
+ENGINES = ['preprocess', 'physics', 'context', 'eraser', 'benchmarking', 'export', 'tables', 'animation']
+DEFAULT_SIZES = [100, 400, 1600]  # plays, over two synthetic weeks
+# Rendering a play dominates everything else; one timed run is plenty
+REPEAT_OVERRIDES = {'animation': 1}
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+
+def measure(fn: Callable, setup: Callable = tuple, repeat: int = 3):
+    """
+    One run under tracemalloc (peak Python allocations, also the warm-up), then `repeat`
+    timed runs without it. setup() builds fresh arguments for each run, outside the timing.
+    """
+    gc.collect()
+    args = setup()
+    tracemalloc.start()
+    result = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del args
+
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+        del args
+
+    return result, {'wall_s': round(min(times), 4), 'wall_median_s': round(median(times), 4),
+                    'repeat': repeat, 'peak_mb': round(peak / 1024 ** 2, 2), 'rss_mb': round(peak_rss_mb(), 1)}
+
+
+def _quiet(fn: Callable) -> Callable:
+    """
+    Engines print progress; keep the benchmark output readable.
+    """
+    def run(*args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+    return run
+
+
+def run_size(n_plays: int, work_dir: str, engines: Sequence[str] = ENGINES, repeat: int = 3,
+             seed: int = 42) -> List[Dict]:
+    """
+    Generates n_plays synthetic plays and runs the engine chain on them. Each engine's
+    output feeds the next; engines not in `engines` still run once (untimed) for that.
+    """
+    size_dir = os.path.join(work_dir, f'plays_{n_plays}')
+    with contextlib.redirect_stdout(io.StringIO()):
+        paths = SyntheticDataGenerator(weeks=2, plays_per_week=-(-n_plays // 2), seed=seed).generate(size_dir)
+        loader = DataLoader(paths['data_dir'], paths['supp_file'])
+        raw_supp = loader.load_supplementary()
+        raw_weeks = list(loader.stream_weeks())
+
+    records = []
+
+    def bench(name: str, fn: Callable, setup: Callable = tuple, rows_in: int = 0):
+        if name not in engines:
+            return _quiet(fn)(*setup())
+        result, stats = measure(_quiet(fn), setup, REPEAT_OVERRIDES.get(name, repeat))
+        records.append({'engine': name, 'size': n_plays, 'rows_in': int(rows_in), **stats})
+        print(f"   -> {name:<12} {n_plays:>6} plays  {stats['wall_s']:>8.3f}s  peak {stats['peak_mb']:>8.1f} MB")
+        return result
+
+    # 1. DATA ENGINEERING
+    def preprocess(supp, weeks):
+        processor = DataPreProcessor()
+        return processor.run(iter(weeks), supp), processor.player_play_df
+
+    df_frames, df_players = bench(
+        'preprocess', preprocess,
+        lambda: (raw_supp.copy(), [(w, i.copy(), o.copy()) for w, i, o in raw_weeks]),
+        rows_in=sum(len(i) + len(o) for _, i, o in raw_weeks))
+
+    df_physics = bench('physics', PhysicsEngine().derive_metrics, lambda: (df_frames.copy(),), len(df_frames))
+    df_context = bench('context', ContextEngine().calculate_void_context, lambda: (df_physics,), len(df_physics))
+    df_metrics = bench('eraser', EraserEngine().calculate_eraser, lambda: (df_physics, df_context), len(df_physics))
+    df_summary = bench('benchmarking',
+                       lambda m, c, p: BenchmarkingEngine().calculate_ceoe(df_metrics=m, df_context=c, df_players=p),
+                       lambda: (df_metrics, df_context, df_players), len(df_metrics))
+
+    export_dir = os.path.join(size_dir, 'processed')
+    os.makedirs(export_dir, exist_ok=True)
+
+    def export(summary, physics, players):
+        DataExporter(export_dir).export_results(
+            df_summary=summary, df_frames=(week_df for _, week_df in physics.groupby('week', sort=True)),
+            df_players=players)
+
+    bench('export', export, lambda: (df_summary, df_physics, df_players), len(df_physics))
+
+    # 2. ANALYSIS (reads the exported files, like the vis pipeline)
+    summary_csv = pd.read_csv(os.path.join(export_dir, 'eraser_analysis_summary.csv'))
+    bench('tables', lambda df: TableGenerator(df).run_all_analyses(), lambda: (summary_csv.copy(),), len(summary_csv))
+
+    if 'animation' in engines and not summary_csv.empty:
+        frames_csv = pd.read_csv(os.path.join(export_dir, 'master_animation_data.csv'))
+        row = summary_csv.iloc[0]
+        animator = AnimationEngine(summary_csv, frames_csv, os.path.join(size_dir, 'animations'))
+        bench('animation', lambda: animator.generate_video(row['game_id'], row['play_id'], row['nfl_id'],
+                                                           filename='bench_play.gif'),
+              rows_in=len(frames_csv))
+
+    return records
+
+
+def run_suite(sizes: Sequence[int] = DEFAULT_SIZES, engines: Sequence[str] = ENGINES, repeat: int = 3,
+              seed: int = 42, work_dir: str = None) -> Dict:
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        raise ValueError(f"Unknown engine(s): {sorted(unknown)}. Valid: {ENGINES}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        records = []
+        for n_plays in sizes:
+            print(f"Benchmarking {n_plays} plays...")
+            records.extend(run_size(n_plays, work_dir or tmp, engines, repeat, seed))
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'machine': platform.machine(), 'cpu_count': os.cpu_count(),
+            'pandas': pd.__version__, 'numpy': np.__version__,
+            'sizes': list(sizes), 'engines': list(engines), 'repeat': repeat, 'seed': seed
+        },
+        'results': records
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold_pct: float = 20.0, memory_threshold_pct: float = None,
+            min_seconds: float = 0.05, min_mb: float = 1.0) -> pd.DataFrame:
+    """
+    One row per (engine, size) with the change against the baseline.
+
+    A run regresses when it is more than threshold_pct slower (or memory_threshold_pct
+    heavier) AND the absolute difference clears min_seconds / min_mb, so that
+    millisecond-scale timing noise never fails a build.
+    """
+    memory_threshold_pct = threshold_pct if memory_threshold_pct is None else memory_threshold_pct
+    keys = ['engine', 'size']
+    cur = pd.DataFrame(current['results'])
+    base = pd.DataFrame(baseline['results'])
+    if cur.empty:
+        return pd.DataFrame(columns=keys + ['status'])
+
+    df = cur[keys + ['wall_s', 'peak_mb']].merge(
+        base[keys + ['wall_s', 'peak_mb']].rename(columns={'wall_s': 'base_wall_s', 'peak_mb': 'base_peak_mb'}),
+        on=keys, how='left')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df['wall_change_pct'] = (100 * (df['wall_s'] / df['base_wall_s'] - 1)).round(1)
+        df['peak_change_pct'] = (100 * (df['peak_mb'] / df['base_peak_mb'] - 1)).round(1)
+
+    slower = (df['wall_change_pct'] > threshold_pct) & (df['wall_s'] - df['base_wall_s'] > min_seconds)
+    heavier = (df['peak_change_pct'] > memory_threshold_pct) & (df['peak_mb'] - df['base_peak_mb'] > min_mb)
+    faster = (df['wall_change_pct'] < -threshold_pct) & (df['base_wall_s'] - df['wall_s'] > min_seconds)
+
+    df['status'] = np.select(
+        [df['base_wall_s'].isna(), slower & heavier, slower, heavier, faster],
+        ['new', 'REGRESSION (time+memory)', 'REGRESSION (time)', 'REGRESSION (memory)', 'improved'], 'ok')
+
+    return df[keys + ['base_wall_s', 'wall_s', 'wall_change_pct', 'base_peak_mb', 'peak_mb',
+                      'peak_change_pct', 'status']]
+
+
+def regressions(comparison: pd.DataFrame) -> pd.DataFrame:
+    return comparison[comparison['status'].str.startswith('REGRESSION')]
+
+
+def write_results(results: Dict, path: str = None) -> str:
+    path = path or os.path.join(RESULTS_DIR, f"engines_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def load_results(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Engine benchmark suite with regression thresholds")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated input sizes in plays (synthetic data, two weeks).")
+    parser.add_argument('--engines', default='all', help=f"Comma-separated subset of {ENGINES}, or 'all'.")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per engine and size (best is kept).")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help="Results JSON (default: benchmarks/results/engines_<time>.json).")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument('--save-baseline', action='store_true', help="Also write the results as the new baseline.")
+    parser.add_argument('--threshold', type=float, default=20.0, help="Allowed slowdown in percent.")
+    parser.add_argument('--memory-threshold', type=float, default=None,
+                        help="Allowed peak-memory growth in percent (default: --threshold).")
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help="Ignore slowdowns smaller than this many seconds (timer noise).")
+    parser.add_argument('--work-dir', default=None, help="Keep the generated data and exports here.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    engines = ENGINES if args.engines == 'all' else [e.strip() for e in args.engines.split(',') if e.strip()]
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    results = run_suite(sizes, engines, repeat=args.repeat, seed=args.seed, work_dir=args.work_dir)
+    print(f"\nResults saved: {write_results(results, args.output)}")
+
+    failed = False
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        comparison = compare(results, load_results(args.baseline), args.threshold,
+                             args.memory_threshold, args.min_seconds)
+        print(f"\n--- Against baseline {args.baseline} (threshold {args.threshold:g}%) ---")
+        print(comparison.to_string(index=False))
+        failed = not regressions(comparison).empty
+    elif not args.save_baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.")
+
+    if args.save_baseline:
+        print(f"Baseline saved: {write_results(results, args.baseline)}")
+
+    if failed:
+        print(f"\n{len(regressions(comparison))} regression(s) beyond {args.threshold:g}%.")
+        sys.exit(1)
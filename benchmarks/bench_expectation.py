@@ -0,0 +1,70 @@
+"""
+Compares the CEOE expectation backends on an existing summary report.
+
+    python -m benchmarks.bench_expectation --summary data/processed/eraser_analysis_summary.csv
+"""
+import argparse
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from src.benchmarking_engine import BenchmarkingEngine
+from src.expectation_model import ExpectedClosingModel
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(df_report: pd.DataFrame, holdout_frac: float = 0.2, seed: int = 42) -> pd.DataFrame:
+    """
+    Fit on a train split, score on the holdout, report time and residual spread.
+    """
+    df_report = df_report.dropna(subset=['avg_closing_speed']).reset_index(drop=True)
+
+    rng = np.random.default_rng(seed)
+    test_mask = rng.random(len(df_report)) < holdout_frac
+    train, test = df_report[~test_mask], df_report[test_mask]
+
+    engine = BenchmarkingEngine()
+    rows = []
+
+    # Backend 1: groupby cell means (map-reduce partials)
+    baselines, fit_s = _timed(lambda: engine.merge_partials([engine.baseline_partials(train)]))
+
+    def score_cells():
+        expected = test.merge(baselines[engine.BASELINE_KEYS + ['baseline_mean']],
+                              on=engine.BASELINE_KEYS, how='left')['baseline_mean']
+        return expected.fillna(train['avg_closing_speed'].mean()).values
+
+    expected, score_s = _timed(score_cells)
+    rows.append({'backend': 'cell_mean', 'fit_s': fit_s, 'cached_fit_s': np.nan, 'score_s': score_s,
+                 'residual_std': np.std(test['avg_closing_speed'].values - expected)})
+
+    # Backend 2: context model (cold fit, then warm cache)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        model = ExpectedClosingModel(cache_dir=cache_dir)
+        _, fit_s = _timed(lambda: model.fit(train))
+        _, cached_s = _timed(lambda: ExpectedClosingModel(cache_dir=cache_dir).fit(train))
+        expected, score_s = _timed(lambda: model.predict(test))
+
+    rows.append({'backend': 'context_model', 'fit_s': fit_s, 'cached_fit_s': cached_s, 'score_s': score_s,
+                 'residual_std': np.std(test['avg_closing_speed'].values - expected)})
+
+    result = pd.DataFrame(rows)
+    result['train_rows'] = len(train)
+    result['test_rows'] = len(test)
+
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CEOE expectation backend benchmark")
+    parser.add_argument('--summary', default='data/processed/eraser_analysis_summary.csv')
+    parser.add_argument('--holdout', type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = pd.read_csv(args.summary)
+    print(run_benchmark(report, holdout_frac=args.holdout).round(4).to_string(index=False))
@@ -0,0 +1,246 @@
+"""
+Runs the frozen reference engines (benchmarks.reference_engines) next to candidate backends on
+the same inputs and reports, per engine: row-set differences, per-column max/mean deviation,
+and the speedup.
+
+    python -m benchmarks.equivalence --plays 400
+    python -m benchmarks.equivalence --data-dir data/train --supp-file data/supplementary_data.csv --weeks 1
+    python -m benchmarks.equivalence --candidate physics=mypkg.fast_physics:derive_metrics
+
+A candidate is any callable with the reference's signature. By default each engine is checked
+against the current src implementation.
+"""
+import os
+import io
+import sys
+import json
+import argparse
+import importlib
+import tempfile
+import contextlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from benchmarks import reference_engines as ref
+from benchmarks.bench_engines import measure, RESULTS_DIR
+from src.synthetic_data import SyntheticDataGenerator
+from src.load_data import DataLoader
+from src.selection import RunSelection
+from src.data_preprocessor import DataPreProcessor
+from src.physics_engine import PhysicsEngine
+from src.context_engine import ContextEngine
+from src.eraser_engine import EraserEngine
+from src.benchmarking_engine import BenchmarkingEngine
+
+
+@dataclass
+class EquivalenceCase:
+    reference: Callable
+    current: Callable
+    keys: List[str]
+    inputs: Callable  # state -> positional args
+
+
+CASES = {
+    'physics': EquivalenceCase(
+        ref.derive_metrics, lambda df: PhysicsEngine().derive_metrics(df),
+        ['game_id', 'play_id', 'nfl_id', 'frame_id'], lambda s: (s['frames'],)),
+    'context': EquivalenceCase(
+        ref.calculate_void_context, lambda df: ContextEngine().calculate_void_context(df),
+        ['game_id', 'play_id'], lambda s: (s['physics'],)),
+    'eraser': EquivalenceCase(
+        ref.calculate_eraser, lambda df, ctx: EraserEngine().calculate_eraser(df, ctx),
+        ['game_id', 'play_id', 'nfl_id'], lambda s: (s['physics'], s['context'])),
+    'benchmarking': EquivalenceCase(
+        ref.calculate_ceoe,
+        lambda m, c, p: BenchmarkingEngine().calculate_ceoe(df_metrics=m, df_context=c, df_players=p),
+        ['game_id', 'play_id', 'nfl_id'], lambda s: (s['metrics'], s['context'], s['players'])),
+}
+
+
+def compare_frames(reference: pd.DataFrame, candidate: pd.DataFrame, keys: Sequence[str],
+                   atol: float = 1e-9, rtol: float = 1e-7) -> Tuple[Dict, pd.DataFrame]:
+    """
+    Aligns two outputs on their keys (row order never matters).
+    Returns a summary dict and one row per shared column with its deviations.
+    """
+    keys = list(keys)
+    summary = {
+        'rows_reference': len(reference), 'rows_candidate': len(candidate),
+        'missing_columns': sorted(set(reference.columns) - set(candidate.columns)),
+        'extra_columns': sorted(set(candidate.columns) - set(reference.columns)),
+        'duplicate_keys_reference': int(reference.duplicated(keys).sum()),
+        'duplicate_keys_candidate': int(candidate.duplicated(keys).sum()),
+    }
+
+    rows = reference[keys].drop_duplicates().merge(
+        candidate[keys].drop_duplicates(), on=keys, how='outer', indicator=True)
+    only_ref, only_cand = rows[rows['_merge'] == 'left_only'], rows[rows['_merge'] == 'right_only']
+    summary['only_in_reference'] = len(only_ref)
+    summary['only_in_candidate'] = len(only_cand)
+    summary['sample_only_in_reference'] = only_ref[keys].head(5).values.tolist()
+    summary['sample_only_in_candidate'] = only_cand[keys].head(5).values.tolist()
+
+    columns = [c for c in reference.columns if c in candidate.columns and c not in keys]
+    aligned = reference.drop_duplicates(keys)[keys + columns].merge(
+        candidate.drop_duplicates(keys)[keys + columns], on=keys, how='inner', suffixes=('_ref', '_cand'))
+
+    report = []
+    for col in columns:
+        a, b = aligned[f'{col}_ref'], aligned[f'{col}_cand']
+        row = {'column': col, 'compared': len(aligned)}
+        if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b) \
+                and not pd.api.types.is_bool_dtype(a):
+            a, b = a.astype(float).values, b.astype(float).values
+            both = ~np.isnan(a) & ~np.isnan(b)
+            diff = np.abs(a[both] - b[both])
+            scale = np.maximum(np.abs(a[both]), np.abs(b[both]))
+            row['nan_mismatch'] = int((np.isnan(a) != np.isnan(b)).sum())
+            row['max_abs_dev'] = float(diff.max()) if diff.size else 0.0
+            row['mean_abs_dev'] = float(diff.mean()) if diff.size else 0.0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                row['max_rel_dev'] = float(np.nanmax(np.where(scale > 0, diff / scale, 0.0))) if diff.size else 0.0
+            row['mismatched'] = int((~np.isclose(a, b, rtol=rtol, atol=atol, equal_nan=True)).sum())
+        else:
+            a, b = a.astype(object), b.astype(object)
+            equal = (a == b) | (a.isna() & b.isna())
+            row.update({'nan_mismatch': int((a.isna() != b.isna()).sum()), 'max_abs_dev': np.nan,
+                        'mean_abs_dev': np.nan, 'max_rel_dev': np.nan, 'mismatched': int((~equal).sum())})
+        report.append(row)
+
+    report = pd.DataFrame(report, columns=['column', 'compared', 'max_abs_dev', 'mean_abs_dev', 'max_rel_dev',
+                                           'nan_mismatch', 'mismatched'])
+    summary['max_abs_dev'] = float(report['max_abs_dev'].max()) if report['max_abs_dev'].notna().any() else 0.0
+    summary['mismatched_cells'] = int(report['mismatched'].sum())
+    summary['equivalent'] = bool(
+        not summary['missing_columns'] and summary['only_in_reference'] == 0
+        and summary['only_in_candidate'] == 0 and summary['mismatched_cells'] == 0
+        and summary['duplicate_keys_reference'] == summary['duplicate_keys_candidate'])
+    return summary, report
+
+
+def build_inputs(loader: DataLoader) -> Dict[str, pd.DataFrame]:
+    """
+    Runs the reference chain once, so every candidate sees exactly the reference's upstream
+    outputs and deviations never compound from stage to stage.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor = DataPreProcessor()
+        frames = processor.run(loader.stream_weeks(), loader.load_supplementary())
+    state = {'frames': frames, 'players': processor.player_play_df}
+    state['physics'] = ref.derive_metrics(frames.copy())
+    state['context'] = ref.calculate_void_context(state['physics'])
+    state['metrics'] = ref.calculate_eraser(state['physics'], state['context'])
+    return state
+
+
+def load_candidate(spec: str) -> Callable:
+    """
+    'package.module:function' -> callable.
+    """
+    module, _, attr = spec.partition(':')
+    if not attr:
+        raise ValueError(f"Candidate must look like 'package.module:function', got {spec!r}")
+    return getattr(importlib.import_module(module), attr)
+
+
+def run_equivalence(state: Dict[str, pd.DataFrame], candidates: Dict[str, Callable] = None,
+                    engines: Sequence[str] = tuple(CASES), repeat: int = 3,
+                    atol: float = 1e-9, rtol: float = 1e-7) -> Dict:
+    candidates = candidates or {}
+    unknown = set(engines) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown engine(s): {sorted(unknown)}. Valid: {list(CASES)}")
+
+    engines_report, columns_report = [], []
+    for name in engines:
+        case = CASES[name]
+        candidate = candidates.get(name, case.current)
+        setup = lambda: tuple(a.copy() for a in case.inputs(state))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected, ref_stats = measure(case.reference, setup, repeat)
+            actual, cand_stats = measure(candidate, setup, repeat)
+
+        summary, columns = compare_frames(expected, actual, case.keys, atol=atol, rtol=rtol)
+        summary.update({
+            'engine': name,
+            'candidate': getattr(candidate, '__qualname__', repr(candidate)) if name in candidates else 'current',
+            'reference_s': ref_stats['wall_s'], 'candidate_s': cand_stats['wall_s'],
+            'speedup': round(ref_stats['wall_s'] / cand_stats['wall_s'], 2) if cand_stats['wall_s'] else None,
+            'reference_peak_mb': ref_stats['peak_mb'], 'candidate_peak_mb': cand_stats['peak_mb']
+        })
+        engines_report.append(summary)
+        columns_report.extend(dict(row, engine=name) for row in columns.to_dict('records'))
+
+    return {
+        'meta': {'created': datetime.now().isoformat(timespec='seconds'), 'repeat': repeat,
+                 'atol': atol, 'rtol': rtol, 'frames': len(state['frames'])},
+        'engines': engines_report,
+        'columns': columns_report
+    }
+
+
+def print_report(results: Dict):
+    summary = pd.DataFrame(results['engines'])[
+        ['engine', 'candidate', 'rows_reference', 'rows_candidate', 'only_in_reference', 'only_in_candidate',
+         'max_abs_dev', 'mismatched_cells', 'reference_s', 'candidate_s', 'speedup', 'equivalent']]
+    print("\n--- Equivalence against the frozen references ---")
+    print(summary.to_string(index=False))
+
+    columns = pd.DataFrame(results['columns'])
+    deviating = columns[(columns['mismatched'] > 0) | (columns['max_abs_dev'] > 0)]
+    if not deviating.empty:
+        print("\n--- Deviating columns ---")
+        print(deviating[['engine', 'column', 'compared', 'max_abs_dev', 'mean_abs_dev', 'max_rel_dev',
+                         'nan_mismatch', 'mismatched']].to_string(index=False))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Reference-vs-candidate engine equivalence harness")
+    parser.add_argument('--data-dir', default=None, help="Real BDB train/ directory (default: synthetic data).")
+    parser.add_argument('--supp-file', default=None)
+    parser.add_argument('--weeks', default=None, help="Real data only: restrict to these weeks, e.g. 1-2.")
+    parser.add_argument('--plays', type=int, default=400, help="Synthetic plays (over two weeks).")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--engines', default=','.join(CASES), help=f"Comma-separated subset of {list(CASES)}.")
+    parser.add_argument('--candidate', action='append', default=[], metavar='ENGINE=MODULE:FUNC',
+                        help="Alternative backend for an engine (same signature as the reference). Repeatable.")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--atol', type=float, default=1e-9)
+    parser.add_argument('--rtol', type=float, default=1e-7)
+    parser.add_argument('--output', default=None,
+                        help="Report JSON (default: benchmarks/results/equivalence_<time>.json).")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    candidates = {}
+    for item in args.candidate:
+        engine, _, spec = item.partition('=')
+        candidates[engine.strip()] = load_candidate(spec.strip())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.data_dir:
+            loader = DataLoader(args.data_dir, args.supp_file, selection=RunSelection.from_args(weeks=args.weeks))
+        else:
+            with contextlib.redirect_stdout(io.StringIO()):
+                paths = SyntheticDataGenerator(weeks=2, plays_per_week=-(-args.plays // 2), seed=args.seed).generate(tmp)
+            loader = DataLoader(paths['data_dir'], paths['supp_file'])
+        state = build_inputs(loader)
+
+    results = run_equivalence(state, candidates, [e.strip() for e in args.engines.split(',') if e.strip()],
+                              repeat=args.repeat, atol=args.atol, rtol=args.rtol)
+    print_report(results)
+
+    path = args.output or os.path.join(RESULTS_DIR, f"equivalence_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"\nReport saved: {path}")
+
+    if not all(e['equivalent'] for e in results['engines']):
+        sys.exit(1)
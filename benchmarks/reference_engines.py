@@ -0,0 +1,203 @@
+"""
+Frozen reference implementations of the numeric engines (pandas, engine VERSION 1).
+
+These are verbatim copies of PhysicsEngine.derive_metrics, ContextEngine.calculate_void_context,
+EraserEngine.calculate_eraser and BenchmarkingEngine.calculate_ceoe (cell backend) as plain
+functions. They are the yardstick for benchmarks.equivalence: do not optimize or "fix" them.
+A deliberate behaviour change in an engine gets a new reference here, with the VERSION bump.
+"""
+import pandas as pd
+import numpy as np
+from scipy.signal import savgol_filter
+from src.schema import (PhysicsSchema, ContextSchema, EraserMetricsSchema, BenchMarkingSchema,
+                        AnalysisReportSchema, BaselinePartialsSchema)
+
+BASELINE_KEYS = ['player_position', 'void_type']
+
+
+# 1. PHYSICS
+def derive_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.sort_values(['game_id', 'play_id', 'nfl_id', 'frame_id'])
+
+    WINDOW = 7
+    POLY = 2
+
+    def calculate_sg(group):
+        if len(group) < WINDOW:
+            vx = group['x'].diff().fillna(0) / 0.1
+            vy = group['y'].diff().fillna(0) / 0.1
+            ax = vx.diff().fillna(0) / 0.1
+            ay = vy.diff().fillna(0) / 0.1
+            s = np.sqrt(vx**2 + vy**2)
+            a = np.sqrt(ax**2 + ay**2)
+            return pd.DataFrame({'s_derived': s, 'a_derived': a}, index=group.index)
+
+        vx = savgol_filter(group['x'], window_length=WINDOW, polyorder=POLY, deriv=1, delta=0.1)
+        vy = savgol_filter(group['y'], window_length=WINDOW, polyorder=POLY, deriv=1, delta=0.1)
+        ax = savgol_filter(group['x'], window_length=WINDOW, polyorder=POLY, deriv=2, delta=0.1)
+        ay = savgol_filter(group['y'], window_length=WINDOW, polyorder=POLY, deriv=2, delta=0.1)
+        s = np.sqrt(vx**2 + vy**2)
+        a = np.sqrt(ax**2 + ay**2)
+        return pd.DataFrame({'s_derived': s, 'a_derived': a}, index=group.index)
+
+    mask_players = df['nfl_id'].notna()
+    physics_cols = df[mask_players].groupby(
+        ['game_id', 'play_id', 'nfl_id'], group_keys=False).apply(calculate_sg, include_groups=False)
+
+    df.loc[physics_cols.index, 's_derived'] = physics_cols['s_derived']
+    df.loc[physics_cols.index, 'a_derived'] = physics_cols['a_derived']
+
+    return PhysicsSchema.validate(df)
+
+
+# 2. CONTEXT
+def calculate_void_context(df: pd.DataFrame) -> pd.DataFrame:
+    df_pre = df[df['phase'] == 'pre_throw'].copy()
+
+    last_frame_ids = df_pre.groupby(['game_id', 'play_id'])['frame_id'].transform('max')
+    throw_frames = df_pre[df_pre['frame_id'] == last_frame_ids].copy()
+
+    targets = throw_frames[throw_frames['player_role'].astype(str).str.strip() == 'Targeted Receiver'][
+        ['game_id', 'play_id', 'nfl_id', 'x', 'y', 'week']
+    ].rename(columns={'nfl_id': 'target_nfl_id', 'x': 't_x', 'y': 't_y'})
+
+    defenders = throw_frames[throw_frames['player_role'].astype(str).str.strip() == 'Defensive Coverage'][
+        ['game_id', 'play_id', 'nfl_id', 'x', 'y']
+    ].rename(columns={'nfl_id': 'def_nfl_id', 'x': 'd_x', 'y': 'd_y'})
+
+    merged = defenders.merge(targets, on=['game_id', 'play_id'], how='inner')
+    merged['dist'] = np.sqrt((merged['d_x'] - merged['t_x'])**2 + (merged['d_y'] - merged['t_y'])**2)
+
+    min_dists = merged.loc[merged.groupby(['game_id', 'play_id'])['dist'].idxmin()]
+
+    context_df = min_dists[['game_id', 'play_id', 'week', 'target_nfl_id', 'def_nfl_id', 'dist']].copy()
+    context_df = context_df.rename(columns={'def_nfl_id': 'nearest_def_nfl_id', 'dist': 'dist_at_throw'})
+
+    conditions = [(context_df['dist_at_throw'] > 5.0), (context_df['dist_at_throw'] < 2.0)]
+    choices = ['High Void', 'Tight Window']
+    context_df['void_type'] = np.select(conditions, choices, default='Neutral')
+
+    return ContextSchema.validate(context_df)
+
+
+# 3. ERASER
+def calculate_eraser(df: pd.DataFrame, context_df: pd.DataFrame,
+                     max_speed: float = 9.5, max_accel: float = 7.0) -> pd.DataFrame:
+    df_post = df[df['phase'] == 'post_throw'].copy()
+
+    targets = df_post[df_post['player_role'] == 'Targeted Receiver'][
+        ['game_id', 'play_id', 'frame_id', 'x', 'y']
+    ].rename(columns={'x': 't_x', 'y': 't_y'})
+    defenders = df_post[df_post['player_role'] == 'Defensive Coverage'][
+        ['game_id', 'play_id', 'nfl_id', 'frame_id', 'x', 'y']
+    ]
+
+    merged = defenders.merge(targets, on=['game_id', 'play_id', 'frame_id'], how='inner')
+    merged['dist_to_target'] = np.sqrt((merged['x'] - merged['t_x'])**2 + (merged['y'] - merged['t_y'])**2)
+
+    def grade_defender(group):
+        group = group.sort_values('frame_id')
+        d_start = group['dist_to_target'].iloc[0]
+        d_end = group['dist_to_target'].iloc[-1]
+        vis = d_start - d_end
+        dist_change = group['dist_to_target'].diff() * -1
+        speeds = dist_change * 10
+        avg_speed = speeds.mean()
+        return pd.Series({
+            'p_dist_at_throw': d_start,
+            'dist_at_arrival': d_end,
+            'distance_closed': max(0, vis),
+            'vis_score': vis,
+            'avg_closing_speed': avg_speed
+        })
+
+    metrics = merged.groupby(['game_id', 'play_id', 'nfl_id']).apply(grade_defender).reset_index()
+
+    intercepts = _time_to_intercept(df, merged, max_speed, max_accel)
+    metrics = metrics.merge(intercepts, on=['game_id', 'play_id', 'nfl_id'], how='left')
+
+    return EraserMetricsSchema.validate(metrics)
+
+
+def _time_to_intercept(df: pd.DataFrame, merged: pd.DataFrame, max_speed: float, max_accel: float) -> pd.DataFrame:
+    keys = ['game_id', 'play_id', 'nfl_id']
+
+    defenders = df[df['player_role'] == 'Defensive Coverage'].sort_values(keys + ['frame_id'])
+    vx = defenders.groupby(keys)['x'].diff().fillna(0) / 0.1
+    vy = defenders.groupby(keys)['y'].diff().fillna(0) / 0.1
+    defenders = defenders.assign(vx=vx, vy=vy)
+
+    post = defenders[defenders['phase'] == 'post_throw']
+    snapshot = post.drop_duplicates(subset=keys, keep='first')
+
+    snap_cols = keys + ['x', 'y', 'vx', 'vy']
+    for col in ['ball_land_x', 'ball_land_y']:
+        if col in snapshot.columns:
+            snap_cols.append(col)
+    snapshot = snapshot[snap_cols].rename(columns={'x': 'd0_x', 'y': 'd0_y'})
+
+    path = merged[keys + ['t_x', 't_y']].merge(snapshot, on=keys, how='inner')
+    path['tti'] = _time_to_reach(path['t_x'] - path['d0_x'], path['t_y'] - path['d0_y'],
+                                 path['vx'], path['vy'], max_speed, max_accel)
+    tti_target = path.groupby(keys)['tti'].min().rename('tti_target_path')
+
+    result = snapshot[keys].reset_index(drop=True)
+    if 'ball_land_x' in snapshot.columns and 'ball_land_y' in snapshot.columns:
+        result['tti_ball_land'] = _time_to_reach(
+            (snapshot['ball_land_x'] - snapshot['d0_x']).values,
+            (snapshot['ball_land_y'] - snapshot['d0_y']).values,
+            snapshot['vx'].values, snapshot['vy'].values, max_speed, max_accel)
+    else:
+        result['tti_ball_land'] = np.nan
+
+    result = result.merge(tti_target.reset_index(), on=keys, how='left')
+    result['time_to_intercept'] = np.fmin(result['tti_target_path'], result['tti_ball_land'])
+
+    return result
+
+
+def _time_to_reach(dx, dy, vx, vy, max_speed: float, max_accel: float):
+    dist = np.sqrt(dx**2 + dy**2)
+    safe_dist = np.where(dist > 0, dist, 1.0)
+
+    v0 = (vx * dx + vy * dy) / safe_dist
+    v0 = np.clip(v0, 0, max_speed)
+
+    t_accel = (max_speed - v0) / max_accel
+    d_accel = v0 * t_accel + 0.5 * max_accel * t_accel**2
+
+    t_short = (-v0 + np.sqrt(v0**2 + 2 * max_accel * dist)) / max_accel
+    t_long = t_accel + (dist - d_accel) / max_speed
+
+    return np.where(dist <= d_accel, t_short, t_long)
+
+
+# 4. BENCHMARKING (cell expectation)
+def calculate_ceoe(df_metrics: pd.DataFrame, df_context: pd.DataFrame, df_players: pd.DataFrame) -> pd.DataFrame:
+    df_meta = BenchMarkingSchema.validate(df_players)
+
+    df_report = df_metrics.merge(df_meta, on=['game_id', 'play_id', 'nfl_id'], how='left')
+    df_report = df_report.merge(
+        df_context[['game_id', 'play_id', 'void_type', 'dist_at_throw']], on=['game_id', 'play_id'], how='left')
+
+    speed = df_report['avg_closing_speed']
+    partials = df_report.assign(
+        speed_count=speed.notna().astype(int),
+        speed_sum=speed.fillna(0.0),
+        speed_sum_sq=speed.fillna(0.0)**2
+    ).groupby(BASELINE_KEYS)[['speed_count', 'speed_sum', 'speed_sum_sq']].sum().reset_index()
+    partials = BaselinePartialsSchema.validate(partials)
+
+    stats = pd.concat([partials], ignore_index=True).groupby(BASELINE_KEYS)[
+        ['speed_count', 'speed_sum', 'speed_sum_sq']].sum().reset_index()
+    count = stats['speed_count'].where(stats['speed_count'] > 0)
+    stats['baseline_mean'] = stats['speed_sum'] / count
+    variance = (stats['speed_sum_sq'] - stats['speed_sum']**2 / count) / (count - 1)
+    stats['baseline_std'] = np.sqrt(variance.clip(lower=0))
+    baselines = BaselinePartialsSchema.validate(stats)
+
+    df_final = df_report.merge(baselines[BASELINE_KEYS + ['baseline_mean']], on=BASELINE_KEYS, how='left')
+    df_final['ceoe_score'] = df_final['avg_closing_speed'] - df_final['baseline_mean']
+    df_final['ceoe_score'] = df_final['ceoe_score'].fillna(0.0)
+
+    return AnalysisReportSchema.validate(df_final)
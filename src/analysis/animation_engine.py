@@ -6,6 +6,7 @@ import matplotlib.animation as animation
 from matplotlib.offsetbox import AnchoredText
 from matplotlib.patches import Circle, Ellipse
 import os
+from src.analysis.data_loader import select_play
 
 NFL_TEAM_COLORS = {
     'BAL': {'primary': '#241773', 'secondary': '#000000', 'alternate': '#9E7C0C'},
@@ -118,10 +119,7 @@ class AnimationEngine:
         print(f"   [Animator] Rendering video for {game_id}-{play_id}...")
        
         # Get Play Data
-        play_frames = self.frames_df[
-            (self.frames_df['game_id'] == game_id) &
-            (self.frames_df['play_id'] == play_id)
-        ].sort_values('frame_id')
+        play_frames = select_play(self.frames_df, game_id, play_id).sort_values('frame_id')
        
         if play_frames.empty: return
 
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from src.utils import rank_desc
+
+
+def _bootstrap_block(values, starts, pos_onehot, prior_m, qualified, n_rep, seed):
+    """
+    One block of replicates. Poisson(1) weights stand in for resampling each
+    player's defender-plays, so the whole block is a handful of array ops.
+    Returns per-player raw / shrunk CEOE and ranks for the qualified players only.
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.poisson(1.0, size=(n_rep, len(values))).astype(np.float64)
+
+    # Rows are sorted by player, so reduceat gives per-player totals
+    sums = np.add.reduceat(weights * values, starts, axis=1)
+    counts = np.add.reduceat(weights, starts, axis=1)
+
+    # Positional prior is re-estimated inside every replicate
+    pos_sums = sums @ pos_onehot
+    pos_counts = counts @ pos_onehot
+    with np.errstate(invalid='ignore', divide='ignore'):
+        prior = (pos_sums / pos_counts) @ pos_onehot.T
+        raw = sums / counts
+    shrunk = (sums + prior_m * prior) / (counts + prior_m)
+
+    raw, shrunk = raw[:, qualified], shrunk[:, qualified]
+
+    return raw, shrunk, rank_desc(raw), rank_desc(shrunk)
+
+
+class BootstrapEngine:
+    """
+    Bootstrap confidence intervals for the CEOE leaderboard (raw + shrunk).
+    """
+    def __init__(self, summary_df: pd.DataFrame, n_boot=2000, block_size=200, 
+                 n_workers=1, seed=42, ci=0.95):
+        self.df = summary_df
+        self.n_boot = n_boot
+        self.block_size = block_size
+        self.n_workers = n_workers
+        self.seed = seed
+        self.ci = ci
+
+    def _prepare(self, group_cols):
+        """
+        Sorts rows by (position, player) and builds the index arrays the blocks need.
+        """
+        df = self.df.dropna(subset=['ceoe_score']).sort_values(
+            ['player_position'] + group_cols, kind='stable').reset_index(drop=True)
+
+        player_idx = df.groupby(group_cols, sort=False).ngroup().values
+        starts = np.flatnonzero(np.r_[True, np.diff(player_idx) != 0])
+
+        players = df.iloc[starts][group_cols].reset_index(drop=True)
+        pos_codes, pos_labels = pd.factorize(players['player_position'])
+        pos_onehot = np.zeros((len(players), len(pos_labels)))
+        pos_onehot[np.arange(len(players)), pos_codes] = 1.0
+
+        return df['ceoe_score'].values.astype(np.float64), starts, pos_onehot, players
+
+    def _blocks(self):
+        """
+        Deterministic seeds per block, independent of how many workers run them.
+        """
+        n_blocks = int(np.ceil(self.n_boot / self.block_size))
+        seeds = np.random.SeedSequence(self.seed).spawn(n_blocks)
+        sizes = [min(self.block_size, self.n_boot - i * self.block_size) for i in range(n_blocks)]
+
+        return list(zip(sizes, seeds))
+
+    def run(self, min_snaps=15, prior_m=20) -> pd.DataFrame:
+        group_cols = ['nfl_id', 'player_position', 'player_role']
+        if 'player_name' in self.df.columns:
+            group_cols.insert(1, 'player_name')
+
+        if self.df['ceoe_score'].notna().sum() == 0:
+            return pd.DataFrame()
+
+        values, starts, pos_onehot, players = self._prepare(group_cols)
+
+        # Point estimates = a replicate with all weights equal to 1
+        snaps = np.diff(np.r_[starts, len(values)])
+        sums = np.add.reduceat(values, starts)
+        prior = ((sums @ pos_onehot) / (snaps @ pos_onehot)) @ pos_onehot.T
+        players['snaps'] = snaps
+        players['raw_ceoe'] = sums / snaps
+        players['shrunk_ceoe'] = (sums + prior_m * prior) / (snaps + prior_m)
+
+        qualified = snaps >= min_snaps
+        board = players[qualified].reset_index(drop=True)
+        if board.empty:
+            return board
+
+        args = [(values, starts, pos_onehot, prior_m, qualified, n_rep, seed) for n_rep, seed in self._blocks()]
+
+        # Stream the blocks: only per-player replicate scores are kept, never the weights
+        raw_reps, shrunk_reps, raw_ranks, shrunk_ranks = [], [], [], []
+        if self.n_workers and self.n_workers > 1:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                results = pool.map(_bootstrap_block, *zip(*args))
+                for raw, shrunk, r_rank, s_rank in results:
+                    raw_reps.append(raw); shrunk_reps.append(shrunk)
+                    raw_ranks.append(r_rank); shrunk_ranks.append(s_rank)
+        else:
+            for block_args in args:
+                raw, shrunk, r_rank, s_rank = _bootstrap_block(*block_args)
+                raw_reps.append(raw); shrunk_reps.append(shrunk)
+                raw_ranks.append(r_rank); shrunk_ranks.append(s_rank)
+
+        lo_q, hi_q = (1 - self.ci) / 2, 1 - (1 - self.ci) / 2
+
+        def bounds(blocks):
+            stacked = np.concatenate(blocks, axis=0)
+            return np.nanquantile(stacked, lo_q, axis=0), np.nanquantile(stacked, hi_q, axis=0)
+
+        board['raw_ceoe_lo'], board['raw_ceoe_hi'] = bounds(raw_reps)
+        board['shrunk_ceoe_lo'], board['shrunk_ceoe_hi'] = bounds(shrunk_reps)
+
+        board['raw_rank'] = rank_desc(board['raw_ceoe'].values[None, :])[0]
+        board['raw_rank_lo'], board['raw_rank_hi'] = bounds(raw_ranks)
+        board['rank'] = rank_desc(board['shrunk_ceoe'].values[None, :])[0]
+        board['rank_lo'], board['rank_hi'] = bounds(shrunk_ranks)
+
+        for col in ['raw_rank_lo', 'rank_lo']:
+            board[col] = np.floor(board[col]).astype(int)
+        for col in ['raw_rank_hi', 'rank_hi']:
+            board[col] = np.ceil(board[col]).astype(int)
+
+        return board.sort_values('rank').reset_index(drop=True)
@@ -1,5 +1,8 @@
+import os
+import io
 import pandas as pd
 import numpy as np
+import pyarrow.dataset as ds
 
 class DataLoader:
     def __init__(self, summary_path, frames_path):
@@ -9,8 +12,153 @@ class DataLoader:
         self.frames_df = None
 
     def load_data(self):
+        """
+        frames_df is a DataFrame for the wide export, or a StarSchemaFrames
+        handle (joined per play on demand) for the star-schema export.
+        """
         print(f"   [Loader] Loading Summary Data...")
         self.summary_df = pd.read_csv(self.summary_path)
-        self.frames_df = pd.read_csv(self.frames_path)
+
+        if StarSchemaFrames.is_star_dir(self.frames_path):
+            self.frames_df = StarSchemaFrames(self.frames_path)
+        else:
+            self.frames_df = read_frames(self.frames_path)
         
-        return self.summary_df, self.frames_df
\ No newline at end of file
+        return self.summary_df, self.frames_df
+
+
+class StarSchemaFrames:
+    """
+    Lazy view over the star-schema export (frames + player_plays + plays).
+    Only the dimensions are loaded up front; frames are read per play.
+    """
+    def __init__(self, star_dir):
+        self.star_dir = star_dir
+        self.fmt = self._detect_format(star_dir)
+
+        self.player_plays = read_frames(os.path.join(star_dir, f'player_plays.{self.fmt}'))
+        self.plays = read_frames(os.path.join(star_dir, f'plays.{self.fmt}'))
+
+        self.shards = PlayShardReader.open_if_present(os.path.join(star_dir, 'play_shards'))
+
+        frames_path = os.path.join(star_dir, f'frames.{self.fmt}')
+        if self.shards is not None:
+            # Shards cover every play: the season-wide frame table is never opened
+            self._frames = None
+            self._dataset = None
+        elif self.fmt == 'csv':
+            self._frames = pd.read_csv(frames_path)
+            self._dataset = None
+        else:
+            self._frames = None
+            self._dataset = ds.dataset(frames_path, format=_dataset_format(frames_path), partitioning='hive')
+
+    @staticmethod
+    def is_star_dir(path):
+        return os.path.isdir(path) and any(f.startswith('plays.') for f in os.listdir(path))
+
+    @staticmethod
+    def _detect_format(star_dir):
+        for fmt in ('csv', 'parquet', 'feather'):
+            if os.path.exists(os.path.join(star_dir, f'plays.{fmt}')):
+                return fmt
+        raise FileNotFoundError(f"No play dimension found in {star_dir}")
+
+    def _join(self, frames):
+        """
+        Attaches the dimensions and rebuilds 'phase' from the play's throw frame.
+        """
+        frames = frames.drop(columns=['week'], errors='ignore')
+        df = frames.merge(self.player_plays, on=['game_id', 'play_id', 'nfl_id'], how='left')
+        df = df.merge(self.plays, on=['game_id', 'play_id'], how='left')
+
+        df['phase'] = np.where(df['frame_id'] <= df['throw_frame_id'], 'pre_throw', 'post_throw')
+
+        return df
+
+    def get_play(self, game_id, play_id):
+        if self.shards is not None:
+            frames = self.shards.read_play(game_id, play_id)
+        elif self._dataset is not None:
+            # Predicate pushdown: only the matching row groups are read
+            expr = (ds.field('game_id') == game_id) & (ds.field('play_id') == play_id)
+            frames = self._dataset.to_table(filter=expr).to_pandas()
+        else:
+            frames = self._frames[(self._frames['game_id'] == game_id) & (self._frames['play_id'] == play_id)]
+
+        return self._join(frames)
+
+    def to_frame(self):
+        """
+        Materializes the full wide table (same columns as the wide export).
+        """
+        if self.shards is not None:
+            frames = pd.concat([self.shards.read_play(g, p) for g, p in self.shards.keys()], ignore_index=True)
+        elif self._dataset is not None:
+            frames = self._dataset.to_table().to_pandas()
+        else:
+            frames = self._frames
+        return self._join(frames)
+
+
+class PlayShardReader:
+    """
+    Random access to the per-play binary shards written by DataExporter.
+    Each lookup is one seek + one read of a single play's bytes.
+    """
+    def __init__(self, shard_dir):
+        self.shard_dir = shard_dir
+
+        index = pd.read_csv(os.path.join(shard_dir, 'play_index.csv'))
+        self.index = {
+            (int(g), int(p)): (shard, int(offset), int(nbytes))
+            for g, p, shard, offset, nbytes in index[['game_id', 'play_id', 'shard', 'offset', 'nbytes']].itertuples(index=False)
+        }
+
+    @classmethod
+    def open_if_present(cls, shard_dir):
+        if os.path.exists(os.path.join(shard_dir, 'play_index.csv')):
+            return cls(shard_dir)
+        return None
+
+    def keys(self):
+        return list(self.index.keys())
+
+    def read_play(self, game_id, play_id):
+        entry = self.index.get((int(game_id), int(play_id)))
+        if entry is None:
+            return pd.DataFrame(columns=['game_id', 'play_id', 'nfl_id', 'frame_id'])
+
+        shard, offset, nbytes = entry
+        with open(os.path.join(self.shard_dir, shard), 'rb') as handle:
+            handle.seek(offset)
+            blob = handle.read(nbytes)
+
+        with np.load(io.BytesIO(blob)) as arrays:
+            return pd.DataFrame({col: arrays[col] for col in arrays.files})
+
+
+def select_play(frames, game_id, play_id):
+    """
+    Frames of one play, from either a wide DataFrame or a lazy frame store.
+    """
+    if isinstance(frames, pd.DataFrame):
+        return frames[(frames['game_id'] == game_id) & (frames['play_id'] == play_id)]
+
+    return frames.get_play(game_id, play_id)
+
+
+def _dataset_format(path):
+    return 'ipc' if path.rstrip(os.sep).endswith('.feather') else 'parquet'
+
+
+def read_frames(path):
+    """
+    CSV, or the (week-partitioned) Parquet / Feather output of DataExporter.
+    """
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+
+    dataset = ds.dataset(path, format=_dataset_format(path), partitioning='hive')
+
+    return dataset.to_table().to_pandas()
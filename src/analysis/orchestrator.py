@@ -1,69 +1,120 @@
+import argparse
 from src.config import VisPipelineConfig, vis_config
 from src.analysis.data_loader import DataLoader
 from src.analysis.story_data_engine import StoryDataEngine
 from src.analysis.story_visual_engine import StoryVisualEngine
 from src.analysis.animation_engine import AnimationEngine
 from src.analysis.table_generator import TableGenerator
+from src.telemetry import Telemetry, count_groups
+from src.profiling import StageProfiler, parse_profile_arg, default_profile_dir
 
-def run_full_pipeline(SUMMARY_FILE=None, TRACKING_FILE=None, OUTPUT_DIR=None):
+STAGES = ['load', 'tables', 'static_charts', 'animations']
+
+def run_full_pipeline(SUMMARY_FILE=None, TRACKING_FILE=None, OUTPUT_DIR=None,
+                      profile_stages=None, profile_interval=0.005, trace_memory=None):
 
     vis_cfg = VisPipelineConfig(
         SUMMARY_FILE=SUMMARY_FILE or vis_config.SUMMARY_FILE,
         TRACKING_FILE=TRACKING_FILE or vis_config.TRACKING_FILE,
-        OUTPUT_DIR=OUTPUT_DIR or vis_config.OUTPUT_DIR
+        OUTPUT_DIR=OUTPUT_DIR or vis_config.OUTPUT_DIR,
+        TELEMETRY_TRACE_MEMORY=vis_config.TELEMETRY_TRACE_MEMORY if trace_memory is None else trace_memory
     )
     
     summary_path = vis_cfg.SUMMARY_FILE
     tracking_path = vis_cfg.TRACKING_FILE
     output_dir = vis_cfg.OUTPUT_DIR
+    profiler = StageProfiler(
+        parse_profile_arg(profile_stages, STAGES),
+        default_profile_dir(output_dir, 'vis_pipeline'),
+        interval=profile_interval
+    )
+    telemetry = Telemetry('vis_pipeline', output_dir, 
+                          enabled=vis_cfg.TELEMETRY, trace_memory=vis_cfg.TELEMETRY_TRACE_MEMORY, hooks=[profiler])
 
-    loader = DataLoader(summary_path, tracking_path)
-    summary_df, frames_df = loader.load_data()
+    with telemetry.stage('load') as st:
+        loader = DataLoader(summary_path, tracking_path)
+        summary_df, frames_df = loader.load_data()
+        # Star-schema handles are lazy and report 0 rows here
+        st.outputs(summary_df, frames_df)
+        st.groups = count_groups(summary_df)
     
     # Generate summary tables
-    table_gen = TableGenerator(summary_df)
-    tables_stream = table_gen.run_all_analyses()
+    with telemetry.stage('tables') as st:
+        st.inputs(summary_df)
+        table_gen = TableGenerator(summary_df)
+        tables_stream = table_gen.run_all_analyses()
+        st.outputs(*tables_stream.values())
+        st.groups = len(tables_stream)
 
     # Story Engine (Logic & Stats)
     story = StoryDataEngine(summary_df, frames_df)
 
     # Visual Engine (Static Charts)
-    viz = StoryVisualEngine(summary_df, frames_df, output_dir)
-    viz.plot_coverage_heatmap()
-    viz.plot_effort_impact_chart()
+    with telemetry.stage('static_charts') as st:
+        st.inputs(summary_df)
+        viz = StoryVisualEngine(summary_df, frames_df, output_dir)
+        viz.plot_coverage_heatmap()
+        viz.plot_effort_impact_chart()
 
-    leaderboard_df = tables_stream["leaderboard"]
-    viz.plot_ceoe_leaderboard(leaderboard_df)
-    viz.plot_styled_leaderboard(leaderboard_df)
+        leaderboard_df = tables_stream["leaderboard"]
+        viz.plot_ceoe_leaderboard(leaderboard_df)
+        viz.plot_styled_leaderboard(leaderboard_df)
 
-    # archetypes
-    cast_dict = story.cast_archetypes()
-    viz.plot_eraser_landscape(cast_dict) 
-    viz.plot_race_charts(cast_dict)
+        # archetypes
+        cast_dict = story.cast_archetypes()
+        viz.plot_eraser_landscape(cast_dict) 
+        viz.plot_race_charts(cast_dict)
+        st.groups = len(cast_dict)
 
     # Animation Engine (Video Rendering)
-    animator = AnimationEngine(summary_df, frames_df, output_dir)
-
-    # Get Comparisons for animations
-    fs_contrast = story.get_position_contrast('FS')
-
-    # Render Top FS Eraser
-    if fs_contrast['top']:
-        animator.generate_video(
-            game_id=fs_contrast['top']['game_id'], 
-            play_id=fs_contrast['top']['play_id'], 
-            eraser_id=fs_contrast['top']['nfl_id'], 
-            filename="Figure_Top_FS_Eraser.gif" 
-        )
-
-    # Render Bottom FS Eraser
-    if fs_contrast['bottom']:
-        animator.generate_video(
-            game_id=fs_contrast['bottom']['game_id'], 
-            play_id=fs_contrast['bottom']['play_id'], 
-            eraser_id=fs_contrast['bottom']['nfl_id'], 
-            filename="Figure_Bottom_FS_Eraser.gif" 
-        )
+    with telemetry.stage('animations') as st:
+        animator = AnimationEngine(summary_df, frames_df, output_dir)
+
+        # Get Comparisons for animations
+        fs_contrast = story.get_position_contrast('FS')
+
+        # Render Top FS Eraser
+        if fs_contrast['top']:
+            animator.generate_video(
+                game_id=fs_contrast['top']['game_id'], 
+                play_id=fs_contrast['top']['play_id'], 
+                eraser_id=fs_contrast['top']['nfl_id'], 
+                filename="Figure_Top_FS_Eraser.gif" 
+            )
+            st.groups += 1
+
+        # Render Bottom FS Eraser
+        if fs_contrast['bottom']:
+            animator.generate_video(
+                game_id=fs_contrast['bottom']['game_id'], 
+                play_id=fs_contrast['bottom']['play_id'], 
+                eraser_id=fs_contrast['bottom']['nfl_id'], 
+                filename="Figure_Bottom_FS_Eraser.gif" 
+            )
+            st.groups += 1
+
+    telemetry.write()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="NFL Void Engine - visualization pipeline")
+    parser.add_argument('--summary-file', default=None)
+    parser.add_argument('--tracking-file', default=None)
+    parser.add_argument('--output-dir', default=None)
+    parser.add_argument('--profile', action='append', default=[], metavar='STAGES',
+                        help=f"Sample-profile these stages ({','.join(STAGES)} or 'all').")
+    parser.add_argument('--profile-interval', type=float, default=0.005, help="Sampling interval in seconds.")
+    parser.add_argument('--trace-memory', action='store_true', default=None,
+                        help="tracemalloc peaks and deep frame sizes in the telemetry (several times slower).")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    run_full_pipeline()
\ No newline at end of file
+    args = parse_args()
+    run_full_pipeline(
+        SUMMARY_FILE=args.summary_file,
+        TRACKING_FILE=args.tracking_file,
+        OUTPUT_DIR=args.output_dir,
+        profile_stages=args.profile,
+        profile_interval=args.profile_interval,
+        trace_memory=args.trace_memory
+    )
\ No newline at end of file
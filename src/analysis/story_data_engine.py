@@ -1,4 +1,5 @@
 import pandas as pd
+from src.analysis.data_loader import select_play
 
 # TODO: define hardcode nubmers. 
 
@@ -178,7 +179,4 @@ class StoryDataEngine:
     def get_play_frames(self, play_meta):
         if not play_meta: return pd.DataFrame()
         
-        return self.frames_df[
-            (self.frames_df['game_id'] == play_meta['game_id']) & 
-            (self.frames_df['play_id'] == play_meta['play_id'])
-        ].copy()
\ No newline at end of file
+        return select_play(self.frames_df, play_meta['game_id'], play_meta['play_id']).copy()
\ No newline at end of file
@@ -5,6 +5,7 @@ import seaborn as sns
 import os
 from scipy.interpolate import UnivariateSpline
 from scipy import stats
+from src.analysis.data_loader import select_play
 
 sns.set_theme(style="whitegrid", context="talk")
 plt.rcParams['font.family'] = 'sans-serif'
@@ -121,10 +122,7 @@ class StoryVisualEngine:
                          fontsize=16, fontweight='bold', color=color)
 
             # Get Tracking Data
-            play_df = self.frames_df[
-                (self.frames_df['game_id'] == play_meta['game_id']) & 
-                (self.frames_df['play_id'] == play_meta['play_id'])
-            ]
+            play_df = select_play(self.frames_df, play_meta['game_id'], play_meta['play_id'])
             
             def_track = play_df[play_df['nfl_id'] == play_meta['nfl_id']].sort_values('frame_id')
             target_track = play_df[play_df['player_role'] == 'Targeted Receiver'].sort_values('frame_id')
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from scipy import stats
+from src.analysis.bootstrap_engine import BootstrapEngine
 
 class TableGenerator:
     def __init__(self, suumary_df: str):
@@ -82,6 +83,23 @@ class TableGenerator:
         
         return top_erasers
 
+    def generate_leaderboard_intervals(self, min_snaps=15, prior_m=20, n_boot=2000, 
+                                       ci=0.95, n_workers=1, seed=42, top_n=10):
+        """
+        Shrunk Leaderboard with bootstrap CIs and rank intervals.
+        Answers: does rank 3 really differ from rank 8?
+        """
+        engine = BootstrapEngine(self.df, n_boot=n_boot, n_workers=n_workers, seed=seed, ci=ci)
+        board = engine.run(min_snaps=min_snaps, prior_m=prior_m)
+
+        if board.empty:
+            return board
+
+        ceoe_cols = ['raw_ceoe', 'raw_ceoe_lo', 'raw_ceoe_hi', 'shrunk_ceoe', 'shrunk_ceoe_lo', 'shrunk_ceoe_hi']
+        board[ceoe_cols] = board[ceoe_cols].round(3)
+
+        return board.head(top_n) if top_n else board
+
     def generate_damage_control_validation(self):
         """
         Damage Control Validation (YAC & EPA).
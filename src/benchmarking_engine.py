@@ -1,5 +1,9 @@
 import pandas as pd
-from src.schema import BenchMarkingSchema, AnalysisReportSchema
+import numpy as np
+from typing import List
+from src.schema import BenchMarkingSchema, AnalysisReportSchema, BaselinePartialsSchema
+from src.expectation_model import ExpectedClosingModel
+from src.validation import validate
 
 
 class BenchmarkingEngine:
@@ -7,32 +11,124 @@ class BenchmarkingEngine:
     benchmarking defender performance using context and physics data.
     Calculates CEOE (Closing Efficiency Over Expectation) for each play/defender.
     """
-    def __init__(self):
+    BASELINE_KEYS = ['player_position', 'void_type']
+
+    # Stage-cache version: bump for behaviour changes that live outside this module
+    VERSION = 1
+
+    def __init__(self, expectation: str = 'cell', model_cache_dir: str = None):
+        """
+        expectation: 'cell'  -> mean closing speed per (position, void_type)
+                     'model' -> ExpectedClosingModel fit on continuous play context
+        """
+        if expectation not in ('cell', 'model'):
+            raise ValueError(f"Unknown expectation backend: {expectation}")
+
         self.bench_schema = BenchMarkingSchema
         self.report_schema = AnalysisReportSchema
+        self.partials_schema = BaselinePartialsSchema
 
-    def calculate_ceoe(self, df_metrics: pd.DataFrame, 
-                       df_context: pd.DataFrame, df_physics: pd.DataFrame) -> pd.DataFrame:
+        self.expectation = expectation
+        self.model_cache_dir = model_cache_dir
+
+    def calculate_ceoe(self, df_metrics: pd.DataFrame, df_context: pd.DataFrame, 
+                       df_physics: pd.DataFrame = None, df_players: pd.DataFrame = None) -> pd.DataFrame:
         """
         Calculate CEOE (Closing Efficiency Over Expectation) for defenders.
         CEOE = Player's avg closing speed - Positional/contextual average.
+
+        df_players is the Player-Play dimension from the preprocessor. Without it,
+        the metadata is recovered from the frame-level physics table (slow path).
         """
-        meta_cols = list(self.bench_schema.to_schema().columns.keys())
-        df_meta = self.bench_schema.validate(df_physics[meta_cols])
-        df_meta = df_meta.drop_duplicates()
+        df_report = self.prepare_report(df_metrics, df_context, df_physics, df_players)
+
+        if self.expectation == 'model':
+            return self.apply_expected_model(df_report)
+
+        # Single shard: map -> reduce -> apply
+        baselines = self.merge_partials([self.baseline_partials(df_report)])
 
-        df_final = df_metrics.merge(df_meta, on=['game_id', 'play_id', 'nfl_id'], how='left')
-        df_final = df_final.merge(
+        return self.apply_baselines(df_report, baselines)
+
+    def prepare_report(self, df_metrics: pd.DataFrame, df_context: pd.DataFrame,
+                       df_physics: pd.DataFrame = None, df_players: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Joins eraser metrics with player metadata and play context (no baselines yet).
+        """
+        if df_players is None:
+            df_players = self._player_plays_from_frames(df_physics)
+
+        df_meta = validate(self.bench_schema, df_players)
+
+        df_report = df_metrics.merge(df_meta, on=['game_id', 'play_id', 'nfl_id'], how='left')
+        df_report = df_report.merge(
             df_context[['game_id', 'play_id', 'void_type', 'dist_at_throw']], 
             on=['game_id', 'play_id'], 
             how='left'
         )
 
-        # Calculate positional/contextual average closing speed
-        benchmarks = df_final.groupby(
-            ['player_position', 'void_type'])['avg_closing_speed'].transform('mean')
+        return df_report
+
+    def baseline_partials(self, df_report: pd.DataFrame) -> pd.DataFrame:
+        """
+        MAP step. Mergeable statistics of closing speed per (position, void_type) cell.
+        Each week / shard produces its own partials.
+        """
+        speed = df_report['avg_closing_speed']
+
+        partials = df_report.assign(
+            speed_count=speed.notna().astype(int),
+            speed_sum=speed.fillna(0.0),
+            speed_sum_sq=speed.fillna(0.0)**2
+        ).groupby(self.BASELINE_KEYS)[['speed_count', 'speed_sum', 'speed_sum_sq']].sum().reset_index()
+
+        return validate(self.partials_schema, partials)
 
-        df_final['ceoe_score'] = df_final['avg_closing_speed'] - benchmarks
+    def merge_partials(self, partials: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        REDUCE step. Combines partials from any number of shards and derives the baselines.
+        """
+        stats = pd.concat(partials, ignore_index=True).groupby(self.BASELINE_KEYS)[
+            ['speed_count', 'speed_sum', 'speed_sum_sq']].sum().reset_index()
+
+        count = stats['speed_count'].where(stats['speed_count'] > 0)
+        stats['baseline_mean'] = stats['speed_sum'] / count
+
+        # Sample variance from the raw moments
+        variance = (stats['speed_sum_sq'] - stats['speed_sum']**2 / count) / (count - 1)
+        stats['baseline_std'] = np.sqrt(variance.clip(lower=0))
+
+        return validate(self.partials_schema, stats)
+
+    def apply_baselines(self, df_report: pd.DataFrame, baselines: pd.DataFrame) -> pd.DataFrame:
+        """
+        Second pass. Subtracts the cell baseline from every defender-play.
+        """
+        df_final = df_report.merge(
+            baselines[self.BASELINE_KEYS + ['baseline_mean']], on=self.BASELINE_KEYS, how='left')
+
+        df_final['ceoe_score'] = df_final['avg_closing_speed'] - df_final['baseline_mean']
         df_final['ceoe_score'] = df_final['ceoe_score'].fillna(0.0)
         
-        return self.report_schema.validate(df_final)
\ No newline at end of file
+        return validate(self.report_schema, df_final)
+
+    def apply_expected_model(self, df_report: pd.DataFrame, model: ExpectedClosingModel = None) -> pd.DataFrame:
+        """
+        CEOE against the context-conditioned expectation (fit on the whole report).
+        """
+        if model is None:
+            model = ExpectedClosingModel(cache_dir=self.model_cache_dir).fit(df_report)
+
+        df_final = df_report.copy()
+        df_final['ceoe_score'] = df_final['avg_closing_speed'] - model.predict(df_final)
+        df_final['ceoe_score'] = df_final['ceoe_score'].fillna(0.0)
+
+        return validate(self.report_schema, df_final)
+
+    def _player_plays_from_frames(self, df_physics: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fallback: one metadata row per (game, play, nfl_id) from the frames.
+        """
+        meta_cols = list(self.bench_schema.to_schema().columns.keys())
+
+        return df_physics[meta_cols].drop_duplicates(subset=['game_id', 'play_id', 'nfl_id'])
@@ -0,0 +1,160 @@
+import os
+import re
+import json
+import pandas as pd
+from pydantic import BaseModel, field_validator
+from typing import List, Optional, Tuple
+
+PLAY_KEYS = ['game_id', 'play_id']
+
+# Plays no cohort can use: incomplete tracking story or no real pass
+PASS_RESULTS = ['C', 'I', 'IN']
+SCRAMBLES = ['SCRAMBLE', 'SCRAMBLE_ROLLOUT_LEFT', 'SCRAMBLE_ROLLOUT_RIGHT', 'QB_DRAW']
+
+
+class CohortSpec(BaseModel):
+    """
+    Declarative play filter over the supplementary table. Every field is optional and the
+    set ones are ANDed; query is a custom pandas expression (DataFrame.eval) over the
+    supplementary columns plus possession_win_prob and yards_from_own_goal.
+    All cohorts share the play-validity rules (real pass, no scramble, not nullified).
+    """
+    name: str
+    coverage: Optional[str] = None                      # substring of team_coverage_man_zone, e.g. 'zone', 'man'
+    exclude_coverage_types: List[str] = []
+    downs: Optional[List[int]] = None
+    win_prob: Optional[Tuple[float, float]] = None      # possession team's pre-snap win probability
+    max_yards_to_go: Optional[int] = None
+    field_position: Optional[Tuple[float, float]] = None  # yards from own goal
+    exclude_screens: bool = True
+    query: Optional[str] = None
+
+    @field_validator('name')
+    @classmethod
+    def _directory_safe(cls, name):
+        if not re.fullmatch(r'[A-Za-z0-9_-]+', name):
+            raise ValueError(f"Cohort names become directory names, use letters, digits, '_' or '-': {name!r}")
+        return name
+
+    def mask(self, supp_df: pd.DataFrame) -> pd.Series:
+        """
+        Boolean mask of this cohort's plays (supp_df needs the engineered context columns).
+        """
+        mask = valid_play_mask(supp_df)
+        if self.coverage:
+            mask &= supp_df['team_coverage_man_zone'].astype(str).str.contains(self.coverage, case=False, na=False)
+        if self.exclude_coverage_types:
+            mask &= ~supp_df['team_coverage_type'].isin(self.exclude_coverage_types)
+        if self.exclude_screens:
+            mask &= ~screen_mask(supp_df)
+        if self.downs is not None:
+            mask &= supp_df['down'].isin(self.downs)
+        if self.win_prob is not None:
+            mask &= supp_df['possession_win_prob'].between(*self.win_prob)
+        if self.max_yards_to_go is not None:
+            mask &= supp_df['yards_to_go'] <= self.max_yards_to_go
+        if self.field_position is not None:
+            mask &= supp_df['yards_from_own_goal'].between(*self.field_position)
+        if self.query:
+            mask &= supp_df.eval(self.query).astype(bool)
+        return mask
+
+
+def valid_play_mask(supp_df: pd.DataFrame) -> pd.Series:
+    return (
+        (supp_df['pass_result'].isin(PASS_RESULTS)) &
+        (~supp_df['dropback_type'].str.upper().isin(SCRAMBLES)) &
+        (supp_df['play_nullified_by_penalty'] != 'Y')
+    )
+
+
+def screen_mask(supp_df: pd.DataFrame) -> pd.Series:
+    """
+    Trick / cheap plays: screens, balls caught at or behind the LOS, short flat check-downs.
+    """
+    route = supp_df['route_of_targeted_receiver'].astype(str).str.upper()
+    return (
+        route.str.contains('SCREEN', na=False) |
+        (supp_df['pass_length'] <= 0) |
+        ((route == 'FLAT') & (supp_df['pass_length'] < 3))
+    )
+
+
+# Neutral-script base situations: early downs, on schedule, competitive game, between the 20s
+_BASE_SITUATION = dict(downs=[1, 2], win_prob=(0.20, 0.80), max_yards_to_go=10, field_position=(20, 80))
+
+PRESETS = {
+    # The study's original cohort (what filter_context always selected)
+    'zone': CohortSpec(name='zone', coverage='Zone', exclude_coverage_types=['COVER_6_ZONE'], **_BASE_SITUATION),
+    'man': CohortSpec(name='man', coverage='Man', **_BASE_SITUATION),
+    'third_down': CohortSpec(name='third_down', downs=[3], win_prob=(0.20, 0.80), field_position=(20, 80)),
+}
+DEFAULT_COHORT = PRESETS['zone']
+
+
+def parse_cohorts(value) -> List[CohortSpec]:
+    """
+    'zone,man' (preset names), a JSON file holding a list of CohortSpec dicts, or a list of
+    specs / dicts. Empty -> [DEFAULT_COHORT]. The first cohort is the primary one.
+    """
+    if not value:
+        return [DEFAULT_COHORT]
+    if isinstance(value, str) and os.path.isfile(value):
+        with open(value) as f:
+            value = json.load(f)
+    if isinstance(value, str):
+        value = [v.strip() for v in value.split(',') if v.strip()]
+
+    cohorts = []
+    for item in value:
+        if isinstance(item, CohortSpec):
+            cohorts.append(item)
+        elif isinstance(item, dict):
+            cohorts.append(CohortSpec(**item))
+        elif item in PRESETS:
+            cohorts.append(PRESETS[item])
+        else:
+            raise ValueError(f"Unknown cohort preset: {item!r}. Valid: {list(PRESETS)} or a JSON file of specs")
+
+    names = [c.name for c in cohorts]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Cohort names must be unique, got {names}")
+    return cohorts
+
+
+def cohort_membership(supp_df: pd.DataFrame, cohorts: List[CohortSpec]) -> pd.DataFrame:
+    """
+    One boolean column per cohort, aligned to supp_df's index.
+    """
+    return pd.DataFrame({c.name: c.mask(supp_df) for c in cohorts}, index=supp_df.index)
+
+
+def select_cohort(df: pd.DataFrame, membership: pd.DataFrame, name: str) -> pd.DataFrame:
+    """
+    Rows of df (any table keyed by game_id / play_id) whose play belongs to the cohort.
+    """
+    plays = membership.loc[membership[name], PLAY_KEYS]
+    keep = pd.MultiIndex.from_frame(df[PLAY_KEYS]).isin(pd.MultiIndex.from_frame(plays))
+    return df[keep]
+
+
+def benchmark_cohorts(benchmarker, cohort_specs, df_metrics, df_context, df_players, df_cohorts):
+    """
+    CEOE per cohort from the shared eraser / context results. The primary cohort's table is
+    'summary', the others 'cohort_<name>'. With a single cohort nothing is subset.
+    """
+    if len(cohort_specs) == 1:
+        return {'summary': benchmarker.calculate_ceoe(
+            df_metrics=df_metrics, df_context=df_context, df_players=df_players)}
+
+    tables = {}
+    for i, spec in enumerate(cohort_specs):
+        subset = [select_cohort(df, df_cohorts, spec.name) for df in (df_metrics, df_context, df_players)]
+        if subset[0].empty:
+            print(f"   -> [cohorts] '{spec.name}' has no graded plays, skipping its CEOE")
+            continue
+        tables['summary' if i == 0 else f'cohort_{spec.name}'] = benchmarker.calculate_ceoe(
+            df_metrics=subset[0], df_context=subset[1], df_players=subset[2])
+    if 'summary' not in tables:
+        raise ValueError(f"The primary cohort '{cohort_specs[0].name}' has no graded plays")
+    return tables
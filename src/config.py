@@ -6,12 +6,71 @@ class DataPipelineConfig(BaseModel):
     SUPP_FILE: str = "data/supplementary_data.csv"
     OUTPUT_DIR: str = "data/processed"
 
+    # CEOE expectation backend: 'cell' (position x void_type mean) or 'model'
+    EXPECTATION_BACKEND: str = "cell"
+    MODEL_CACHE_DIR: str = "data/processed/model_cache"
+
+    # Animation export: 'csv', or week-partitioned 'parquet' / 'feather'
+    EXPORT_FORMAT: str = "csv"
+    # 'wide' (scores repeated per frame) or 'star' (frames + player/play dimensions)
+    EXPORT_LAYOUT: str = "wide"
+    # Star layout only: one binary shard per play + index, for fast single-play loads
+    EXPORT_PLAY_SHARDS: bool = False
+
+    # 'batch' (whole season per stage, stage-cached), 'weekly' (each week flows through
+    # preprocess -> eraser on its own; only CEOE baselines + export are global), 'incremental'
+    # (weekly, but only new / changed weeks are processed) or 'queue'
+    EXECUTION_MODE: str = "batch"
+    # Weekly mode: worker processes for the per-week chain, and an address-space cap per
+    # worker in MB (0 = no limit). WORKERS > 1 implies weekly mode
+    WORKERS: int = 1
+    WORKER_MAX_MEMORY_MB: int = 0
+
+    # 'queue' mode: week shards claimed through lock files in a shared QUEUE_DIR, so
+    # several hosts can split a run. Role 'worker' or 'reduce'; leases expire after a crash
+    QUEUE_DIR: str = ""
+    QUEUE_ROLE: str = "worker"
+    QUEUE_LEASE_SECONDS: int = 600
+
+    # Play cohorts, evaluated in one pass: preset names ('zone,man,third_down') or a JSON file of
+    # CohortSpec dicts. The first is the primary cohort (main outputs); empty -> 'zone'
+    COHORTS: str = ""
+
+    # --watch: seconds between polls of DATA_DIR / SUPP_FILE for new or changed week files
+    WATCH_POLL_SECONDS: float = 60.0
+
+    # Stage cache (columnar, content-hashed). Empty CACHE_DIR -> OUTPUT_DIR/stage_cache
+    USE_STAGE_CACHE: bool = True
+    CACHE_DIR: str = ""
+    # Entries kept per stage; older keys (superseded by code / config changes) are deleted
+    CACHE_KEEP_PER_STAGE: int = 1
+
+    # Per-stage telemetry report (OUTPUT_DIR/telemetry/*.json). Memory tracing (tracemalloc
+    # peaks + deep frame sizes) slows a run several times over, so it is opt-in (--trace-memory)
+    TELEMETRY: bool = True
+    TELEMETRY_TRACE_MEMORY: bool = False
+
+    # pandera checks: 'full' (every stage), 'boundary' (raw inputs + exports only), 'sample'
+    # (VALIDATION_SAMPLE_ROWS random rows per check) or 'off'. Outputs are identical at every level
+    VALIDATION_LEVEL: str = "full"
+    VALIDATION_SAMPLE_ROWS: int = 10_000
+
+    # Memory budget for the whole run, e.g. "16GB", "512MB" or "auto" (80% of RAM). When set,
+    # the planner picks EXECUTION_MODE / WORKERS / WORKER_MAX_MEMORY_MB and read chunk sizes
+    # (command-line --mode / --workers still win) and the run stops if RSS stays above it
+    MAX_MEMORY: str = ""
+
 
 class VisPipelineConfig(BaseModel):
     OUTPUT_DIR: str = "static/visuals_test"
+    # Also accepts the columnar exports, e.g. data/processed/master_animation_data.parquet,
+    # or the star-schema directory data/processed/animation_star
     TRACKING_FILE: str = "data/processed/master_animation_data.csv"
     SUMMARY_FILE: str = "data/processed/eraser_analysis_summary.csv"
 
+    TELEMETRY: bool = True
+    TELEMETRY_TRACE_MEMORY: bool = False
+
 
 # Default config instance
 data_config = DataPipelineConfig()
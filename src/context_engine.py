@@ -1,8 +1,12 @@
 import pandas as pd
 import numpy as np
 from src.schema import ContextSchema
+from src.validation import validate
 
 class ContextEngine:
+    # Stage-cache version: bump for behaviour changes that live outside this module
+    VERSION = 1
+
     def __init__(self):
         self.output_schema = ContextSchema
 
@@ -54,4 +58,4 @@ class ContextEngine:
         choices = ['High Void', 'Tight Window']
         context_df['void_type'] = np.select(conditions, choices, default='Neutral')
 
-        return self.output_schema.validate(context_df)
\ No newline at end of file
+        return validate(self.output_schema, context_df)
\ No newline at end of file
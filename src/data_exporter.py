@@ -1,43 +1,191 @@
 import os
+import contextlib
 import pandas as pd
-from src.schema import AnalysisReportSchema, AggregationScoresSchema, FullPlayAnimationSchema
+from typing import Iterable, List, Union
+from src.export_writers import BackgroundWriter, TableSink, PlayShardSink
+from src.validation import validate
+from src.schema import (AnalysisReportSchema, AggregationScoresSchema, FullPlayAnimationSchema,
+                        AnimationFrameSchema, AnimationPlayerSchema, AnimationPlaySchema)
 
 class DataExporter:
-    def __init__(self, output_dir: str):
+    # Stage-cache version: bump for behaviour changes that live outside this module
+    VERSION = 1
+
+    FORMATS = ('csv', 'parquet', 'feather')
+    STAR_DIR = 'animation_star'
+    SHARD_DIR = 'play_shards'
+
+    def __init__(self, output_dir: str, fmt: str = 'csv', compression: str = 'zstd', 
+                 layout: str = 'wide', play_shards: bool = False):
+        """
+        layout: 'wide' -> one master table, scores repeated on every frame
+                'star' -> frames fact table + player-play and play dimensions
+        play_shards: also write one binary blob per play + a lookup index (star only)
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if layout not in ('wide', 'star'):
+            raise ValueError(f"Unsupported export layout: {layout}")
+        if play_shards and layout != 'star':
+            raise ValueError("play_shards requires the 'star' layout (shards hold the slim frame table).")
+
         self.output_dir = output_dir
+        self.fmt = fmt
+        self.compression = compression
+        self.layout = layout
+        self.play_shards = play_shards
         self.report_schema = AnalysisReportSchema
         self.animation_schema = AggregationScoresSchema
         self.full_animation = FullPlayAnimationSchema
 
-    def export_results(self, df_summary: pd.DataFrame, df_frames: pd.DataFrame):
+        self.frame_schema = AnimationFrameSchema
+        self.player_schema = AnimationPlayerSchema
+        self.play_schema = AnimationPlaySchema
+
+    def output_paths(self) -> List[str]:
+        """
+        Files / directories an export with these settings writes (to check they still exist).
+        """
+        paths = [os.path.join(self.output_dir, 'eraser_analysis_summary.csv')]
+        if self.layout == 'wide':
+            return paths + [os.path.join(self.output_dir, f'master_animation_data.{self.fmt}')]
+        star_dir = os.path.join(self.output_dir, self.STAR_DIR)
+        paths += [os.path.join(star_dir, f'{table}.{self.fmt}') for table in ('frames', 'player_plays', 'plays')]
+        if self.play_shards:
+            paths.append(os.path.join(star_dir, self.SHARD_DIR))
+        return paths
+
+    def export_results(self, df_summary: pd.DataFrame, 
+                       df_frames: Union[pd.DataFrame, Iterable[pd.DataFrame]], 
+                       df_players: pd.DataFrame = None, reuse_frame_weeks: Iterable[int] = ()):
         """
         1. Validates & Saves the Analytical Report.
         2. Validates & Merges Scores for Animation.
-        3. Saves the Master Animation File.
+        3. Saves the Master Animation File (or the star-schema tables).
+
+        df_frames may be one DataFrame or an iterator of chunks (e.g. one per week).
+        Chunks are validated, merged and appended one at a time, while a background
+        thread writes the previous chunk. Chunks must not split a play.
+
+        reuse_frame_weeks: weeks whose frames already sit in the star layout's week-partitioned
+        frames table from an earlier export and are unchanged (incremental runs). Their frame
+        partitions are kept; the dimensions, which carry the scores, are always rewritten.
+        Ignored by the wide layout (scores on every frame) and by CSV / play-shard exports.
         """
         print(f"   -> Output Directory: {self.output_dir}")
 
-        self.report_schema.validate(df_summary)
+        validate(self.report_schema, df_summary, boundary=True)
 
         summary_path = os.path.join(self.output_dir, 'eraser_analysis_summary.csv')
         df_summary.to_csv(summary_path, index=False)
         print(f"   -> Saved Eraser Analysis Report to {summary_path}")
 
+        chunks = [df_frames] if isinstance(df_frames, pd.DataFrame) else df_frames
+
+        if self.layout == 'star':
+            reusable = self.fmt != 'csv' and not self.play_shards
+            self._export_star(df_summary, chunks, df_players, reuse_frame_weeks if reusable else ())
+            return
+
         # Define the subset of columns to attach to the visualizer
         score_cols = list(self.animation_schema.to_schema().columns.keys())
-        flags_to_merge = self.animation_schema.validate(df_summary[score_cols])
-
-        # MERGE: Left join the scores onto the massive physics dataframe
-        # This repeats the score for every frame of the play
-        df_animation = df_frames.merge(
-            flags_to_merge, 
-            on=['game_id', 'play_id', 'nfl_id'], 
-            how='left'
-        )
-        
-        self.full_animation.validate(df_animation)
-
-        final_path = os.path.join(self.output_dir, 'master_animation_data.csv')
-        df_animation.to_csv(final_path, index=False)
-        
-        print(f"   -> Saved Animation Master File to {final_path}")
\ No newline at end of file
+        flags_to_merge = validate(self.animation_schema, df_summary[score_cols], boundary=True)
+
+        if self.fmt == 'csv':
+            final_path = os.path.join(self.output_dir, 'master_animation_data.csv')
+            sink = TableSink(final_path, self.fmt)
+        else:
+            final_path = os.path.join(self.output_dir, f'master_animation_data.{self.fmt}')
+            sink = TableSink(final_path, self.fmt, self.compression, partition_col='week')
+
+        # The sink exits after the writer thread, so it sees a failed write too
+        with sink, BackgroundWriter() as writer:
+            for chunk in chunks:
+                # MERGE: Left join the scores onto the physics frames
+                # This repeats the score for every frame of the play
+                df_animation = chunk.merge(
+                    flags_to_merge, 
+                    on=['game_id', 'play_id', 'nfl_id'], 
+                    how='left'
+                )
+                
+                validate(self.full_animation, df_animation, boundary=True)
+                writer.submit(sink.append, df_animation)
+
+        print(f"   -> Saved Animation Master File to {final_path}")
+
+    def _export_star(self, df_summary: pd.DataFrame, chunks: Iterable[pd.DataFrame], df_players: pd.DataFrame = None,
+                     reuse_frame_weeks: Iterable[int] = ()):
+        """
+        Normalized animation export. Nothing play- or player-level is repeated per frame.
+        """
+        star_dir = os.path.join(self.output_dir, self.STAR_DIR)
+        os.makedirs(star_dir, exist_ok=True)
+
+        play_keys = ['game_id', 'play_id']
+        player_keys = play_keys + ['nfl_id']
+        player_cols = ['player_name', 'player_role', 'player_position']
+        frame_cols = list(self.frame_schema.to_schema().columns.keys())
+
+        partition_col = None if self.fmt == 'csv' else 'week'
+        reuse_frame_weeks = {int(w) for w in reuse_frame_weeks}
+        frame_sink = TableSink(os.path.join(star_dir, f'frames.{self.fmt}'), self.fmt, self.compression, partition_col,
+                               keep_partitions=reuse_frame_weeks)
+        player_sink = TableSink(os.path.join(star_dir, f'player_plays.{self.fmt}'), self.fmt, self.compression)
+        play_sink = TableSink(os.path.join(star_dir, f'plays.{self.fmt}'), self.fmt, self.compression)
+        shard_sink = PlayShardSink(os.path.join(star_dir, self.SHARD_DIR)) if self.play_shards else None
+
+        player_scores = df_summary[player_keys + ['vis_score', 'ceoe_score']]
+        play_scores = df_summary[play_keys + ['dist_at_throw', 'void_type']].drop_duplicates(subset=play_keys)
+
+        def write_chunk(df_fact, weeks, df_player_dim, df_play_dim):
+            if df_fact.empty:
+                pass  # every frame of this chunk is kept from the previous export
+            elif partition_col:
+                frame_sink.append(df_fact.assign(week=weeks))  # week only lives in the partition path
+            else:
+                frame_sink.append(df_fact)
+            if df_player_dim is not None:
+                player_sink.append(df_player_dim)
+            play_sink.append(df_play_dim)
+            if shard_sink is not None:
+                shard_sink.append(df_fact, weeks)
+
+        # Sinks close together on success; on any failure every partial table is removed
+        with contextlib.ExitStack() as stack:
+            for sink in (frame_sink, player_sink, play_sink, shard_sink):
+                if sink is not None:
+                    stack.enter_context(sink)
+            writer = stack.enter_context(BackgroundWriter())
+
+            # DIMENSION: player-play, straight from the preprocessor's table when available
+            if df_players is not None:
+                df_player_dim = df_players[player_keys + player_cols].merge(player_scores, on=player_keys, how='left')
+                player_sink.append(validate(self.player_schema, df_player_dim, boundary=True))
+
+            for chunk in chunks:
+                # FACT: frames (minus the weeks kept from the previous export)
+                fresh = ~chunk['week'].isin(reuse_frame_weeks).values
+                df_fact = validate(self.frame_schema, chunk.loc[fresh, frame_cols], boundary=True)
+
+                # DIMENSION: player-play (fallback: derived from this chunk's frames)
+                df_player_dim = None
+                if df_players is None:
+                    df_player_dim = chunk[player_keys + player_cols].drop_duplicates(subset=player_keys)
+                    df_player_dim = validate(
+                        self.player_schema, df_player_dim.merge(player_scores, on=player_keys, how='left'),
+                        boundary=True)
+
+                # DIMENSION: play
+                play_cols = [c for c in self.play_schema.to_schema().columns.keys() if c in chunk.columns]
+                df_play_dim = chunk[play_cols].drop_duplicates(subset=play_keys)
+
+                throw_frames = chunk[chunk['phase'] == 'pre_throw'].groupby(play_keys)['frame_id'].max()
+                df_play_dim = df_play_dim.merge(
+                    throw_frames.rename('throw_frame_id').reset_index(), on=play_keys, how='left')
+                df_play_dim = validate(
+                    self.play_schema, df_play_dim.merge(play_scores, on=play_keys, how='left'), boundary=True)
+
+                writer.submit(write_chunk, df_fact, chunk['week'].values[fresh], df_player_dim, df_play_dim)
+
+        print(f"   -> Saved Star-Schema Animation Tables to {star_dir}")
@@ -2,16 +2,32 @@ import pandas as pd
 import numpy as np
 import gc
 from typing import Generator, Tuple, List
-from src.schema import PreprocessedSchema
+from src.schema import PreprocessedSchema, BenchMarkingSchema
+from src.sampling import sample_plays
+from src.validation import validate
+from src.cohorts import CohortSpec, DEFAULT_COHORT, cohort_membership
 
 class DataPreProcessor:
+    # Stage-cache version: bump for behaviour changes that live outside this module
+    VERSION = 1
+
     def __init__(self):
         self.output_schema = PreprocessedSchema
+        self.player_play_schema = BenchMarkingSchema
         self.keep_cols = list(self.output_schema.to_schema().columns.keys())
 
-    def filter_context(self, supp_df):
+        # Player-Play dimension (one row per game/play/nfl_id), filled by run()
+        self.player_play_df = pd.DataFrame()
+        # game_id, play_id + one bool column per cohort, filled by filter_context()
+        self.cohort_membership = pd.DataFrame()
+
+    def filter_context(self, supp_df, sample_frac: float = None, sample_seed: int = 42,
+                       cohorts: List[CohortSpec] = None):
         """
         Filters the supplementary dataframe and performs 'Lightweight Feature Engineering'..
+        cohorts (default: the zone cohort) are evaluated as masks in one pass; the union of
+        their plays is kept and per-cohort membership lands in self.cohort_membership.
+        sample_frac keeps a deterministic sample of the valid plays, stratified by week and coverage.
         """
 
         # Calculate Possession Win Probability
@@ -29,51 +45,18 @@ class DataPreProcessor:
             100 - supp_df['yardline_number']      
         )
 
-        # valid mask filters
-        valid_mask = (
-            (supp_df['team_coverage_man_zone'].astype(str).str.contains('Zone', case=False, na=False)) &
-            (supp_df['pass_result'].isin(['C', 'I', 'IN'])) &
-            (supp_df['team_coverage_type'] != 'COVER_6_ZONE') &
-            (~supp_df['dropback_type'].str.upper().isin([
-                'SCRAMBLE', 'SCRAMBLE_ROLLOUT_LEFT', 'SCRAMBLE_ROLLOUT_RIGHT', 'QB_DRAW'])) &
-            (supp_df['play_nullified_by_penalty'] != 'Y')
-        )
+        # One mask per cohort (coverage, situation and screen filters live in src.cohorts)
+        membership = cohort_membership(supp_df, cohorts or [DEFAULT_COHORT])
 
-        # remove trick / cheap plays
-        screen_shovel_mask = (
-            supp_df['route_of_targeted_receiver'].astype(str).str.upper().str.contains('SCREEN', na=False) | 
-            
-            # Physics Check: Ball caught behind or at LOS (Shovels/Swings)
-            (supp_df['pass_length'] <= 0) | 
-            
-            # Check-downs (Flat routes < 3 yards)
-            (
-                (supp_df['route_of_targeted_receiver'].astype(str).str.upper() == 'FLAT') & 
-                (supp_df['pass_length'] < 3)
-            )
-        )
-        
-        # base situations
-        base_situation_mask = (           
-            (supp_df['down'].isin([1, 2])) &
-            
-            # Competitive Game (Neutral Script)
-            (supp_df['possession_win_prob'].between(0.20, 0.80)) & 
+        clean_df = supp_df[membership.any(axis=1)].copy()
 
-            # On Schedule (Not 1st & 20 or 2nd & 18)
-            (supp_df['yards_to_go'] <= 10) &
-            
-            # We use our new engineered column here
-            (supp_df['yards_from_own_goal'].between(20, 80))
-        )
-        
-        final_valid_mask = (
-            valid_mask &
-            (~screen_shovel_mask) &
-            base_situation_mask
-        )
+        if sample_frac:
+            clean_df = sample_plays(clean_df, sample_frac, seed=sample_seed)
+
+        self.cohort_membership = pd.concat(
+            [clean_df[['game_id', 'play_id']], membership.loc[clean_df.index]], axis=1).reset_index(drop=True)
 
-        return supp_df[final_valid_mask].copy()
+        return clean_df
 
     def _stitch_tracking_data(self, input_df, output_df, valid_keys):
         """
@@ -162,22 +145,36 @@ class DataPreProcessor:
 
         week_df = self._clean_and_deduplicate(week_df)
 
-        return self.output_schema.validate(week_df)
+        return validate(self.output_schema, week_df)
+
+    def build_player_plays(self, week_df):
+        """
+        Collapses frame-level rows into the Player-Play dimension table.
+        Metadata is static within a play, so the first frame carries it all.
+        """
+        dim_cols = list(self.player_play_schema.to_schema().columns.keys())
+        keys = ['game_id', 'play_id', 'nfl_id']
+
+        df_dim = week_df[dim_cols].drop_duplicates(subset=keys)
+
+        return validate(self.player_play_schema, df_dim.reset_index(drop=True))
 
     def run(self, data_stream: Generator[Tuple[str, pd.DataFrame, pd.DataFrame], None, None], 
-            raw_context_df: pd.DataFrame) -> pd.DataFrame:
+            raw_context_df: pd.DataFrame, cohorts: List[CohortSpec] = None) -> pd.DataFrame:
         """
-        MAIN ENTRY POINT.
+        MAIN ENTRY POINT. With several cohorts, tracking is stitched once for the union of their plays.
         """
-        clean_context = self.filter_context(raw_context_df)
+        clean_context = self.filter_context(raw_context_df, cohorts=cohorts)
         
         processed_chunks: List[pd.DataFrame] = []
+        player_play_chunks: List[pd.DataFrame] = []
         for week_num, input_df, output_df in data_stream:
             
             clean_week_df = self.process_single_week(week_num, input_df, output_df, clean_context)
 
             if not clean_week_df.empty:
                 processed_chunks.append(clean_week_df)
+                player_play_chunks.append(self.build_player_plays(clean_week_df))
 
             del input_df, output_df
             gc.collect()
@@ -185,4 +182,6 @@ class DataPreProcessor:
         if not processed_chunks:
             return pd.DataFrame()
         
+        self.player_play_df = pd.concat(player_play_chunks, ignore_index=True)
+
         return pd.concat(processed_chunks, ignore_index=True)
\ No newline at end of file
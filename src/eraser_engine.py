@@ -1,11 +1,19 @@
 import pandas as pd
 import numpy as np
 from src.schema import EraserMetricsSchema
+from src.validation import validate
 
 class EraserEngine:
-    def __init__(self):
+    # Stage-cache version: bump for behaviour changes that live outside this module
+    VERSION = 1
+
+    def __init__(self, max_speed: float = 9.5, max_accel: float = 7.0):
         self.output_schema = EraserMetricsSchema
 
+        # Kinematic ceiling for the time-to-intercept model (yds/s, yds/s^2)
+        self.max_speed = max_speed
+        self.max_accel = max_accel
+
     def calculate_eraser(self, df: pd.DataFrame, context_df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculates how distinct defenders close space on the targeted receiver.
@@ -63,4 +71,74 @@ class EraserEngine:
         # Apply grouping per player per play
         metrics = merged.groupby(['game_id', 'play_id', 'nfl_id']).apply(grade_defender).reset_index()
 
-        return self.output_schema.validate(metrics)
\ No newline at end of file
+        # Physical baseline: how fast could each defender have closed?
+        intercepts = self._calculate_time_to_intercept(df, merged)
+        metrics = metrics.merge(intercepts, on=['game_id', 'play_id', 'nfl_id'], how='left')
+
+        return validate(self.output_schema, metrics)
+
+    def _calculate_time_to_intercept(self, df: pd.DataFrame, merged: pd.DataFrame) -> pd.DataFrame:
+        """
+        Minimum time for each defender to reach the target's post-throw path or the
+        ball landing spot, starting from their position and velocity at the throw.
+        One vectorized pass over all defender-plays (no per-play simulation).
+        """
+        keys = ['game_id', 'play_id', 'nfl_id']
+
+        # Throw Snapshot: first post-throw frame of every defender.
+        # Velocity comes from the displacement since the previous (pre-throw) frame.
+        defenders = df[df['player_role'] == 'Defensive Coverage'].sort_values(keys + ['frame_id'])
+        vx = defenders.groupby(keys)['x'].diff().fillna(0) / 0.1
+        vy = defenders.groupby(keys)['y'].diff().fillna(0) / 0.1
+        defenders = defenders.assign(vx=vx, vy=vy)
+
+        post = defenders[defenders['phase'] == 'post_throw']
+        snapshot = post.drop_duplicates(subset=keys, keep='first')
+
+        snap_cols = keys + ['x', 'y', 'vx', 'vy']
+        for col in ['ball_land_x', 'ball_land_y']:
+            if col in snapshot.columns:
+                snap_cols.append(col)
+        snapshot = snapshot[snap_cols].rename(columns={'x': 'd0_x', 'y': 'd0_y'})
+
+        # Target Path: time to reach the closest point the receiver passes through.
+        # Time is monotonic in distance only for a fixed heading, so evaluate every point.
+        path = merged[keys + ['t_x', 't_y']].merge(snapshot, on=keys, how='inner')
+        path['tti'] = self._time_to_reach(
+            path['t_x'] - path['d0_x'], path['t_y'] - path['d0_y'], path['vx'], path['vy'])
+        tti_target = path.groupby(keys)['tti'].min().rename('tti_target_path')
+
+        # Ball Landing Point
+        result = snapshot[keys].reset_index(drop=True)
+        if 'ball_land_x' in snapshot.columns and 'ball_land_y' in snapshot.columns:
+            result['tti_ball_land'] = self._time_to_reach(
+                (snapshot['ball_land_x'] - snapshot['d0_x']).values,
+                (snapshot['ball_land_y'] - snapshot['d0_y']).values,
+                snapshot['vx'].values, snapshot['vy'].values)
+        else:
+            result['tti_ball_land'] = np.nan
+
+        result = result.merge(tti_target.reset_index(), on=keys, how='left')
+        result['time_to_intercept'] = np.fmin(result['tti_target_path'], result['tti_ball_land'])
+
+        return result
+
+    def _time_to_reach(self, dx, dy, vx, vy):
+        """
+        Constant-acceleration model capped at max speed.
+        Only the velocity component pointing at the goal counts as a head start.
+        """
+        dist = np.sqrt(dx**2 + dy**2)
+        safe_dist = np.where(dist > 0, dist, 1.0)
+
+        v0 = (vx * dx + vy * dy) / safe_dist
+        v0 = np.clip(v0, 0, self.max_speed)
+
+        # Phase 1: accelerate until max speed. Phase 2: cruise.
+        t_accel = (self.max_speed - v0) / self.max_accel
+        d_accel = v0 * t_accel + 0.5 * self.max_accel * t_accel**2
+
+        t_short = (-v0 + np.sqrt(v0**2 + 2 * self.max_accel * dist)) / self.max_accel
+        t_long = t_accel + (dist - d_accel) / self.max_speed
+
+        return np.where(dist <= d_accel, t_short, t_long)
@@ -0,0 +1,247 @@
+import os
+import io
+import shutil
+import contextlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+
+class BackgroundWriter:
+    """
+    Single writer thread. Serializing chunk N overlaps with computing chunk N+1;
+    submit() waits for the previous write first, so at most one chunk is in flight.
+    """
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='exporter')
+        self._pending = None
+
+    def submit(self, fn, *args):
+        self.wait()
+        self._pending = self._pool.submit(fn, *args)
+
+    def wait(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()  # re-raises writer errors in the caller
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self._pool.shutdown(wait=True)
+
+
+class _Sink:
+    """
+    Context manager: close() when the block succeeds, abort() when it raises, so a failed
+    export never leaves a truncated table where readers look for the finished one.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def close(self):
+        raise NotImplementedError
+
+    def abort(self):
+        raise NotImplementedError
+
+
+class TableSink(_Sink):
+    """
+    Append-only output for one table: CSV, a single Parquet / Feather file,
+    or a week-partitioned Parquet / Feather dataset.
+    keep_partitions (partitioned datasets only): partition values whose existing files are
+    kept as they are; everything else in the dataset is cleared.
+    """
+    def __init__(self, path: str, fmt: str, compression: str = 'zstd', partition_col: str = None,
+                 keep_partitions: Iterable = ()):
+        self.path = path
+        self.fmt = fmt
+        self.compression = compression
+        self.partition_col = partition_col
+
+        self._columns = None
+        self._schema = None
+        self._writer = None
+        self._chunk_no = 0
+
+        # Fresh output on every export (apart from the kept partitions)
+        keep = {f'{partition_col}={value}' for value in keep_partitions} if partition_col else set()
+        if os.path.isdir(path) and keep:
+            for name in os.listdir(path):
+                if name not in keep:
+                    target = os.path.join(path, name)
+                    if os.path.isdir(target):
+                        shutil.rmtree(target)
+                    else:
+                        os.remove(target)
+            self._chunk_no = max([self._part_number(name) for p in keep if os.path.isdir(os.path.join(path, p))
+                                  for name in os.listdir(os.path.join(path, p))], default=-1) + 1
+        elif os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def _part_number(name: str) -> int:
+        # part-<chunk>-<i>.<fmt>: new parts continue the numbering, never overwrite kept ones
+        try:
+            return int(name.split('-')[1])
+        except (IndexError, ValueError):
+            return -1
+
+    def append(self, df: pd.DataFrame):
+        if self._columns is None:
+            self._columns = list(df.columns)
+        df = df[self._columns]
+
+        if self.fmt == 'csv':
+            df.to_csv(self.path, index=False, mode='a', header=(self._chunk_no == 0))
+        else:
+            table = self._to_arrow(df)
+            if self.partition_col:
+                self._append_partitioned(table)
+            else:
+                self._append_single(table)
+
+        self._chunk_no += 1
+
+    def _to_arrow(self, df: pd.DataFrame) -> pa.Table:
+        """
+        Strings are dictionary-encoded. Every chunk is cast to the first chunk's
+        schema so the files of one dataset stay readable together.
+        """
+        df = df.copy()
+        str_cols = df.select_dtypes(include=['object', 'string']).columns
+        df[str_cols] = df[str_cols].astype('category')
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        if self._schema is None:
+            fields = []
+            for field in table.schema:
+                if pa.types.is_dictionary(field.type):
+                    field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+                elif pa.types.is_null(field.type):
+                    field = field.with_type(pa.string())
+                fields.append(field)
+            self._schema = pa.schema(fields)
+
+        return table.cast(self._schema)
+
+    def _append_partitioned(self, table: pa.Table):
+        file_format = ds.ParquetFileFormat() if self.fmt == 'parquet' else ds.IpcFileFormat()
+
+        ds.write_dataset(
+            table, self.path,
+            format=file_format,
+            file_options=file_format.make_write_options(compression=self.compression),
+            partitioning=[self.partition_col],
+            partitioning_flavor='hive',
+            basename_template=f'part-{self._chunk_no}-{{i}}.{self.fmt}',
+            existing_data_behavior='overwrite_or_ignore'
+        )
+
+    def _append_single(self, table: pa.Table):
+        if self._writer is None:
+            if self.fmt == 'parquet':
+                self._writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+            else:
+                options = pa.ipc.IpcWriteOptions(compression=self.compression)
+                self._writer = pa.ipc.new_file(self.path, table.schema, options=options)
+
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def abort(self):
+        """
+        Closes the open writer and deletes the partial output.
+        """
+        with contextlib.suppress(Exception):  # the file is deleted anyway
+            self.close()
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path, ignore_errors=True)
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class PlayShardSink(_Sink):
+    """
+    One compressed .npz blob per play, appended into one shard file per week.
+    play_index.csv maps (game_id, play_id) -> shard file, byte offset, byte length,
+    so a renderer can seek straight to a single play.
+    """
+    def __init__(self, shard_dir: str):
+        self.shard_dir = shard_dir
+        self._index_rows = []
+
+        if os.path.isdir(shard_dir):
+            shutil.rmtree(shard_dir)
+        os.makedirs(shard_dir)
+
+    def append(self, df_fact: pd.DataFrame, weeks: np.ndarray):
+        """
+        Plays must not be split across chunks.
+        """
+        order = np.lexsort((df_fact['frame_id'].values, df_fact['nfl_id'].values,
+                            df_fact['play_id'].values, df_fact['game_id'].values))
+        df_fact = df_fact.iloc[order].reset_index(drop=True)
+        weeks = np.asarray(weeks)[order]
+
+        game_ids = df_fact['game_id'].values
+        play_ids = df_fact['play_id'].values
+        columns = {col: df_fact[col].values for col in df_fact.columns}
+
+        # Play boundaries in one vectorized pass
+        changes = (np.diff(game_ids) != 0) | (np.diff(play_ids) != 0)
+        starts = np.r_[0, np.flatnonzero(changes) + 1]
+        stops = np.r_[starts[1:], len(df_fact)]
+
+        handles = {}
+        try:
+            for start, stop in zip(starts, stops):
+                if start == stop:
+                    continue
+                shard = f"week_{int(weeks[start]):02d}.bin"
+                if shard not in handles:
+                    handles[shard] = open(os.path.join(self.shard_dir, shard), 'ab')
+                handle = handles[shard]
+
+                buffer = io.BytesIO()
+                np.savez_compressed(buffer, **{col: arr[start:stop] for col, arr in columns.items()})
+                blob = buffer.getvalue()
+
+                self._index_rows.append({
+                    'game_id': int(game_ids[start]), 'play_id': int(play_ids[start]),
+                    'shard': shard, 'offset': handle.tell(), 'nbytes': len(blob)
+                })
+                handle.write(blob)
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def close(self):
+        index = pd.DataFrame(self._index_rows, columns=['game_id', 'play_id', 'shard', 'offset', 'nbytes'])
+        index.to_csv(os.path.join(self.shard_dir, 'play_index.csv'), index=False)
+
+    def abort(self):
+        shutil.rmtree(self.shard_dir, ignore_errors=True)
@@ -2,28 +2,60 @@ import os
 import glob
 import re
 import pandas as pd
-from typing import Generator, Tuple
+from typing import Generator, List, Tuple
 from src.schema import RawTrackingSchema, OutputTrackingSchema, RawSuppSchema
+from src.stage_cache import StageCache
+from src.selection import RunSelection, key_mask
+from src.validation import validate
 
 
 class DataLoader:
-    def __init__(self, data_dir: str, supp_file: str):
+    # Rows per chunk when a selection filters tracking files while reading
+    CHUNK_ROWS = 500_000
+
+    def __init__(self, data_dir: str, supp_file: str, selection: RunSelection = None, chunk_rows: int = None,
+                 cohorts: List = None):
         """
         Scans the directory for files but DOES NOT load them yet.
+        selection restricts which week files are opened and which rows are kept.
+        cohorts (CohortSpecs, default: the zone cohort) are the population a play sample is drawn from.
         """
         self.data_dir = data_dir
         self.supp_file = supp_file
+        self.selection = selection or RunSelection()
+        self.chunk_rows = chunk_rows or self.CHUNK_ROWS
+        self.cohorts = cohorts
+        self._play_keys = None
+        self._play_weeks = None
+        self._sample_sizes = None
 
         self.input_files = sorted(glob.glob(os.path.join(self.data_dir, 'input_*.csv')))
         self.output_files = glob.glob(os.path.join(self.data_dir, 'output_*.csv'))
         
         self.output_map = {}
         for f in self.output_files:
-            match = re.search(r'w(\d{2})', f)
+            match = re.search(r'w(\d{2})', os.path.basename(f))
             if not match:
                 continue
             self.output_map[match.group(1)] = f
 
+        self.input_map = {}
+        for f in self.input_files:
+            match = re.search(r'w(\d{2})', os.path.basename(f))
+            if not match:
+                continue
+            self.input_map[match.group(1)] = f
+
+    def fingerprint(self) -> str:
+        """
+        Identity of every raw file this loader would read (no file contents are parsed).
+        """
+        weeks = self.week_numbers()
+        paths = [self.input_map[w] for w in weeks] + [self.output_map[w] for w in weeks if w in self.output_map]
+        if os.path.exists(self.supp_file):
+            paths.append(self.supp_file)
+        return StageCache.fingerprint_files(paths)
+
     def load_supplementary(self) -> pd.DataFrame:
         """
         Loads the single Supplementary file.
@@ -32,37 +64,117 @@ class DataLoader:
             raise FileNotFoundError(f"Missing Supp File: {self.supp_file}")
             
         df = pd.read_csv(self.supp_file, low_memory=False)
+
+        if not self.selection.is_empty:
+            df = df[self.selection.supp_mask(df)].reset_index(drop=True)
+
+        df = validate(RawSuppSchema, df, boundary=True)
+
+        if self.selection.sample_frac:
+            df = df[key_mask(df, self._sampled_keys(df))].reset_index(drop=True)
             
-        return RawSuppSchema.validate(df)
+        return df
+
+    def _sampled_keys(self, supp_df: pd.DataFrame):
+        """
+        Play keys kept by the stratified sample, drawn at the filter_context stage from the
+        cohorts' plays.
+        """
+        # Local import: the preprocessor is a pipeline stage, the loader only borrows its filter
+        from src.data_preprocessor import DataPreProcessor
+
+        processor = DataPreProcessor()
+        population = len(processor.filter_context(supp_df.copy(), cohorts=self.cohorts))
+        clean = processor.filter_context(
+            supp_df.copy(), sample_frac=self.selection.sample_frac, sample_seed=self.selection.sample_seed,
+            cohorts=self.cohorts)
+        self._sample_sizes = (len(clean), population)
+        return set(zip(clean['game_id'], clean['play_id']))
+
+    def sample_fraction(self) -> float:
+        """
+        Share of the cohorts' plays the sample actually kept (strata round up, so it is at
+        least sample_frac). This is the fraction the finite-population correction needs.
+        """
+        if not self.selection.sample_frac:
+            return 1.0
+        if self._sample_sizes is None:
+            self.load_supplementary()
+        sampled, population = self._sample_sizes
+        return sampled / population if population else 1.0
+
+    def _resolve_play_keys(self):
+        """
+        (game_id, play_id) pairs and weeks matched by the selection, from the supplementary
+        file's key columns only.
+        """
+        if self._play_keys is None:
+            if self.selection.sample_frac:
+                # Sampling needs filter_context, i.e. the full supplementary columns
+                selected = self.load_supplementary()
+            else:
+                cols = ['game_id', 'play_id', 'week', 'team_coverage_type']
+                supp = pd.read_csv(self.supp_file, usecols=cols, low_memory=False)
+                selected = supp[self.selection.supp_mask(supp)]
+            self._play_keys = set(zip(selected['game_id'], selected['play_id']))
+            self._play_weeks = {f'{int(w):02d}' for w in selected['week'].unique()}
+        return self._play_keys
+
+    def week_numbers(self) -> List[str]:
+        """
+        Week numbers ('01', '02', ...) with an input file, in file order, limited to the
+        weeks the selection can touch.
+        """
+        weeks = list(self.input_map)
+        if self.selection.weeks:
+            weeks = [w for w in weeks if int(w) in self.selection.weeks]
+        if self.selection.needs_play_keys:
+            self._resolve_play_keys()
+            weeks = [w for w in weeks if w in self._play_weeks]
+        return weeks
+
+    def _read_tracking(self, path: str) -> pd.DataFrame:
+        """
+        Whole file, or only the selected plays (read in chunks, so the full week is never held).
+        """
+        if not self.selection.needs_play_keys:
+            return pd.read_csv(path, low_memory=False)
+
+        keys = self._resolve_play_keys()
+        chunks = [chunk[key_mask(chunk, keys)]
+                  for chunk in pd.read_csv(path, low_memory=False, chunksize=self.chunk_rows)]
+        return pd.concat(chunks, ignore_index=True)
+
+    def load_week(self, week_num: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Reads and validates one week. Used by stream_weeks and by parallel week workers.
+        """
+        input_path = self.input_map[week_num]
+        output_path = self.output_map.get(week_num)
+
+        # Load from Disk
+        input_raw = self._read_tracking(input_path)
+        output_raw = self._read_tracking(output_path)
+        
+        input_raw['nfl_id'] = pd.to_numeric(input_raw['nfl_id'], errors='coerce')
+        output_raw['nfl_id'] = pd.to_numeric(output_raw['nfl_id'], errors='coerce')
+
+        # VALIDATE
+        input_valid = validate(RawTrackingSchema, input_raw, boundary=True)
+        output_valid = validate(OutputTrackingSchema, output_raw, boundary=True)
+
+        return input_valid, output_valid
 
     def stream_weeks(self) -> Generator[Tuple[str, pd.DataFrame, pd.DataFrame], None, None]:
         """
         The Lazy Loader.
         Yields: (week_num, input_df, output_df)
         """
-
-        for input_path in self.input_files:
-
-            # Extract Week Number
-            match = re.search(r'w(\d{2})', input_path)
-            
-            if not match: continue
-            week_num = match.group(1)
-            
-            output_path = self.output_map.get(week_num)
+        for week_num in self.week_numbers():
 
             print(f"Streaming Week {week_num}...")
             
-            # Load from Disk
-            input_raw = pd.read_csv(input_path, low_memory=False)
-            output_raw = pd.read_csv(output_path, low_memory=False)
-            
-            input_raw['nfl_id'] = pd.to_numeric(input_raw['nfl_id'], errors='coerce')
-            output_raw['nfl_id'] = pd.to_numeric(output_raw['nfl_id'], errors='coerce')
-
-            # VALIDATE
-            input_valid = RawTrackingSchema.validate(input_raw)
-            output_valid = OutputTrackingSchema.validate(output_raw)
+            input_valid, output_valid = self.load_week(week_num)
             
             # Yield the clean, validated data to the Orchestrator
-            yield week_num, input_valid, output_valid
\ No newline at end of file
+            yield week_num, input_valid, output_valid
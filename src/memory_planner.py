@@ -0,0 +1,306 @@
+import os
+import re
+import gc
+import sys
+import ctypes
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+import pandas as pd
+from src.schema import RawTrackingSchema, OutputTrackingSchema, PhysicsSchema
+from src.telemetry import peak_rss_mb
+from src.data_preprocessor import DataPreProcessor
+
+# In-memory bytes per value: numbers by itemsize, strings as CPython objects + pointer
+# (measured ~60-75 B for BDB names / roles / team codes)
+STRING_BYTES = 64
+DTYPE_BYTES = {'bool': 1, 'int8': 1, 'int16': 2, 'int32': 4, 'float32': 4}
+
+# Peak resident memory relative to the frames a stage chain holds. Physics keeps the
+# stitched frames plus a sorted copy plus the groupby results alive; preprocessing a raw
+# week briefly holds the full CSV, its validated copy and the per-row play keys of the
+# filter (measured 2.6x). Both measured on synthetic seasons without tracemalloc
+WORKING_SET_FACTOR = 2.5
+READ_FACTOR = 2.75
+
+# Chunked reads: one chunk may use this share of the budget
+CHUNK_BUDGET_SHARE = 0.05
+MIN_CHUNK_ROWS, MAX_CHUNK_ROWS = 50_000, 2_000_000
+
+_UNITS = {'': 1, 'M': 1, 'MB': 1, 'MIB': 1, 'G': 1024, 'GB': 1024, 'GIB': 1024, 'T': 1024 ** 2, 'TB': 1024 ** 2}
+
+
+class MemoryBudgetExceeded(MemoryError):
+    pass
+
+
+def physical_memory_mb() -> Optional[int]:
+    try:
+        return int(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 1024 ** 2)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def parse_memory(value) -> Optional[int]:
+    """
+    '16GB', '512M', '2048' (MB) or 'auto' (80% of physical RAM) -> MB. Empty / 0 -> None.
+    """
+    if value in (None, '', 0, '0'):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().upper()
+    if text == 'AUTO':
+        total = physical_memory_mb()
+        if total is None:
+            raise ValueError("MAX_MEMORY='auto' needs the physical memory size, which this platform does not report")
+        return int(total * 0.8)
+    match = re.fullmatch(r'([\d.]+)\s*([A-Z]*)', text)
+    if not match or match.group(2) not in _UNITS:
+        raise ValueError(f"Cannot parse memory size {value!r} (e.g. '16GB', '512MB', 'auto')")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def process_memory_mb():
+    """
+    (current RSS, virtual size) of this process in MB; (None, None) where /proc is missing.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            size, resident = map(int, f.read().split()[:2])
+    except OSError:
+        return None, None
+    page = os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    return round(resident * page, 1), round(size * page, 1)
+
+
+def release_memory():
+    """
+    gc, then hand freed heap pages back to the OS (glibc keeps them otherwise, and RSS stays high).
+    """
+    gc.collect()
+    if sys.platform.startswith('linux'):
+        try:
+            ctypes.CDLL('libc.so.6').malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+def schema_row_bytes(schema) -> int:
+    """
+    Estimated in-memory bytes of one row of a frame conforming to schema (index included).
+    """
+    total = 8
+    for column in schema.to_schema().columns.values():
+        dtype = str(column.dtype).lower()
+        if dtype in ('str', 'object', 'string'):
+            total += STRING_BYTES
+        else:
+            total += DTYPE_BYTES.get(dtype, 8)
+    return total
+
+
+def estimate_csv_rows(path: str, sample_lines: int = 2000) -> int:
+    """
+    Data rows of a CSV from its size and the mean length of its first lines (nothing is parsed).
+    """
+    if not path or not os.path.exists(path):
+        return 0
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        lines = [line for _, line in zip(range(sample_lines), f)]
+    if not lines:
+        return 0
+    if len(lines) < sample_lines:
+        return len(lines)
+    mean_line = sum(len(line) for line in lines) / len(lines)
+    return int((size - len(header)) / mean_line)
+
+
+@dataclass
+class MemoryPlan:
+    budget_mb: int
+    base_mb: float
+    weeks: int
+    raw_rows: int
+    keep_fraction: float
+    batch_peak_mb: float
+    week_peak_mb: float
+    mode: str
+    workers: int
+    worker_max_memory_mb: int
+    chunk_rows: int
+    fits: bool
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def spill(self) -> bool:
+        return self.mode == 'weekly'
+
+    def to_dict(self) -> dict:
+        return dict(asdict(self), spill=self.spill)
+
+    def describe(self) -> str:
+        how = (f"weekly, spilling each week to disk, {self.workers} worker(s) capped at "
+               f"{self.worker_max_memory_mb} MB address space" if self.spill else "batch, in memory")
+        return (f"budget {self.budget_mb} MB -> {how}; estimated peak "
+                f"{self.week_peak_mb if self.spill else self.batch_peak_mb:.0f} MB per process "
+                f"(batch would need {self.batch_peak_mb:.0f} MB), chunks of {self.chunk_rows:,} rows")
+
+
+class MemoryPlanner:
+    """
+    Picks the execution mode, worker count, worker memory cap and read chunk size that keep
+    a run under budget_mb, from the raw file sizes and the schemas' estimated row sizes.
+
+    Estimates per process: base (interpreter + libraries, measured now) plus
+      batch: every kept frame, after physics, x WORKING_SET_FACTOR
+      week:  the largest week, raw read (x READ_FACTOR) or after physics, whichever is larger
+    Batch mode is chosen when it fits; otherwise weeks spill to disk and as many workers run
+    as fit side by side.
+    """
+    def __init__(self, budget_mb: int, working_set_factor: float = WORKING_SET_FACTOR,
+                 max_workers: int = None):
+        self.budget_mb = int(budget_mb)
+        self.working_set_factor = working_set_factor
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def plan(self, loader, keep_fraction: float = 1.0) -> MemoryPlan:
+        """
+        keep_fraction: share of raw rows that survive the play filters (see filter_context).
+        """
+        rss, vms = process_memory_mb()
+        base = rss if rss is not None else (peak_rss_mb() or 0.0)
+        # RLIMIT_AS counts virtual memory; a fresh worker maps this much beyond its RSS
+        address_overhead = (vms - rss) if rss is not None else 0.0
+
+        raw_bytes = schema_row_bytes(RawTrackingSchema)
+        out_bytes = schema_row_bytes(OutputTrackingSchema)
+        frame_bytes = schema_row_bytes(PhysicsSchema)
+        mb = 1024 ** 2
+
+        week_peaks, total_frames_mb, raw_rows = [], 0.0, 0
+        weeks = loader.week_numbers()
+        for week in weeks:
+            rows_in = estimate_csv_rows(loader.input_map.get(week))
+            rows_out = estimate_csv_rows(loader.output_map.get(week))
+            raw_rows += rows_in + rows_out
+            read_mb = (rows_in * raw_bytes + rows_out * out_bytes) * READ_FACTOR / mb
+            frames_mb = (rows_in + rows_out) * keep_fraction * frame_bytes / mb
+            total_frames_mb += frames_mb
+            week_peaks.append(max(read_mb, frames_mb * self.working_set_factor))
+
+        week_peak = base + max(week_peaks, default=0.0)
+        batch_peak = base + max(max(week_peaks, default=0.0), total_frames_mb * self.working_set_factor)
+
+        notes = []
+        if batch_peak <= self.budget_mb:
+            mode, workers = 'batch', 1
+        else:
+            mode = 'weekly'
+            # The parent stays resident (and reduces one week at a time at the end)
+            workers = int((self.budget_mb - base) // week_peak) if week_peak else 1
+            workers = max(1, min(workers, self.max_workers, len(weeks) or 1))
+        # One worker runs in the parent process; more run beside it, each with its own base
+        if mode == 'batch':
+            planned_peak = batch_peak
+        else:
+            planned_peak = week_peak if workers == 1 else base + workers * week_peak
+        fits = planned_peak <= self.budget_mb
+        if not fits:
+            notes.append(f"the largest week needs ~{week_peak:.0f} MB on its own; narrow the run "
+                         "(--weeks / --sample-frac) or raise MAX_MEMORY")
+
+        worker_cap = 0
+        if mode == 'weekly' and workers > 1:
+            share = (self.budget_mb - base) / workers
+            worker_cap = int(share + address_overhead)
+
+        largest_row = max(raw_bytes, frame_bytes)
+        chunk_rows = int(self.budget_mb * mb * CHUNK_BUDGET_SHARE / largest_row)
+        chunk_rows = min(max(chunk_rows, MIN_CHUNK_ROWS), MAX_CHUNK_ROWS)
+
+        return MemoryPlan(
+            budget_mb=self.budget_mb, base_mb=round(base, 1), weeks=len(weeks), raw_rows=raw_rows,
+            keep_fraction=round(keep_fraction, 4), batch_peak_mb=round(batch_peak, 1),
+            week_peak_mb=round(week_peak, 1), mode=mode, workers=workers,
+            worker_max_memory_mb=worker_cap, chunk_rows=chunk_rows, fits=fits, notes=notes)
+
+
+class MemoryGuard:
+    """
+    Telemetry hook that measures RSS around every stage of this process and enforces the
+    budget: above soft_fraction of it, freed memory is handed back to the OS; still above
+    the budget after that, the run stops with MemoryBudgetExceeded instead of being
+    OOM-killed further on. A stage whose transient peak crossed the budget only warns.
+    (Worker processes are held to their share by the address-space cap instead.)
+    mode / workers are what the run actually uses (default: the plan's), for the advice.
+    """
+    def __init__(self, budget_mb: int, soft_fraction: float = 0.85, plan: MemoryPlan = None,
+                 mode: str = None, workers: int = None):
+        self.budget_mb = budget_mb
+        self.soft_fraction = soft_fraction
+        self.plan = plan
+        self.mode = mode or (plan.mode if plan else None)
+        self.workers = workers or (plan.workers if plan else 1)
+        self._records: List[Dict] = []
+
+    def advice(self) -> str:
+        if self.mode == 'batch' or self.mode is None:
+            return "Use --mode weekly (intermediates spilled per week), or narrow the run (--weeks / --sample-frac)."
+        if self.workers > 1:
+            return (f"The run is already {self.mode} with {self.workers} workers: lower --workers, or narrow "
+                    "the run (--weeks / --sample-frac).")
+        return (f"The run is already {self.mode} with one worker: narrow it (--weeks / --sample-frac) "
+                "or raise MAX_MEMORY.")
+
+    def check(self, name: str) -> Optional[float]:
+        rss, _ = process_memory_mb()
+        if rss is None:
+            return None
+        if rss > self.budget_mb * self.soft_fraction:
+            release_memory()
+            rss, _ = process_memory_mb()
+        if rss > self.budget_mb:
+            raise MemoryBudgetExceeded(
+                f"RSS {rss:.0f} MB after stage '{name}' is over MAX_MEMORY={self.budget_mb} MB. {self.advice()}")
+        return rss
+
+    @contextmanager
+    def stage(self, name: str):
+        rss_before, _ = process_memory_mb()
+        peak_before = peak_rss_mb()
+        yield
+        peak_after = peak_rss_mb()
+        if peak_after is not None and peak_after > self.budget_mb and peak_after > (peak_before or 0):
+            print(f"   -> [memory] stage '{name}' peaked at {peak_after:.0f} MB, over the "
+                  f"{self.budget_mb} MB budget")
+        rss_after = self.check(name)
+        self._records.append({'stage': name, 'rss_before_mb': rss_before, 'rss_after_mb': rss_after,
+                              'process_peak_mb': peak_after})
+
+    def records(self) -> List[Dict]:
+        return list(self._records)
+
+    def report(self) -> dict:
+        return {'memory': {'budget_mb': self.budget_mb, 'peak_rss_mb': peak_rss_mb(),
+                           'plan': self.plan.to_dict() if self.plan else None, 'stages': self.records()}}
+
+    def summary(self) -> str:
+        peak = peak_rss_mb()
+        text = f"measured peak RSS {peak:.0f} MB of {self.budget_mb} MB" if peak is not None else "peak RSS unknown"
+        if self.plan is not None:
+            estimate = self.plan.week_peak_mb if self.plan.spill else self.plan.batch_peak_mb
+            text += f" (planned ~{estimate:.0f} MB per process)"
+        return text
+
+
+def estimate_keep_fraction(supp_df: pd.DataFrame, cohorts=None) -> float:
+    """
+    Share of plays the preprocessor keeps for these cohorts (their union), as a stand-in
+    for the share of tracking rows. Uses a throwaway preprocessor, so no run state changes.
+    """
+    if supp_df.empty:
+        return 1.0
+    return len(DataPreProcessor().filter_context(supp_df.copy(), cohorts=cohorts)) / len(supp_df)
@@ -1,6 +1,10 @@
 import os
+import json
+import argparse
 from datetime import datetime
 import gc
+import time
+import pandas as pd
 from src.config import DataPipelineConfig, data_config
 from src.load_data import DataLoader
 from src.data_preprocessor import DataPreProcessor
@@ -9,71 +13,623 @@ from src.context_engine import ContextEngine
 from src.eraser_engine import EraserEngine
 from src.benchmarking_engine import BenchmarkingEngine
 from src.data_exporter import DataExporter
+from src.weekly_pipeline import WeeklyPipeline, ParallelWeekExecutor
+from src.work_queue import FileWorkQueue, LeaseLost
+from src.selection import RunSelection
+from src.cohorts import parse_cohorts, select_cohort, benchmark_cohorts
+from src.sampling import report_sampling_error
+from src.stage_cache import StageCache, CachedTables
+from src.telemetry import Telemetry, count_groups
+from src.profiling import StageProfiler, parse_profile_arg, default_profile_dir
+from src.validation import configure_validation
+from src.memory_planner import MemoryPlanner, MemoryGuard, parse_memory, estimate_keep_fraction
+from src.watcher import DirectoryWatcher, watch
 
-def run_full_pipeline(DATA_DIR=None, SUPP_FILE=None, OUTPUT_DIR=None):
+# Incremental mode: week keys of the frames in the last complete export
+EXPORT_RECORD = '.incremental_export.json'
+
+# Stage DAG: forcing a stage also recomputes everything downstream of it
+STAGES = ['preprocess', 'physics', 'context', 'eraser', 'benchmarking', 'export']
+STAGE_DEPENDENCIES = {
+    'preprocess': [],
+    'physics': ['preprocess'],
+    'context': ['physics'],
+    'eraser': ['physics', 'context'],
+    'benchmarking': ['preprocess', 'context', 'eraser'],
+    'export': ['preprocess', 'physics', 'benchmarking'],
+}
+
+
+def expand_forced_stages(force_stages):
+    """
+    'all' or a list of stage names -> those stages plus their downstream stages.
+    """
+    force_stages = set(force_stages or [])
+    if 'all' in force_stages:
+        return set(STAGES)
+
+    unknown = force_stages - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stage(s) to force: {sorted(unknown)}. Valid: {STAGES}")
+
+    forced = set(force_stages)
+    for stage in STAGES:
+        if any(dep in forced for dep in STAGE_DEPENDENCIES[stage]):
+            forced.add(stage)
+    return forced
+
+
+def run_full_pipeline(DATA_DIR=None, SUPP_FILE=None, OUTPUT_DIR=None, use_cache=None, force_stages=None,
+                      profile_stages=None, profile_interval=0.005, mode=None, workers=None,
+                      worker_max_memory_mb=None, queue_dir=None, queue_role=None, selection=None,
+                      validation=None, max_memory=None, resume=False, cohorts=None, trace_memory=None):
     start_time = datetime.now()
-    print("hello")
     # Use provided arguments, else fall back to config.py values
     cfg = DataPipelineConfig(
         DATA_DIR=DATA_DIR or data_config.DATA_DIR,
         SUPP_FILE=SUPP_FILE or data_config.SUPP_FILE,
-        OUTPUT_DIR=OUTPUT_DIR or data_config.OUTPUT_DIR
+        OUTPUT_DIR=OUTPUT_DIR or data_config.OUTPUT_DIR,
+        USE_STAGE_CACHE=data_config.USE_STAGE_CACHE if use_cache is None else use_cache,
+        EXECUTION_MODE=mode or data_config.EXECUTION_MODE,
+        WORKERS=workers or data_config.WORKERS,
+        WORKER_MAX_MEMORY_MB=data_config.WORKER_MAX_MEMORY_MB if worker_max_memory_mb is None else worker_max_memory_mb,
+        QUEUE_DIR=queue_dir or data_config.QUEUE_DIR,
+        QUEUE_ROLE=queue_role or data_config.QUEUE_ROLE,
+        VALIDATION_LEVEL=validation or data_config.VALIDATION_LEVEL,
+        MAX_MEMORY=max_memory or data_config.MAX_MEMORY,
+        COHORTS=cohorts or data_config.COHORTS,
+        TELEMETRY_TRACE_MEMORY=data_config.TELEMETRY_TRACE_MEMORY if trace_memory is None else trace_memory
     )
+    if cfg.EXECUTION_MODE not in ('batch', 'weekly', 'incremental', 'queue'):
+        raise ValueError(f"Unknown execution mode: {cfg.EXECUTION_MODE}")
+    if cfg.WORKERS > 1 and cfg.EXECUTION_MODE == 'batch':
+        print(f"   -> WORKERS={cfg.WORKERS}: parallel weeks need the weekly execution mode, switching to it")
+        cfg.EXECUTION_MODE = 'weekly'
+    if resume and cfg.EXECUTION_MODE == 'batch':
+        # Batch runs already resume stage by stage through the stage cache
+        print("   -> --resume restarts from per-week checkpoints, switching to the weekly execution mode")
+        cfg.EXECUTION_MODE = 'weekly'
+
+    # Several cohorts share one pass over ingest / physics / context / eraser; only batch mode fans out
+    cohort_specs = parse_cohorts(cfg.COHORTS)
+    multi_cohort = len(cohort_specs) > 1
+    if multi_cohort and cfg.EXECUTION_MODE != 'batch':
+        raise ValueError(f"Multi-cohort runs need the batch execution mode, got '{cfg.EXECUTION_MODE}'")
+
+    # Subset runs write to their own directory, never over the full-season artifacts
+    selection = selection or RunSelection()
+    if multi_cohort and selection.sample_frac:
+        raise ValueError("--sample-frac draws its sample from a single cohort; run sampled cohorts one at a time")
+    if not selection.is_empty:
+        cfg.OUTPUT_DIR = os.path.join(cfg.OUTPUT_DIR, 'subsets', selection.scope_name())
+        print(f"   -> Subset run {selection.model_dump(exclude_none=True)} -> {cfg.OUTPUT_DIR}")
 
     os.makedirs(cfg.OUTPUT_DIR, exist_ok=True)
 
+    forced = expand_forced_stages(force_stages)
+    cache = StageCache(cfg.CACHE_DIR or os.path.join(cfg.OUTPUT_DIR, 'stage_cache'),
+                       enabled=cfg.USE_STAGE_CACHE, force=forced, keep_per_stage=cfg.CACHE_KEEP_PER_STAGE)
+    # Not part of any stage key: every level produces the same data
+    validation_policy = configure_validation(cfg.VALIDATION_LEVEL, cfg.VALIDATION_SAMPLE_ROWS)
+    if cfg.VALIDATION_LEVEL != 'full':
+        print(f"   -> Validation level '{cfg.VALIDATION_LEVEL}'")
+    profiler = StageProfiler(
+        parse_profile_arg(profile_stages, STAGES),
+        default_profile_dir(cfg.OUTPUT_DIR, 'data_pipeline'),
+        interval=profile_interval
+    )
+    telemetry = Telemetry('data_pipeline', cfg.OUTPUT_DIR, 
+                          enabled=cfg.TELEMETRY, trace_memory=cfg.TELEMETRY_TRACE_MEMORY,
+                          hooks=[profiler, validation_policy])
+
     # 1. LOAD
     print(f"[1/7] Initializing Data Loader ({datetime.now().strftime('%H:%M:%S')})...")
-    loader = DataLoader(cfg.DATA_DIR, cfg.SUPP_FILE)
-    raw_supp = loader.load_supplementary()
-    raw_tracking = loader.stream_weeks()
+    loader = DataLoader(cfg.DATA_DIR, cfg.SUPP_FILE, selection=selection, cohorts=cohort_specs)
+
+    processor = DataPreProcessor()
+    memory_guard = None
+    if cfg.MAX_MEMORY:
+        plan = apply_memory_plan(cfg, loader, cohort_specs, explicit_mode=mode is not None or resume or multi_cohort,
+                                 explicit_workers=workers is not None,
+                                 explicit_worker_memory=worker_max_memory_mb is not None)
+        memory_guard = MemoryGuard(plan.budget_mb, plan=plan, mode=cfg.EXECUTION_MODE, workers=cfg.WORKERS)
+        telemetry.hooks.append(memory_guard)
+    physics_engine = PhysicsEngine()
+    context_engine = ContextEngine()
+    eraser_engine = EraserEngine()
+    benchmarker = BenchmarkingEngine(
+        expectation=cfg.EXPECTATION_BACKEND, 
+        model_cache_dir=cfg.MODEL_CACHE_DIR
+    )
+    exporter = DataExporter(
+        cfg.OUTPUT_DIR, 
+        fmt=cfg.EXPORT_FORMAT, 
+        layout=cfg.EXPORT_LAYOUT, 
+        play_shards=cfg.EXPORT_PLAY_SHARDS
+    )
+
+    if cfg.EXECUTION_MODE in ('weekly', 'incremental'):
+        df_final = run_weekly_pipeline(cfg, loader, exporter, eraser_engine, telemetry, resume=resume,
+                                       incremental=cfg.EXECUTION_MODE == 'incremental')
+        if selection.sample_frac:
+            report_sampling_error(df_final, loader.sample_fraction(), cfg.OUTPUT_DIR, seed=selection.sample_seed)
+        if memory_guard:
+            print(f"   -> [memory] {memory_guard.summary()}")
+        telemetry.write()
+        print(f"PIPELINE FINISHED in {datetime.now() - start_time}")
+        return
+
+    if cfg.EXECUTION_MODE == 'queue':
+        if not cfg.QUEUE_DIR:
+            raise ValueError("Queue mode needs a shared QUEUE_DIR (--queue-dir)")
+        if cfg.QUEUE_ROLE == 'worker':
+            run_queue_worker(cfg, loader, eraser_engine, telemetry)
+            telemetry.write(os.path.join(cfg.QUEUE_DIR, 'telemetry', 
+                                         f"worker_{FileWorkQueue(cfg.QUEUE_DIR).worker_id}.json"))
+        elif cfg.QUEUE_ROLE == 'reduce':
+            df_final = run_queue_reducer(cfg, loader, exporter, eraser_engine, telemetry)
+            if selection.sample_frac:
+                report_sampling_error(df_final, loader.sample_fraction(), cfg.OUTPUT_DIR, seed=selection.sample_seed)
+            telemetry.write()
+        else:
+            raise ValueError(f"Unknown queue role: {cfg.QUEUE_ROLE}")
+        print(f"PIPELINE FINISHED in {datetime.now() - start_time}")
+        return
+
+    # Stage keys: code + config + upstream keys (raw files are fingerprinted, not read)
+    keys = {}
+    keys['preprocess'] = cache.key('preprocess', DataPreProcessor, loader.fingerprint(),
+                                   config={'selection': selection.model_dump(),
+                                           'cohorts': [c.model_dump() for c in cohort_specs]},
+                                   modules=('src.cohorts', 'src.sampling', 'src.selection', 'src.load_data'))
+    keys['physics'] = cache.key('physics', PhysicsEngine, keys['preprocess'])
+    keys['context'] = cache.key('context', ContextEngine, keys['physics'])
+    keys['eraser'] = cache.key(
+        'eraser', EraserEngine, keys['physics'], keys['context'],
+        config={'max_speed': eraser_engine.max_speed, 'max_accel': eraser_engine.max_accel})
+    keys['benchmarking'] = cache.key(
+        'benchmarking', BenchmarkingEngine, keys['preprocess'], keys['context'], keys['eraser'],
+        config={'expectation': cfg.EXPECTATION_BACKEND}, modules=('src.expectation_model', 'src.cohorts'))
+    keys['export'] = cache.key(
+        'export', DataExporter, keys['preprocess'], keys['physics'], keys['benchmarking'],
+        config={'fmt': cfg.EXPORT_FORMAT, 'layout': cfg.EXPORT_LAYOUT, 'shards': cfg.EXPORT_PLAY_SHARDS},
+        modules=('src.export_writers', 'src.cohorts'))
 
     # 2. PREPROCESS
+    def build_preprocess():
+        raw_supp = loader.load_supplementary()
+        raw_tracking = loader.stream_weeks()
+        df_clean = processor.run(data_stream=raw_tracking, raw_context_df=raw_supp, cohorts=cohort_specs)
+        return {'frames': df_clean, 'player_plays': processor.player_play_df, 'cohorts': processor.cohort_membership}
+
     print("[2/7] Preprocessing & Stitching frames...")
-    processor = DataPreProcessor()
-    df_clean = processor.run(data_stream=raw_tracking, raw_context_df=raw_supp)
+    with telemetry.stage('preprocess') as st:
+        preprocessed = cache.run('preprocess', keys['preprocess'], build_preprocess)
+        st.cached = isinstance(preprocessed, CachedTables)
+        if not st.cached:
+            st.outputs(preprocessed['frames'], preprocessed['player_plays'])
+            st.groups = count_groups(preprocessed['player_plays'])
 
     # 3. PHYSICS
     print("[3/7] Running Physics Engine (Kinematics)...")
-    physics_engine = PhysicsEngine()
-    df_physics = physics_engine.derive_metrics(df_clean)
+    with telemetry.stage('physics') as st:
+        physics = cache.run('physics', keys['physics'], 
+                            lambda: {'frames': physics_engine.derive_metrics(preprocessed['frames'])})
+        st.cached = isinstance(physics, CachedTables)
+        # A cache hit loads nothing: the frames are read only if a later stage has to run
+        if not st.cached:
+            st.inputs(preprocessed['frames'])
+            st.outputs(physics['frames'])
+            st.groups = count_groups(physics['frames'])
     
-    del df_clean
+    # Only the small player-play dimension (and cohort membership) is needed from here on
+    df_players = preprocessed['player_plays']
+    df_cohorts = preprocessed['cohorts']
+    del preprocessed
     gc.collect() 
 
     # 4. CONTEXT
-    # TODO: Note this is changing the dataframe entirely - df_physics is our animation dataset.
+    # TODO: Note this is changing the dataframe entirely - physics['frames'] is our animation dataset.
     print("[4/7] Phase A: Calculating Void Context (S_throw)...")
-    context_engine = ContextEngine()
-    df_context = context_engine.calculate_void_context(df_physics)
+    with telemetry.stage('context') as st:
+        context = cache.run('context', keys['context'],
+                            lambda: {'context': context_engine.calculate_void_context(physics['frames'])})
+        df_context = context['context']
+        st.cached = isinstance(context, CachedTables)
+        if not st.cached:
+            st.inputs(physics['frames'])
+        st.outputs(df_context)
+        st.groups = count_groups(df_context)
     
     # Debugging
     print(f"   -> Identified Voids for {df_context.shape[0]} plays.")
 
     # 5. ERASER
     print("[5/7] Phase B: Calculating Eraser Metrics (VIS)...")
-    eraser_engine = EraserEngine()
-    df_metrics = eraser_engine.calculate_eraser(df_physics, df_context)
+    with telemetry.stage('eraser') as st:
+        metrics = cache.run('eraser', keys['eraser'],
+                            lambda: {'metrics': eraser_engine.calculate_eraser(physics['frames'], df_context)})
+        df_metrics = metrics['metrics']
+        st.cached = isinstance(metrics, CachedTables)
+        if not st.cached:
+            st.inputs(physics['frames'])
+        st.inputs(df_context)
+        st.outputs(df_metrics)
+        st.groups = count_groups(df_metrics)
 
     # 6. BENCHMARKING
+    # Baselines are population statistics, so CEOE is the only stage computed per cohort
     print("[6/7] Phase C: Benchmarking (CEOE)...")
-    benchmarker = BenchmarkingEngine()
-    df_final = benchmarker.calculate_ceoe(
-        df_metrics=df_metrics, 
-        df_context=df_context, 
-        df_physics=df_physics
-    )
+    with telemetry.stage('benchmarking') as st:
+        final = cache.run('benchmarking', keys['benchmarking'], lambda: benchmark_cohorts(
+            benchmarker, cohort_specs, df_metrics, df_context, df_players, df_cohorts))
+        df_final = final['summary']
+        st.cached = isinstance(final, CachedTables)
+        st.inputs(df_metrics, df_context, df_players)
+        st.outputs(*(final[name] for name in final))
+        st.groups = count_groups(df_final)
 
     # 7. EXPORT
     print("[7/7] Phase D: Exporting Results...")
-    exporter = DataExporter(cfg.OUTPUT_DIR)
-    exporter.export_results(
-        df_summary=df_final, 
-        df_frames=df_physics
-    )
+    export_marker = os.path.join(cfg.OUTPUT_DIR, '.export_key')
+    with telemetry.stage('export') as st:
+        st.inputs(df_final, df_players)
+        outputs_present = all(os.path.exists(p) for p in exporter.output_paths())
+        if 'export' not in forced and outputs_present and cache.is_marked(export_marker, keys['export']):
+            st.cached = True
+            print(f"   -> [export] outputs in {cfg.OUTPUT_DIR} are up to date ({keys['export']})")
+        else:
+            # Cached physics frames are streamed one week at a time from the cache entry; a
+            # freshly built (or uncached) season is already in memory and is split by week
+            if isinstance(physics, CachedTables):
+                week_frames = physics.iter_groups('frames', 'week')
+            else:
+                st.inputs(physics['frames'])
+                week_frames = physics['frames'].groupby('week', sort=True)
+            # The animation export follows the primary cohort
+            primary = cohort_specs[0].name
+            in_primary = (lambda df: select_cohort(df, df_cohorts, primary)) if multi_cohort else (lambda df: df)
+            weeks_exported = []
+
+            def primary_frames():
+                for week, week_df in week_frames:
+                    weeks_exported.append(week)
+                    yield in_primary(week_df)
+
+            exporter.export_results(df_summary=df_final, df_frames=primary_frames(),
+                                    df_players=in_primary(df_players))
+            st.groups = len(weeks_exported)
+            if cfg.USE_STAGE_CACHE:
+                cache.mark(export_marker, keys['export'])
+        if multi_cohort:
+            export_cohorts(cohort_specs, final, df_cohorts, cfg.OUTPUT_DIR)
+    
+    # Sampled runs: how far the baselines / leaderboard are likely to be from a full run
+    if selection.sample_frac:
+        report_sampling_error(df_final, loader.sample_fraction(), cfg.OUTPUT_DIR, seed=selection.sample_seed)
     
     duration = datetime.now() - start_time
+    if memory_guard:
+        print(f"   -> [memory] {memory_guard.summary()}")
+    telemetry.write()
     print(f"PIPELINE FINISHED in {duration}")
 
+
+def export_cohorts(cohort_specs, tables, df_cohorts, output_dir):
+    """
+    OUTPUT_DIR/cohorts/<name>/: each cohort's summary (context, eraser and CEOE per defender-play)
+    and leaderboard, plus cohorts/cohorts.csv with their sizes.
+    """
+    rows = []
+    for i, spec in enumerate(cohort_specs):
+        name = 'summary' if i == 0 else f'cohort_{spec.name}'
+        df_summary = tables[name] if name in tables else pd.DataFrame()
+        cohort_dir = os.path.join(output_dir, 'cohorts', spec.name)
+        os.makedirs(cohort_dir, exist_ok=True)
+        df_summary.to_csv(os.path.join(cohort_dir, 'eraser_analysis_summary.csv'), index=False)
+        write_leaderboard(df_summary, cohort_dir)
+        rows.append({'cohort': spec.name, 'primary': i == 0, 'plays': int(df_cohorts[spec.name].sum()),
+                     'defender_plays': len(df_summary),
+                     'mean_ceoe': round(df_summary['ceoe_score'].mean(), 4) if len(df_summary) else None})
+
+    overview = pd.DataFrame(rows)
+    overview.to_csv(os.path.join(output_dir, 'cohorts', 'cohorts.csv'), index=False)
+    print(f"   -> Saved {len(rows)} cohort summaries to {os.path.join(output_dir, 'cohorts')}")
+    print(overview.to_string(index=False))
+
+
+def apply_memory_plan(cfg, loader, cohorts=None, explicit_mode=False, explicit_workers=False,
+                      explicit_worker_memory=False):
+    """
+    Sizes the run to MAX_MEMORY: batch when everything fits in memory, otherwise weekly
+    (intermediates spilled per week) with as many capped workers as fit. Settings given on
+    the command line are kept. Subset runs are planned as if whole week files were read.
+    """
+    budget_mb = parse_memory(cfg.MAX_MEMORY)
+    keep_fraction = estimate_keep_fraction(loader.load_supplementary(), cohorts)
+    plan = MemoryPlanner(budget_mb).plan(loader, keep_fraction)
+    print(f"   -> Memory plan: {plan.describe()}")
+    for note in plan.notes:
+        print(f"   -> [memory] {note}")
+
+    if cfg.EXECUTION_MODE not in ('queue', 'incremental') and not explicit_mode:
+        cfg.EXECUTION_MODE = plan.mode
+    elif cfg.EXECUTION_MODE == 'batch' and plan.spill:
+        print("   -> [memory] batch mode was requested but is estimated to exceed the budget")
+    if not explicit_workers:
+        cfg.WORKERS = plan.workers
+    if not explicit_worker_memory:
+        cfg.WORKER_MAX_MEMORY_MB = plan.worker_max_memory_mb
+    loader.chunk_rows = plan.chunk_rows
+    return plan
+
+
+def run_weekly_pipeline(cfg, loader, exporter, eraser_engine, telemetry, resume=False, incremental=False):
+    """
+    Streaming mode: each week runs preprocess -> physics -> context -> eraser on its own and
+    spills to OUTPUT_DIR/weekly/. Benchmarking and export then work from the per-week results,
+    so peak memory is about one week. The stage cache is not used in this mode.
+    Every finished week is a checkpoint; resume=True reruns only the missing or stale weeks,
+    then rebuilds the (deterministic) global outputs.
+    incremental=True always resumes, and also keeps the export's frame partitions of unchanged
+    weeks (see export_incremental), so adding a week costs about one week of work.
+    """
+    weekly = WeeklyPipeline(
+        os.path.join(cfg.OUTPUT_DIR, 'weekly'),
+        expectation=cfg.EXPECTATION_BACKEND,
+        model_cache_dir=cfg.MODEL_CACHE_DIR,
+        eraser_engine=eraser_engine,
+        telemetry=telemetry,
+        cohorts=parse_cohorts(cfg.COHORTS)
+    )
+    clean_context = weekly.filter_context(loader.load_supplementary())
+    week_keys = weekly.compute_week_keys(loader, clean_context)
+    reused = weekly.start_run(week_keys, resume=resume or incremental)
+    if resume and not reused:
+        print("   -> Nothing to resume from (no matching week checkpoints), starting from week 1")
+
+    # 2-5. PER-WEEK STAGES
+    print("[2/7] Weekly mode: Preprocess -> Physics -> Context -> Eraser per week...")
+    executor = ParallelWeekExecutor(weekly, workers=cfg.WORKERS, max_memory_mb=cfg.WORKER_MAX_MEMORY_MB)
+    week_stats = executor.run(loader, clean_context)
+    print(f"   -> {len(week_stats)} weeks done, slowest week {max([s.get('wall_s', 0) for s in week_stats], default=0):.1f}s")
+
+    if incremental:
+        return export_incremental(cfg, weekly, exporter, telemetry, week_keys)
+    return reduce_and_export(weekly, exporter, telemetry)
+
+
+def export_incremental(cfg, weekly, exporter, telemetry, week_keys):
+    """
+    Global tail of the incremental mode. Baselines, summary and leaderboard are always rebuilt
+    from the per-week partials (cheap); in the star layout with a partitioned format, the frame
+    partitions of weeks exported before with the same key are kept instead of rewritten.
+    """
+    record_path = os.path.join(cfg.OUTPUT_DIR, EXPORT_RECORD)
+    export_config = {'fmt': cfg.EXPORT_FORMAT, 'layout': cfg.EXPORT_LAYOUT, 'shards': cfg.EXPORT_PLAY_SHARDS}
+    previous = {}
+    if os.path.exists(record_path):
+        with open(record_path) as f:
+            previous = json.load(f)
+
+    exported = previous.get('weeks', {}) if previous.get('export') == export_config else {}
+    unchanged = [w for w, key in week_keys.items() if exported.get(str(w)) == key]
+    if len(unchanged) == len(week_keys) == len(exported):
+        print(f"   -> [incremental] all {len(unchanged)} weeks already exported, outputs are up to date")
+        return pd.read_csv(os.path.join(cfg.OUTPUT_DIR, 'eraser_analysis_summary.csv'))
+    print(f"   -> [incremental] {len(week_keys) - len(unchanged)} new / changed weeks, "
+          f"{len(unchanged)} unchanged")
+
+    # An export that dies half way leaves no record, so the next run rewrites everything
+    if os.path.exists(record_path):
+        os.remove(record_path)
+    df_final = reduce_and_export(weekly, exporter, telemetry, reuse_frame_weeks=unchanged)
+    write_leaderboard(df_final, cfg.OUTPUT_DIR)
+
+    with open(record_path, 'w') as f:
+        json.dump({'export': export_config, 'weeks': {str(w): key for w, key in week_keys.items()}}, f, indent=2)
+    return df_final
+
+
+def write_leaderboard(df_summary, output_dir):
+    """
+    Shrunk CEOE leaderboard next to a summary (incremental and per-cohort outputs).
+    """
+    # Local import: the leaderboard logic belongs to the analysis package
+    from src.analysis.table_generator import TableGenerator
+
+    path = os.path.join(output_dir, 'ceoe_leaderboard.csv')
+    if df_summary.empty:
+        return
+    TableGenerator(df_summary).generate_shrunk_leaderboard().to_csv(path, index=False)
+    print(f"   -> Saved CEOE leaderboard to {path}")
+
+
+def reduce_and_export(weekly, exporter, telemetry, reuse_frame_weeks=(), weeks=None):
+    """
+    Global tail of the weekly / queue modes: CEOE baselines from the per-week partials, then
+    the export with frames read back one week at a time. weeks defaults to the completed
+    week directories.
+    """
+    weeks = weekly.completed_weeks() if weeks is None else sorted(weeks)
+
+    # 6. BENCHMARKING (global baselines from per-week partials)
+    print("[6/7] Phase C: Benchmarking (CEOE) from weekly partials...")
+    with telemetry.stage('benchmarking') as st:
+        reduced = weekly.reduce(weeks)
+        st.outputs(reduced['summary'])
+        st.groups = count_groups(reduced['summary'])
+
+    # 7. EXPORT (frames streamed back one week at a time)
+    print("[7/7] Phase D: Exporting Results...")
+    with telemetry.stage('export') as st:
+        st.inputs(reduced['summary'], reduced['player_plays'])
+        exporter.export_results(
+            df_summary=reduced['summary'],
+            df_frames=weekly.iter_frames(weeks),
+            df_players=reduced['player_plays'],
+            reuse_frame_weeks=reuse_frame_weeks
+        )
+        st.groups = len(weeks)
+
+    return reduced['summary']
+
+
+def _queue_pipeline(cfg, eraser_engine, telemetry):
+    return WeeklyPipeline(
+        os.path.join(cfg.QUEUE_DIR, 'weekly'),
+        expectation=cfg.EXPECTATION_BACKEND,
+        model_cache_dir=cfg.MODEL_CACHE_DIR,
+        eraser_engine=eraser_engine,
+        telemetry=telemetry,
+        cohorts=parse_cohorts(cfg.COHORTS)
+    )
+
+
+def run_queue_worker(cfg, loader, eraser_engine, telemetry, queue=None):
+    """
+    Multi-node mode, worker role. Claims week shards from the shared QUEUE_DIR until none
+    are claimable, writing each week to QUEUE_DIR/weekly/. Any host sharing the filesystem
+    can run this; a crashed worker's weeks are re-claimed once its lease expires.
+    """
+    queue = queue or FileWorkQueue(cfg.QUEUE_DIR, lease_seconds=cfg.QUEUE_LEASE_SECONDS)
+    queue.enqueue({f'week_{w}': {'week': w} for w in loader.week_numbers()})
+
+    weekly = _queue_pipeline(cfg, eraser_engine, telemetry)
+    clean_context = weekly.filter_context(loader.load_supplementary())
+
+    processed = []
+    while True:
+        claimed = queue.claim()
+        if claimed is None:
+            break
+        task_id, attempt = claimed
+        week_num = queue.spec(task_id)['week']
+
+        start = time.perf_counter()
+        try:
+            with queue.lease(task_id, attempt):
+                input_df, output_df = loader.load_week(week_num)
+                stats = weekly.process_week(week_num, input_df, output_df, clean_context,
+                                            owns=lambda: queue.owns(task_id, attempt))
+                del input_df, output_df
+                gc.collect()
+            stats['wall_s'] = round(time.perf_counter() - start, 3)
+            queue.complete(task_id, attempt, stats)
+        except LeaseLost as e:
+            # Someone else re-ran this week; its outputs are identical, so just move on
+            print(f"   -> {e}")
+            continue
+        print(f"   -> [{queue.worker_id}] {task_id} done in {stats['wall_s']:.1f}s")
+        processed.append(stats)
+
+    print(f"   -> [{queue.worker_id}] no claimable weeks left ({queue.status()})")
+    return processed
+
+
+def run_queue_reducer(cfg, loader, exporter, eraser_engine, telemetry, poll_seconds=5.0, timeout=None):
+    """
+    Multi-node mode, reduce role. Helps with any pending or expired weeks, waits for the
+    rest, then builds the final summary and animation outputs in OUTPUT_DIR.
+    """
+    queue = FileWorkQueue(cfg.QUEUE_DIR, lease_seconds=cfg.QUEUE_LEASE_SECONDS)
+
+    print(f"[2/7] Queue mode: working / waiting on {cfg.QUEUE_DIR}...")
+    help_out = lambda: run_queue_worker(cfg, loader, eraser_engine, telemetry, queue=queue)
+    queue.wait_all(poll_seconds, timeout, work=help_out)
+
+    # The done records say which weeks are final; a directory listing could see a stale
+    # writer's copy mid-replace
+    os.makedirs(cfg.OUTPUT_DIR, exist_ok=True)
+    weekly = _queue_pipeline(cfg, eraser_engine, telemetry)
+    return reduce_and_export(weekly, exporter, telemetry, weeks=[r['week'] for r in queue.results()])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="NFL Void Engine - data engineering pipeline")
+    parser.add_argument('--data-dir', default=None)
+    parser.add_argument('--supp-file', default=None)
+    parser.add_argument('--output-dir', default=None)
+    parser.add_argument('--mode', choices=['batch', 'weekly', 'incremental', 'queue'], default=None,
+                        help="Execution mode (default: EXECUTION_MODE in config). 'weekly' streams one week "
+                             "at a time through preprocess -> eraser; 'incremental' only processes new or "
+                             "changed weeks.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for the per-week chain (implies --mode weekly when > 1).")
+    parser.add_argument('--worker-max-memory-mb', type=int, default=None,
+                        help="Address-space limit per worker process in MB (0 = unlimited).")
+    parser.add_argument('--queue-dir', default=None,
+                        help="Shared work directory for --mode queue (use a fresh one per run).")
+    parser.add_argument('--queue-role', choices=['worker', 'reduce'], default=None,
+                        help="Queue mode: 'worker' claims and processes weeks; 'reduce' also helps, "
+                             "then waits for all weeks and writes the final outputs.")
+    parser.add_argument('--weeks', default=None, help="Only these weeks, e.g. 1-3,5.")
+    parser.add_argument('--games', default=None, help="Only these game_ids (comma-separated).")
+    parser.add_argument('--plays', default=None,
+                        help="Only these plays: game_id:play_id, or a bare play_id (any game). Comma-separated.")
+    parser.add_argument('--coverage', default=None, help="Only these team_coverage_type values, e.g. COVER_3_ZONE.")
+    parser.add_argument('--sample-frac', type=float, default=None,
+                        help="Run on a stratified sample of plays (by week and coverage), e.g. 0.1, and "
+                             "report bootstrap error bars against a full run.")
+    parser.add_argument('--sample-seed', type=int, default=42)
+    parser.add_argument('--validation', choices=['full', 'boundary', 'sample', 'off'], default=None,
+                        help="pandera checks (default: VALIDATION_LEVEL in config). 'boundary' checks raw "
+                             "inputs and exports only; 'sample' checks a random subset of rows.")
+    parser.add_argument('--max-memory', default=None,
+                        help="Memory budget, e.g. 16GB or 'auto'. Picks batch vs weekly mode, workers, "
+                             "worker memory caps and chunk sizes, and stops the run if RSS stays above it.")
+    parser.add_argument('--resume', action='store_true',
+                        help="Weekly mode: keep the weeks a previous (crashed) run checkpointed in "
+                             "OUTPUT_DIR/weekly/ and continue from the first incomplete week.")
+    parser.add_argument('--cohorts', default=None,
+                        help="Comma-separated cohort presets (zone, man, third_down) or a JSON file of cohort "
+                             "specs. All are evaluated in one pass; the first drives the main outputs, each "
+                             "gets OUTPUT_DIR/cohorts/<name>/ (default: COHORTS in config, else zone).")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running: poll DATA_DIR and SUPP_FILE and rerun incrementally whenever "
+                             "week files are added or changed (implies --mode incremental).")
+    parser.add_argument('--poll-seconds', type=float, default=None,
+                        help="Seconds between --watch polls (default: WATCH_POLL_SECONDS in config).")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the stage cache for this run.")
+    parser.add_argument('--force-stage', action='append', default=[], metavar='STAGE',
+                        help=f"Recompute a stage and everything downstream. One of {STAGES} or 'all'. "
+                             "Repeatable, or comma-separated.")
+    parser.add_argument('--profile', action='append', default=[], metavar='STAGES',
+                        help="Sample-profile these stages (e.g. physics,eraser or 'all'); writes "
+                             "collapsed stacks + top functions to OUTPUT_DIR/profiles/.")
+    parser.add_argument('--profile-interval', type=float, default=0.005, help="Sampling interval in seconds.")
+    parser.add_argument('--trace-memory', action='store_true', default=None,
+                        help="tracemalloc peaks and deep frame sizes in the telemetry (several times slower).")
+    args = parser.parse_args(argv)
+    args.force_stage = [s.strip() for item in args.force_stage for s in item.split(',') if s.strip()]
+    return args
+
+
 if __name__ == "__main__":
-    run_full_pipeline()
\ No newline at end of file
+    args = parse_args()
+    run = lambda: run_full_pipeline(
+        DATA_DIR=args.data_dir,
+        SUPP_FILE=args.supp_file,
+        OUTPUT_DIR=args.output_dir,
+        use_cache=False if args.no_cache else None,
+        force_stages=args.force_stage,
+        profile_stages=args.profile,
+        profile_interval=args.profile_interval,
+        mode='incremental' if args.watch else args.mode,
+        workers=args.workers,
+        worker_max_memory_mb=args.worker_max_memory_mb,
+        queue_dir=args.queue_dir,
+        queue_role=args.queue_role,
+        validation=args.validation,
+        max_memory=args.max_memory,
+        resume=args.resume,
+        cohorts=args.cohorts,
+        trace_memory=args.trace_memory,
+        selection=RunSelection.from_args(args.weeks, args.games, args.plays, args.coverage,
+                                         sample_frac=args.sample_frac, sample_seed=args.sample_seed)
+    )
+    if args.watch:
+        watch(run, DirectoryWatcher(args.data_dir or data_config.DATA_DIR, args.supp_file or data_config.SUPP_FILE,
+                                    poll_seconds=args.poll_seconds or data_config.WATCH_POLL_SECONDS))
+    else:
+        run()
@@ -2,8 +2,12 @@ import pandas as pd
 import numpy as np
 from scipy.signal import savgol_filter
 from src.schema import PhysicsSchema
+from src.validation import validate
 
 class PhysicsEngine:
+    # Stage-cache version: bump for behaviour changes that live outside this module
+    VERSION = 1
+
     def __init__(self):
         self.output_schema = PhysicsSchema
 
@@ -68,4 +72,4 @@ class PhysicsEngine:
         df.loc[physics_cols.index, 's_derived'] = physics_cols['s_derived']
         df.loc[physics_cols.index, 'a_derived'] = physics_cols['a_derived']
 
-        return self.output_schema.validate(df)
\ No newline at end of file
+        return validate(self.output_schema, df)
\ No newline at end of file
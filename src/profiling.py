@@ -0,0 +1,157 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Iterable, Optional
+
+import pandas as pd
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a daemon thread.
+    Stacks are kept as root->leaf collapsed strings with hit counts.
+    """
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='stack-sampler', daemon=True)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def top_functions(self, n: int = 25) -> pd.DataFrame:
+        """
+        self = samples where the function is the leaf, total = samples where it is on the stack.
+        """
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for label in set(frames):
+                total[label] += count
+
+        if not total:
+            return pd.DataFrame(columns=['function', 'self_samples', 'self_pct', 'total_samples', 'total_pct'])
+
+        df = pd.DataFrame({'function': list(total), 'total_samples': list(total.values())})
+        df['self_samples'] = df['function'].map(own).fillna(0).astype(int)
+        df['self_pct'] = (100 * df['self_samples'] / self.samples).round(1)
+        df['total_pct'] = (100 * df['total_samples'] / self.samples).round(1)
+        df = df.sort_values(['self_samples', 'total_samples'], ascending=False).head(n)
+        return df[['function', 'self_samples', 'self_pct', 'total_samples', 'total_pct']].reset_index(drop=True)
+
+
+class StageProfiler:
+    """
+    Opt-in sampling profiler for named pipeline stages.
+
+    For each selected stage it writes, under output_dir:
+      <stage>.collapsed   one 'root;...;leaf count' line per stack (flamegraph.pl, speedscope, inferno)
+      <stage>_top.txt     top-N hot functions by self time
+
+    Stages that were not selected get a nullcontext, so an idle profiler costs nothing.
+    Only the thread that runs the stage is sampled. A stage that runs several times
+    (e.g. once per week) accumulates into one profile.
+    """
+    def __init__(self, stages: Iterable[str] = (), output_dir: str = '.',
+                 interval: float = 0.005, top_n: int = 25):
+        self.stages = set(stages or [])
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top_n = top_n
+        self.outputs = {}
+        self._samplers = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.stages)
+
+    def stage(self, name: str):
+        if name not in self.stages:
+            return nullcontext()
+        return self._profile(name)
+
+    @contextmanager
+    def _profile(self, name: str):
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        t0 = time.perf_counter()
+        try:
+            yield sampler
+        finally:
+            sampler.stop()
+            previous = self._samplers.get(name)
+            if previous is not None:
+                sampler.stacks.update(previous.stacks)
+                sampler.samples += previous.samples
+                sampler.elapsed = previous.elapsed + (time.perf_counter() - t0)
+            else:
+                sampler.elapsed = time.perf_counter() - t0
+            self._samplers[name] = sampler
+            self.outputs[name] = self._write(name, sampler)
+
+    def _write(self, name: str, sampler: StackSampler) -> dict:
+        os.makedirs(self.output_dir, exist_ok=True)
+        collapsed_path = os.path.join(self.output_dir, f'{name}.collapsed')
+        top_path = os.path.join(self.output_dir, f'{name}_top.txt')
+
+        with open(collapsed_path, 'w') as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        top = sampler.top_functions(self.top_n)
+        with open(top_path, 'w') as f:
+            f.write(f"stage={name} samples={sampler.samples} interval_ms={self.interval * 1000:g} "
+                    f"wall_s={sampler.elapsed:.3f}\n\n")
+            f.write(top.to_string(index=False) if not top.empty else "(no samples)")
+            f.write("\n")
+
+        print(f"   -> [{name}] profile: {sampler.samples} samples -> {collapsed_path}")
+        return {'collapsed': collapsed_path, 'top': top_path, 'samples': sampler.samples}
+
+
+def parse_profile_arg(value: Optional[Iterable[str]], valid: Iterable[str]) -> set:
+    """
+    ['physics,eraser', 'context'] -> {'physics', 'eraser', 'context'}; 'all' selects every stage.
+    """
+    valid = list(valid)
+    stages = {s.strip() for item in (value or []) for s in item.split(',') if s.strip()}
+    if 'all' in stages:
+        return set(valid)
+    unknown = stages - set(valid)
+    if unknown:
+        raise ValueError(f"Unknown stage(s) to profile: {sorted(unknown)}. Valid: {valid}")
+    return stages
+
+
+def default_profile_dir(output_dir: str, pipeline: str) -> str:
+    return os.path.join(output_dir, 'profiles', f"{pipeline}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
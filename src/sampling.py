@@ -0,0 +1,180 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Sequence
+from src.utils import rank_desc
+
+# Sampling strata known at filter_context time (void_type only exists after physics)
+SAMPLE_STRATA = ['week', 'team_coverage_type']
+# Resampling strata for the error estimates
+ERROR_STRATA = ['week', 'team_coverage_type', 'void_type']
+
+
+def sample_plays(supp_df: pd.DataFrame, frac: float, seed: int = 42,
+                 strata: Sequence[str] = SAMPLE_STRATA) -> pd.DataFrame:
+    """
+    Stratified play sample: ceil(frac * n) plays from every stratum.
+
+    Plays are ranked by a seeded hash of (game_id, play_id), so the sample depends
+    only on the seed and the play set, not on row order or which process draws it.
+    """
+    if not 0 < frac <= 1:
+        raise ValueError(f"sample_frac must be in (0, 1], got {frac}")
+    if frac == 1 or supp_df.empty:
+        return supp_df
+
+    # hash_key only salts object columns, so the seed goes in as a column of its own
+    keys = supp_df[['game_id', 'play_id']].assign(_seed=seed)
+    play_hash = pd.util.hash_pandas_object(keys, index=False)
+
+    strata = [c for c in strata if c in supp_df.columns]
+    ranked = supp_df.assign(_hash=play_hash.values)
+    rank = ranked.groupby(strata, dropna=False)['_hash'].rank(method='first')
+    size = ranked.groupby(strata, dropna=False)['_hash'].transform('size')
+
+    return supp_df[(rank <= np.ceil(frac * size)).values]
+
+
+def group_codes(df: pd.DataFrame, keys) -> np.ndarray:
+    """
+    Sorted group number of every row; -1 where a key is missing (ngroup() drops those groups).
+    """
+    return df.groupby(keys, sort=True).ngroup().fillna(-1).astype(int).values
+
+
+class SamplingErrorEstimator:
+    """
+    How far a sampled run's CEOE baselines and leaderboard are likely to be from a full run.
+
+    Plays are resampled with replacement inside (week, coverage, void_type) strata, the
+    baselines and per-player CEOE are recomputed per replicate, and the spread is scaled by
+    the finite-population correction sqrt(1 - frac), frac being the sampled share of the
+    run's cohort (see DataLoader.sample_fraction).
+    """
+    def __init__(self, summary_df: pd.DataFrame, frac: float, n_boot: int = 500, seed: int = 42,
+                 ci: float = 0.95, min_snaps: int = 5, top_n: int = 25):
+        self.df = summary_df.reset_index(drop=True)
+        self.frac = frac
+        self.n_boot = n_boot
+        self.seed = seed
+        self.ci = ci
+        self.min_snaps = min_snaps
+        self.top_n = top_n
+        self.fpc = np.sqrt(max(0.0, 1.0 - frac))
+
+    def _play_weights(self) -> np.ndarray:
+        """
+        (n_boot, n_rows) resampling weights; a play's weight applies to all its defenders.
+        """
+        rng = np.random.default_rng(self.seed)
+        play_idx = self.df.groupby(['game_id', 'play_id'], sort=True).ngroup().values
+        plays = self.df.drop_duplicates(['game_id', 'play_id']).sort_values(['game_id', 'play_id'])
+        strata_idx = plays.groupby(ERROR_STRATA, dropna=False).ngroup().values
+
+        play_weights = np.zeros((self.n_boot, len(plays)))
+        for stratum in np.unique(strata_idx):
+            members = np.flatnonzero(strata_idx == stratum)
+            n = len(members)
+            play_weights[:, members] = rng.multinomial(n, np.full(n, 1.0 / n), size=self.n_boot)
+
+        return play_weights[:, play_idx]
+
+    def _interval(self, estimate: np.ndarray, replicates: np.ndarray):
+        """
+        Percentile interval of the replicate deviations, shrunk by the FPC.
+        """
+        alpha = (1 - self.ci) / 2
+        with np.errstate(invalid='ignore'):
+            deviation = replicates - estimate
+            lo = estimate + self.fpc * np.nanquantile(deviation, alpha, axis=0)
+            hi = estimate + self.fpc * np.nanquantile(deviation, 1 - alpha, axis=0)
+            se = self.fpc * np.nanstd(replicates, axis=0, ddof=1)
+        return se, lo, hi
+
+    def run(self) -> Dict[str, pd.DataFrame]:
+        df = self.df
+        weights = self._play_weights()
+
+        speed = df['avg_closing_speed'].values
+        valid = ~np.isnan(speed)
+        speed0 = np.where(valid, speed, 0.0)
+
+        # Baseline cells (position x void_type). Like the pipeline's baselines, rows with a
+        # missing key belong to no cell and score a CEOE of 0
+        cell_keys = ['player_position', 'void_type']
+        cell_idx = group_codes(df, cell_keys)
+        in_cell = cell_idx >= 0
+        cells = df[in_cell].drop_duplicates(cell_keys).sort_values(cell_keys)[cell_keys].reset_index(drop=True)
+        cell_onehot = np.zeros((len(df), len(cells)))
+        cell_onehot[np.flatnonzero(in_cell), cell_idx[in_cell]] = 1.0
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            estimate = (speed0 @ cell_onehot) / (valid @ cell_onehot)
+            boot_base = (weights @ (cell_onehot * speed0[:, None])) / (weights @ (cell_onehot * valid[:, None]))
+
+        se, lo, hi = self._interval(estimate, boot_base)
+        baselines = cells.assign(
+            n_rows=np.bincount(cell_idx[in_cell], minlength=len(cells)),
+            baseline_mean=estimate, baseline_se=se, baseline_lo=lo, baseline_hi=hi)
+
+        # Leaderboard: per-player mean CEOE against the replicate's own baselines
+        # (rows without an nfl_id belong to no player)
+        player_idx = group_codes(df, 'nfl_id')
+        has_player = player_idx >= 0
+        snaps = np.bincount(player_idx[has_player], minlength=df['nfl_id'].nunique())
+        qualified = np.flatnonzero(snaps >= self.min_snaps)
+        player_onehot = np.zeros((len(df), len(snaps)))
+        player_onehot[np.flatnonzero(has_player), player_idx[has_player]] = 1.0
+        player_onehot = player_onehot[:, qualified]
+
+        scored = valid & in_cell
+        cell_of_row = np.where(in_cell, cell_idx, 0)
+        ceoe = np.where(scored, speed0 - estimate[cell_of_row], 0.0)
+        boot_ceoe = np.where(scored, speed0 - boot_base[:, cell_of_row], 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            point = (ceoe @ player_onehot) / player_onehot.sum(axis=0)
+            boot_mean = ((weights * boot_ceoe) @ player_onehot) / (weights @ player_onehot)
+
+        se, lo, hi = self._interval(point, boot_mean)
+        rank = rank_desc(point[None, :])[0]
+        boot_rank = rank_desc(boot_mean)
+        _, rank_lo, rank_hi = self._interval(rank.astype(float), boot_rank.astype(float))
+
+        players = df[has_player].drop_duplicates('nfl_id').sort_values('nfl_id')[
+            ['nfl_id', 'player_name', 'player_position']].reset_index(drop=True).iloc[qualified]
+        leaderboard = players.assign(
+            snaps=snaps[qualified], ceoe=point, ceoe_se=se, ceoe_lo=lo, ceoe_hi=hi,
+            rank=rank, rank_lo=np.floor(rank_lo).clip(min=1), rank_hi=np.ceil(rank_hi)
+        ).sort_values('rank').head(self.top_n).reset_index(drop=True)
+
+        return {'baselines': baselines, 'leaderboard': leaderboard}
+
+    def statement(self, results: Dict[str, pd.DataFrame]) -> str:
+        baselines, leaderboard = results['baselines'], results['leaderboard']
+        plays = self.df[['game_id', 'play_id']].drop_duplicates().shape[0]
+        lines = [f"Sample of {self.frac:.0%} of the cohort's plays ({plays} plays, {len(self.df)} defender-plays), "
+                 f"{self.n_boot} stratified bootstrap replicates, {self.ci:.0%} intervals:"]
+        if baselines['baseline_se'].notna().any():
+            lines.append(f"  CEOE baselines: median SE {baselines['baseline_se'].median():.3f} yd/s, "
+                         f"max SE {baselines['baseline_se'].max():.3f} yd/s")
+        if not leaderboard.empty:
+            width = (leaderboard['rank_hi'] - leaderboard['rank_lo']).head(10)
+            lines.append(f"  Leaderboard (top {min(10, len(leaderboard))}, >= {self.min_snaps} snaps): "
+                         f"median CEOE SE {leaderboard['ceoe_se'].head(10).median():.3f}, "
+                         f"median rank interval width {width.median():.0f}")
+        return '\n'.join(lines)
+
+
+def report_sampling_error(df_summary: pd.DataFrame, frac: float, output_dir: str,
+                          seed: int = 42, n_boot: int = 500) -> Dict[str, pd.DataFrame]:
+    """
+    Writes sampling_error_baselines.csv / sampling_error_leaderboard.csv and prints the summary.
+    """
+    if df_summary is None or df_summary.empty:
+        return {}
+    estimator = SamplingErrorEstimator(df_summary, frac, n_boot=n_boot, seed=seed)
+    results = estimator.run()
+    for name, df in results.items():
+        df.to_csv(os.path.join(output_dir, f'sampling_error_{name}.csv'), index=False)
+    print(estimator.statement(results))
+    return results
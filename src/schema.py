@@ -1,5 +1,6 @@
 import pandera.pandas as pa
 from pandera.typing import Series
+from typing import Optional
 
 class RawSuppSchema(pa.DataFrameModel):
     """
@@ -134,6 +135,63 @@ class FullPlayAnimationSchema(PhysicsSchema, AggregationScoresSchema):
         strict = 'filter'
 
 
+class AnimationFrameSchema(pa.DataFrameModel):
+    """
+    Star-schema export: the slim per-frame fact table (keys + kinematics only).
+    """
+    game_id: Series[int] = pa.Field(coerce=True)
+    play_id: Series[int] = pa.Field(coerce=True)
+    nfl_id: Series[float] = pa.Field(coerce=True, nullable=True)
+    frame_id: Series[int] = pa.Field(coerce=True)
+
+    x: Series[float] = pa.Field(nullable=True)
+    y: Series[float] = pa.Field(nullable=True)
+    s_derived: Series[float] = pa.Field(nullable=True, coerce=True)
+    a_derived: Series[float] = pa.Field(nullable=True, coerce=True)
+
+    class Config:
+        strict = 'filter'
+
+
+class AnimationPlayerSchema(pa.DataFrameModel):
+    """
+    Star-schema export: one row per player per play, with the scores.
+    """
+    game_id: Series[int] = pa.Field(coerce=True)
+    play_id: Series[int] = pa.Field(coerce=True)
+    nfl_id: Series[float] = pa.Field(coerce=True, nullable=True)
+
+    player_name: Series[str] = pa.Field(nullable=True)
+    player_role: Series[str] = pa.Field(nullable=True)
+    player_position: Series[str] = pa.Field(nullable=True)
+
+    vis_score: Series[float] = pa.Field(nullable=True)
+    ceoe_score: Series[float] = pa.Field(nullable=True)
+
+    class Config:
+        strict = 'filter'
+
+
+class AnimationPlaySchema(RawSuppSchema):
+    """
+    Star-schema export: the play dimension (context, geometry, void label).
+    'phase' is rebuilt from throw_frame_id, so it is not stored per frame.
+    """
+    play_direction: Series[str]
+    absolute_yardline_number: Series[int] = pa.Field(ge=0, le=120, nullable=True)
+    ball_land_x: Series[float] = pa.Field(nullable=True)
+    ball_land_y: Series[float] = pa.Field(nullable=True)
+    yards_from_own_goal: Series[int] = pa.Field(ge=0, le=100, nullable=True)
+    possession_win_prob: Series[float] = pa.Field(ge=0, le=1, nullable=True)
+
+    throw_frame_id: Series[float] = pa.Field(nullable=True, coerce=True)
+    dist_at_throw: Series[float] = pa.Field(ge=0, nullable=True)
+    void_type: Series[str] = pa.Field(isin=["High Void", "Tight Window", "Neutral"], nullable=True)
+
+    class Config:
+        strict = 'filter'
+
+
 class ContextSchema(pa.DataFrameModel):
     """
     Validates the output of the ContextEngine.
@@ -165,6 +223,11 @@ class EraserMetricsSchema(pa.DataFrameModel):
     
     vis_score: Series[float] = pa.Field() 
 
+    # Time-to-intercept baseline (seconds)
+    tti_target_path: Series[float] = pa.Field(ge=0, nullable=True)
+    tti_ball_land: Series[float] = pa.Field(ge=0, nullable=True)
+    time_to_intercept: Series[float] = pa.Field(ge=0, nullable=True)
+
     class Config:
         strict = 'filter'
 
@@ -192,6 +255,24 @@ class BenchMarkingSchema(pa.DataFrameModel):
         strict = 'filter'
 
 
+class BaselinePartialsSchema(pa.DataFrameModel):
+    """
+    Validates the mergeable CEOE baseline statistics (one row per cell).
+    """
+    player_position: Series[str]
+    void_type: Series[str] = pa.Field(isin=["High Void", "Tight Window", "Neutral"])
+
+    speed_count: Series[int] = pa.Field(ge=0, coerce=True)
+    speed_sum: Series[float] = pa.Field(coerce=True)
+    speed_sum_sq: Series[float] = pa.Field(ge=0, coerce=True)
+
+    baseline_mean: Optional[Series[float]] = pa.Field(nullable=True)
+    baseline_std: Optional[Series[float]] = pa.Field(nullable=True)
+
+    class Config:
+        strict = 'filter'
+
+
 class AnalysisReportSchema(pa.DataFrameModel):
     """
     Validates the Player Metadata (Static info) to be attached to the final report.
@@ -218,6 +299,7 @@ class AnalysisReportSchema(pa.DataFrameModel):
     vis_score: Series[float]
     avg_closing_speed: Series[float]
     p_dist_at_throw: Series[float] = pa.Field(ge=0, nullable=True)
+    time_to_intercept: Optional[Series[float]] = pa.Field(ge=0, nullable=True)
 
     ceoe_score: Series[float] = pa.Field(nullable=False)
 
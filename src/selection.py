@@ -0,0 +1,132 @@
+import re
+import hashlib
+import pandas as pd
+from pydantic import BaseModel
+from typing import List, Optional, Set, Tuple
+
+
+def parse_int_ranges(value: Optional[str]) -> Optional[List[int]]:
+    """
+    '1-3,5' -> [1, 2, 3, 5]
+    """
+    if not value:
+        return None
+    numbers = []
+    for part in str(value).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if re.fullmatch(r'\d+-\d+', part):
+            lo, hi = (int(x) for x in part.split('-'))
+            numbers.extend(range(lo, hi + 1))
+        else:
+            numbers.append(int(part))
+    return sorted(set(numbers))
+
+
+def parse_plays(value: Optional[str]) -> Optional[List[Tuple[Optional[int], int]]]:
+    """
+    '2023090700:56,101' -> [(2023090700, 56), (None, 101)]. A bare play id matches in any game.
+    """
+    if not value:
+        return None
+    plays = []
+    for part in str(value).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if ':' in part:
+            game_id, play_id = part.split(':', 1)
+            plays.append((int(game_id), int(play_id)))
+        else:
+            plays.append((None, int(part)))
+    return plays
+
+
+class RunSelection(BaseModel):
+    """
+    Subset of the season to run: weeks, games, plays and coverage types (all optional, ANDed),
+    plus an optional stratified play sample (sample_frac, drawn at filter_context).
+    DataLoader applies it before anything is validated or processed.
+    """
+    weeks: Optional[List[int]] = None
+    games: Optional[List[int]] = None
+    plays: Optional[List[Tuple[Optional[int], int]]] = None
+    coverage: Optional[List[str]] = None
+    sample_frac: Optional[float] = None
+    sample_seed: int = 42
+
+    @classmethod
+    def from_args(cls, weeks: str = None, games: str = None, plays: str = None, coverage: str = None,
+                  sample_frac: float = None, sample_seed: int = 42):
+        if sample_frac is not None and not 0 < sample_frac <= 1:
+            raise ValueError(f"--sample-frac must be in (0, 1], got {sample_frac}")
+        return cls(
+            weeks=parse_int_ranges(weeks),
+            games=parse_int_ranges(games),
+            plays=parse_plays(plays),
+            coverage=[c.strip() for c in coverage.split(',') if c.strip()] if coverage else None,
+            sample_frac=None if sample_frac == 1 else sample_frac,
+            sample_seed=sample_seed
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.weeks or self.games or self.plays or self.coverage or self.sample_frac)
+
+    @property
+    def needs_play_keys(self) -> bool:
+        """
+        True when rows (not just week files) must be filtered.
+        """
+        return bool(self.games or self.plays or self.coverage or self.sample_frac)
+
+    def scope_name(self) -> str:
+        """
+        Directory name for the scoped outputs, e.g. 'w01-03_g2023090700'.
+        """
+        parts = []
+        if self.weeks:
+            parts.append(f"w{self.weeks[0]:02d}" if len(self.weeks) == 1
+                         else f"w{self.weeks[0]:02d}-{self.weeks[-1]:02d}")
+        if self.games:
+            parts.append('g' + '-'.join(map(str, self.games)))
+        if self.plays:
+            parts.append('p' + '-'.join(f"{g}_{p}" if g else str(p) for g, p in self.plays))
+        if self.coverage:
+            parts.append('c' + '-'.join(self.coverage))
+        if self.sample_frac:
+            parts.append(f"s{self.sample_frac:g}_seed{self.sample_seed}")
+        name = '_'.join(parts)
+        if len(name) > 80:
+            name = name[:60] + '_' + hashlib.sha256(name.encode()).hexdigest()[:12]
+        return name
+
+    def supp_mask(self, supp_df: pd.DataFrame) -> pd.Series:
+        mask = pd.Series(True, index=supp_df.index)
+        if self.weeks:
+            mask &= supp_df['week'].isin(self.weeks)
+        if self.games:
+            mask &= supp_df['game_id'].isin(self.games)
+        if self.plays:
+            exact = {(g, p) for g, p in self.plays if g is not None}
+            any_game = {p for g, p in self.plays if g is None}
+            keys = pd.Series(list(zip(supp_df['game_id'], supp_df['play_id'])), index=supp_df.index)
+            mask &= keys.isin(exact) | supp_df['play_id'].isin(any_game)
+        if self.coverage:
+            mask &= supp_df['team_coverage_type'].isin(self.coverage)
+        return mask
+
+    def play_keys(self, supp_df: pd.DataFrame) -> Set[Tuple[int, int]]:
+        selected = supp_df[self.supp_mask(supp_df)]
+        return set(zip(selected['game_id'], selected['play_id']))
+
+
+def key_mask(df: pd.DataFrame, keys: Set[Tuple[int, int]]) -> pd.Series:
+    """
+    Rows whose (game_id, play_id) is in keys.
+    """
+    if not keys:
+        return pd.Series(False, index=df.index)
+    index = pd.MultiIndex.from_arrays([df['game_id'], df['play_id']])
+    return pd.Series(index.isin(list(keys)), index=df.index)
@@ -0,0 +1,179 @@
+import os
+import json
+import shutil
+import hashlib
+import inspect
+import importlib
+import pandas as pd
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+
+class CachedTables(Mapping):
+    """
+    Read-only view of one cached stage. Tables are read from disk on first access,
+    so a downstream stage that needs one small table never loads the big ones.
+    """
+    def __init__(self, stage_dir: str, names: Iterable[str]):
+        self.stage_dir = stage_dir
+        self._names = list(names)
+        self._loaded: Dict[str, pd.DataFrame] = {}
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        if name not in self._loaded:
+            self._loaded[name] = pd.read_parquet(os.path.join(self.stage_dir, f'{name}.parquet'))
+        return self._loaded[name]
+
+    def iter_groups(self, name: str, column: str) -> Iterator[Tuple[object, pd.DataFrame]]:
+        """
+        (value, rows) per distinct value of column, sorted. Unless the table is already loaded,
+        each group is read on its own (Parquet filter), so only one group is in memory at a time.
+        """
+        if name in self._loaded:
+            yield from self._loaded[name].groupby(column, sort=True)
+            return
+        path = os.path.join(self.stage_dir, f'{name}.parquet')
+        for value in sorted(pd.read_parquet(path, columns=[column])[column].dropna().unique()):
+            yield value, pd.read_parquet(path, filters=[(column, '==', value)])
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+
+class StageCache:
+    """
+    Content-addressed cache for pipeline stage outputs.
+
+    key = hash(stage name, engine VERSION, engine + schema source, stage config, upstream keys)
+    Upstream keys chain the hashes, so changing one engine invalidates exactly that
+    stage and everything downstream of it. Only the keep_per_stage most recently used
+    entries of a stage are kept; older (superseded) keys are deleted on save.
+    """
+    MARKER = '_SUCCESS'
+    # Source every stage depends on besides its engine's module
+    SHARED_MODULES = ('src.schema', 'src.validation')
+
+    def __init__(self, cache_dir: str, enabled: bool = True, force: Iterable[str] = (), keep_per_stage: int = 1):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.force = set(force)
+        self.keep_per_stage = keep_per_stage
+
+    @staticmethod
+    def fingerprint_files(paths: Iterable[str]) -> str:
+        """
+        Cheap identity of raw inputs: path, size and modification time.
+        """
+        digest = hashlib.sha256()
+        for path in sorted(paths):
+            stat = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def code_fingerprint(cls, engine_cls, modules: Iterable[str] = ()) -> str:
+        """
+        VERSION + source of the engine's module, the shared modules and any extra modules
+        the stage's result depends on (e.g. 'src.expectation_model').
+        """
+        digest = hashlib.sha256()
+        digest.update(str(getattr(engine_cls, 'VERSION', 0)).encode())
+        for module_name in (engine_cls.__module__, *cls.SHARED_MODULES, *modules):
+            digest.update(inspect.getsource(importlib.import_module(module_name)).encode())
+        return digest.hexdigest()
+
+    def key(self, stage: str, engine_cls, *upstream: str, config: dict = None, modules: Iterable[str] = ()) -> str:
+        payload = {
+            'stage': stage,
+            'code': self.code_fingerprint(engine_cls, modules),
+            'config': config or {},
+            'upstream': list(upstream)
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(blob).hexdigest()[:20]
+
+    def _stage_dir(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, key)
+
+    def has(self, stage: str, key: str) -> bool:
+        if not self.enabled or stage in self.force:
+            return False
+        return os.path.exists(os.path.join(self._stage_dir(stage, key), self.MARKER))
+
+    def run(self, stage: str, key: str, build: Callable[[], Dict[str, pd.DataFrame]]) -> Mapping:
+        """
+        Returns the stage tables from cache, or builds and persists them.
+        """
+        stage_dir = self._stage_dir(stage, key)
+
+        if self.has(stage, key):
+            with open(os.path.join(stage_dir, self.MARKER)) as f:
+                names = json.load(f)['tables']
+            print(f"   -> [{stage}] loaded from stage cache ({key})")
+            os.utime(os.path.join(stage_dir, self.MARKER))  # most recently used
+            return CachedTables(stage_dir, names)
+
+        tables = build()
+
+        if self.enabled:
+            self.save(stage, key, tables)
+
+        return tables
+
+    def save(self, stage: str, key: str, tables: Dict[str, pd.DataFrame]):
+        """
+        Writes to a temp dir and renames it, so a crash never leaves a half entry.
+        """
+        stage_dir = self._stage_dir(stage, key)
+        tmp_dir = stage_dir + '.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        for name, df in tables.items():
+            df.to_parquet(os.path.join(tmp_dir, f'{name}.parquet'), index=False)
+
+        with open(os.path.join(tmp_dir, self.MARKER), 'w') as f:
+            json.dump({'stage': stage, 'key': key, 'tables': list(tables)}, f)
+
+        shutil.rmtree(stage_dir, ignore_errors=True)
+        os.replace(tmp_dir, stage_dir)
+        self.evict(stage)
+
+    def evict(self, stage: str):
+        """
+        Deletes all but the keep_per_stage most recently used entries of a stage
+        (plus temp dirs left by crashed saves).
+        """
+        root = os.path.join(self.cache_dir, stage)
+        if not os.path.isdir(root):
+            return
+        entries = []
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            marker = os.path.join(path, self.MARKER)
+            if name.endswith('.tmp') or not os.path.exists(marker):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                entries.append((os.stat(marker).st_mtime_ns, path))
+        for _, path in sorted(entries, reverse=True)[self.keep_per_stage:]:
+            shutil.rmtree(path, ignore_errors=True)
+            print(f"   -> [{stage}] evicted superseded cache entry {os.path.basename(path)}")
+
+    def is_marked(self, marker_path: str, key: str) -> bool:
+        """
+        For sink stages (export): outputs live elsewhere, only their key is recorded.
+        """
+        if not self.enabled or not os.path.exists(marker_path):
+            return False
+        with open(marker_path) as f:
+            return f.read().strip() == key
+
+    @staticmethod
+    def mark(marker_path: str, key: str):
+        with open(marker_path, 'w') as f:
+            f.write(key)
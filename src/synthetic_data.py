@@ -0,0 +1,501 @@
+import os
+import time
+import argparse
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple
+
+# 2023 BDB release: 14,108 plays over 18 weeks, ~16 games a week, 13 tracked players a play
+SEASON_WEEKS = 18
+SEASON_PLAYS_PER_WEEK = 784
+SEASON_START = date(2023, 9, 7)
+
+TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND',
+         'JAX', 'KC', 'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF',
+         'TB', 'TEN', 'WAS']
+
+# Per-team roster: (position, count). The QB is always slot 0 of the offense
+OFFENSE_ROSTER = [('QB', 1), ('WR', 5), ('TE', 2), ('RB', 2)]
+DEFENSE_ROSTER = [('CB', 5), ('FS', 2), ('SS', 2), ('ILB', 3), ('OLB', 3)]
+
+COVERAGES = [  # (team_coverage_type, team_coverage_man_zone, share)
+    ('COVER_3_ZONE', 'ZONE_COVERAGE', 0.33), ('COVER_1_MAN', 'MAN_COVERAGE', 0.22),
+    ('COVER_4_ZONE', 'ZONE_COVERAGE', 0.12), ('COVER_2_ZONE', 'ZONE_COVERAGE', 0.10),
+    ('COVER_6_ZONE', 'ZONE_COVERAGE', 0.06), ('COVER_2_MAN', 'MAN_COVERAGE', 0.04),
+    ('COVER_0_MAN', 'MAN_COVERAGE', 0.03), ('PREVENT', 'ZONE_COVERAGE', 0.01),
+    ('MISC', 'ZONE_COVERAGE', 0.09)
+]
+DROPBACKS = {'TRADITIONAL': 0.78, 'DESIGNED_ROLLOUT_RIGHT': 0.05, 'DESIGNED_ROLLOUT_LEFT': 0.02,
+             'SCRAMBLE': 0.06, 'SCRAMBLE_ROLLOUT_RIGHT': 0.03, 'SCRAMBLE_ROLLOUT_LEFT': 0.02,
+             'QB_DRAW': 0.01, 'DESIGNED_RUN': 0.01, 'UNKNOWN': 0.02}
+FORMATIONS = {'SHOTGUN': 0.65, 'SINGLEBACK': 0.15, 'EMPTY': 0.10, 'PISTOL': 0.05, 'I_FORM': 0.05}
+ALIGNMENTS = {'2x2': 0.35, '3x1': 0.35, '2x1': 0.15, '3x2': 0.05, '1x1': 0.05, '2x0': 0.05}
+PASS_LOCATIONS = {'INSIDE_BOX': 0.80, 'OUTSIDE_RIGHT': 0.10, 'OUTSIDE_LEFT': 0.07, 'UNKNOWN': 0.03}
+ROUTES = {  # by pass depth: screen (<= 0), short (1-9), intermediate (10-19), deep (20+)
+    'screen': ['SCREEN'],
+    'short': ['FLAT', 'OUT', 'IN', 'SLANT', 'HITCH', 'ANGLE', 'CROSS', 'WHEEL'],
+    'intermediate': ['IN', 'OUT', 'CROSS', 'CORNER', 'POST'],
+    'deep': ['GO', 'POST', 'CORNER']
+}
+
+FIELD_X, FIELD_Y = 120.0, 53.3
+FRAME_S = 0.1  # 10 Hz tracking
+
+
+def _choice(rng, options: Dict[str, float], size: int) -> np.ndarray:
+    keys = list(options)
+    p = np.array(list(options.values()), dtype=float)
+    return np.array(keys, dtype=object)[rng.choice(len(keys), size=size, p=p / p.sum())]
+
+
+class SyntheticDataGenerator:
+    """
+    Writes a Big Data Bowl-shaped season that passes the raw schemas and the pipeline filters:
+
+      output_dir/train/input_2023_wXX.csv    pre-throw tracking, every player every frame
+      output_dir/train/output_2023_wXX.csv   post-throw tracking for the players to predict
+      output_dir/supplementary_data.csv      play context (coverage, down, pass result, ...)
+
+    Players belong to 32 fixed rosters, so they recur across plays and weeks like real players.
+    Every player runs a path that starts at rest at the snap. The targeted receiver runs to the
+    ball landing spot and arrives on the last output frame. After the throw, defenders pursue
+    the landing spot at a per-player speed, so CEOE has signal to find. One defender per play is
+    placed tight, neutral or far from the target at the throw, which mixes the void types.
+
+    Each week is seeded from (seed, week), so any week can be regenerated on its own (for the
+    same chunk_plays). Tracking is written in chunks of chunk_plays, so memory stays flat at
+    10x-100x season scale.
+    """
+    def __init__(self, weeks: int = SEASON_WEEKS, plays_per_week: int = SEASON_PLAYS_PER_WEEK,
+                 players_per_play: int = 13, games_per_week: int = 16, seed: int = 42,
+                 chunk_plays: int = 2000):
+        if not 1 <= weeks <= 99:
+            raise ValueError(f"weeks must be in [1, 99] (file names carry two digits), got {weeks}")
+        if not 3 <= players_per_play <= 22:
+            raise ValueError(f"players_per_play must be in [3, 22], got {players_per_play}")
+        if not 1 <= games_per_week <= len(TEAMS) // 2:
+            raise ValueError(f"games_per_week must be in [1, {len(TEAMS) // 2}], got {games_per_week}")
+
+        self.weeks = weeks
+        self.plays_per_week = max(1, int(plays_per_week))
+        self.players_per_play = players_per_play
+        self.games_per_week = games_per_week
+        self.seed = seed
+        self.chunk_plays = chunk_plays
+
+        # Offense: QB + targeted receiver + other route runners; the rest defend
+        self.n_offense = max(2, min(sum(n for _, n in OFFENSE_ROSTER), players_per_play // 2))
+        self.n_defense = players_per_play - self.n_offense
+
+        self.players = self._build_players()
+
+    @classmethod
+    def from_scale(cls, scale: float, **kwargs) -> 'SyntheticDataGenerator':
+        """
+        scale=1 is one 2023 season of plays; 10 and 100 multiply the plays per week.
+        """
+        return cls(plays_per_week=round(SEASON_PLAYS_PER_WEEK * scale), **kwargs)
+
+    # 1. ROSTERS
+    def _build_players(self) -> pd.DataFrame:
+        rng = np.random.default_rng([self.seed, 0])
+        rows = []
+        for team in TEAMS:
+            for side, roster in (('Offense', OFFENSE_ROSTER), ('Defense', DEFENSE_ROSTER)):
+                for position, count in roster:
+                    for k in range(1, count + 1):
+                        rows.append({'team': team, 'player_side': side, 'player_position': position,
+                                     'player_name': f"{team} {position}{k}"})
+        players = pd.DataFrame(rows)
+        n = len(players)
+
+        players['nfl_id'] = 35000 + np.arange(n)
+        inches = np.clip(rng.normal(73, 2, n).round(), 68, 79).astype(int)
+        players['player_height'] = [f"{i // 12}-{i % 12}" for i in inches]
+        players['player_weight'] = np.clip(rng.normal(205, 18, n).round(), 170, 260).astype(int)
+        born = pd.Timestamp('1990-01-01') + pd.to_timedelta(rng.integers(0, 12 * 365, n), unit='D')
+        players['player_birth_date'] = born.strftime('%Y-%m-%d')
+        # Post-throw pursuit speed (yd/s); the between-player spread is what CEOE should recover
+        players['pursuit_speed'] = np.clip(rng.normal(6.5, 0.8, n), 4.5, 8.5)
+        return players
+
+    def _lineups(self, rng, offense_team: np.ndarray, defense_team: np.ndarray) -> np.ndarray:
+        """
+        (n_plays, players_per_play) player row indices: QB, target, route runners, then defenders.
+        """
+        n = len(offense_team)
+        n_off_roster = sum(c for _, c in OFFENSE_ROSTER)
+        n_def_roster = sum(c for _, c in DEFENSE_ROSTER)
+        team_size = n_off_roster + n_def_roster
+
+        # Skill players in random order (the first one is targeted)
+        skill = rng.permuted(np.tile(np.arange(1, n_off_roster), (n, 1)), axis=1)[:, :self.n_offense - 1]
+        offense = np.column_stack([np.zeros(n, dtype=int), skill]) + (offense_team * team_size)[:, None]
+
+        # Defensive backs before linebackers, random within each group
+        def_positions = np.array([p for p, c in DEFENSE_ROSTER for _ in range(c)])
+        priority = np.where(np.isin(def_positions, ['CB', 'FS', 'SS']), 0.0, 1.0)
+        order = np.argsort(priority[None, :] + rng.random((n, n_def_roster)), axis=1)[:, :self.n_defense]
+        defense = order + n_off_roster + (defense_team * team_size)[:, None]
+
+        return np.column_stack([offense, defense])
+
+    # 2. PLAYS
+    def _week_games(self, week: int, rng) -> pd.DataFrame:
+        teams = rng.permutation(len(TEAMS))[:2 * self.games_per_week].reshape(-1, 2)
+        thursday = SEASON_START + timedelta(weeks=week - 1)
+        games = []
+        for g, (home, visitor) in enumerate(teams):
+            day = thursday if g == 0 else thursday + timedelta(days=4 if g == self.games_per_week - 1 else 3)
+            games.append({'game_id': int(day.strftime('%Y%m%d')) * 100 + g, 'game_date': day.strftime('%m/%d/%Y'),
+                          'game_time_eastern': '20:20:00' if g in (0, self.games_per_week - 1) else
+                          ['13:00:00', '16:05:00', '16:25:00'][g % 3],
+                          'home': home, 'visitor': visitor})
+        return pd.DataFrame(games)
+
+    def _plays(self, week: int, rng) -> Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]:
+        """
+        Supplementary rows for one week plus the geometry the tracking needs and the lineups.
+        """
+        n = self.plays_per_week
+        games = self._week_games(week, rng)
+        game_idx = np.sort(np.arange(n) % len(games))
+        plays = games.iloc[game_idx].reset_index(drop=True)
+
+        # Play ids increase within a game, with gaps like real ids
+        nth = plays.groupby('game_id').cumcount().values
+        plays['play_id'] = 55 + 24 * nth + rng.integers(0, 20, n)
+
+        home_has_ball = rng.random(n) < 0.5
+        offense_team = np.where(home_has_ball, plays['home'], plays['visitor'])
+        defense_team = np.where(home_has_ball, plays['visitor'], plays['home'])
+        team_names = np.array(TEAMS, dtype=object)
+
+        supp = pd.DataFrame({
+            'game_id': plays['game_id'], 'season': 2023, 'week': week,
+            'game_date': plays['game_date'], 'game_time_eastern': plays['game_time_eastern'],
+            'home_team_abbr': team_names[plays['home']], 'visitor_team_abbr': team_names[plays['visitor']],
+            'home_final_score': rng.integers(3, 38, len(games))[game_idx],
+            'visitor_final_score': rng.integers(3, 38, len(games))[game_idx],
+            'play_id': plays['play_id']
+        })
+
+        quarter = np.sort(rng.integers(1, 5, n))
+        supp['quarter'] = quarter
+        clock = rng.integers(0, 900, n)
+        supp['game_clock'] = [f"{c // 60:02d}:{c % 60:02d}" for c in clock]
+
+        down = rng.choice([1, 2, 3, 4], size=n, p=[0.42, 0.33, 0.22, 0.03])
+        supp['down'] = down
+        supp['yards_to_go'] = np.where((down == 1) & (rng.random(n) < 0.9), 10, rng.integers(1, 16, n))
+        supp['possession_team'] = team_names[offense_team]
+        supp['defensive_team'] = team_names[defense_team]
+
+        # Field position: yards from the offense's own goal line
+        yfog = rng.integers(5, 96, n)
+        supp['yardline_side'] = np.where(yfog <= 50, supp['possession_team'], supp['defensive_team'])
+        supp['yardline_number'] = np.where(yfog <= 50, yfog, 100 - yfog)
+        supp['pre_snap_home_score'] = (quarter - 1) * rng.integers(0, 10, n)
+        supp['pre_snap_visitor_score'] = (quarter - 1) * rng.integers(0, 10, n)
+        supp['play_nullified_by_penalty'] = np.where(rng.random(n) < 0.03, 'Y', 'N')
+
+        supp['pass_result'] = rng.choice(['C', 'I', 'IN'], size=n, p=[0.69, 0.28, 0.03])
+        depth = rng.choice(['screen', 'short', 'intermediate', 'deep'], size=n, p=[0.08, 0.55, 0.27, 0.10])
+        bounds = {'screen': (-5, 0), 'short': (1, 9), 'intermediate': (10, 19), 'deep': (20, 45)}
+        lo, hi = np.array([bounds[d] for d in depth]).T
+        pass_length = rng.integers(lo, hi + 1)
+        # Keep the landing spot in the field of play
+        pass_length = np.minimum(pass_length, 100 - yfog + 9)
+        supp['pass_length'] = pass_length
+
+        supp['offense_formation'] = _choice(rng, FORMATIONS, n)
+        supp['receiver_alignment'] = _choice(rng, ALIGNMENTS, n)
+        supp['route_of_targeted_receiver'] = [ROUTES[d][rng.integers(len(ROUTES[d]))] for d in depth]
+        supp['play_action'] = rng.random(n) < 0.25
+        supp['dropback_type'] = _choice(rng, DROPBACKS, n)
+        dropback_distance = np.round(rng.uniform(1.5, 8.0, n), 2)
+        supp['dropback_distance'] = dropback_distance
+        supp['pass_location_type'] = _choice(rng, PASS_LOCATIONS, n)
+        supp['defenders_in_the_box'] = rng.integers(4, 9, n)
+
+        coverage = rng.choice(len(COVERAGES), size=n, p=[c[2] for c in COVERAGES])
+        supp['team_coverage_man_zone'] = [COVERAGES[c][1] for c in coverage]
+        supp['team_coverage_type'] = [COVERAGES[c][0] for c in coverage]
+
+        penalty = rng.random(n) < 0.05
+        supp['penalty_yards'] = np.where(penalty, rng.choice([-10, -5, 5, 10, 15], size=n), np.nan)
+        complete = supp['pass_result'].values == 'C'
+        gained = np.where(complete, pass_length + rng.exponential(3.5, n).round().astype(int), 0)
+        supp['pre_penalty_yards_gained'] = gained
+        supp['yards_gained'] = gained + np.nan_to_num(supp['penalty_yards'].values).astype(int)
+        supp['expected_points'] = np.round(-1.5 + 0.07 * yfog + rng.normal(0, 0.3, n), 3)
+        supp['expected_points_added'] = np.round(np.select(
+            [complete, supp['pass_result'].values == 'IN'],
+            [rng.normal(0.7, 1.0, n), rng.normal(-3.2, 0.8, n)], rng.normal(-0.6, 0.3, n)), 3)
+        home_wp = np.round(np.clip(rng.beta(4, 4, n), 0.01, 0.99), 3)
+        supp['pre_snap_home_team_win_probability'] = home_wp
+        supp['pre_snap_visitor_team_win_probability'] = np.round(1 - home_wp, 3)
+        wpa = np.round(rng.normal(0, 0.02, n), 4)
+        supp['home_team_win_probability_added'] = np.where(home_has_ball, wpa, -wpa)
+        supp['visitor_team_win_probility_added'] = -supp['home_team_win_probability_added']
+
+        lineups = self._lineups(rng, offense_team, defense_team)
+        qb_names = self.players['player_name'].values[lineups[:, 0]]
+        target_names = self.players['player_name'].values[lineups[:, 1]]
+        side = rng.choice(['left', 'middle', 'right'], size=n)
+        length_word = np.where(pass_length >= 15, 'deep', 'short')
+        outcome = supp['pass_result'].map({'C': '', 'I': ' incomplete', 'IN': ' INTERCEPTED'}).values
+        supp['play_description'] = [f"({c}) {q} pass{o} {l} {s} to {t}" for c, q, o, l, s, t in
+                                    zip(supp['game_clock'], qb_names, outcome, length_word, side, target_names)]
+
+        # Geometry for the tracking (offense drives to +x before play_direction is applied)
+        geometry = pd.DataFrame({
+            'los_x': 10.0 + yfog,
+            'play_direction': np.where(rng.random(n) < 0.5, 'right', 'left'),
+            'n_in': rng.integers(12, 46, n),
+            'n_out': rng.integers(5, 19, n),
+            'dropback_distance': dropback_distance,
+            'pass_length': pass_length
+        })
+        return supp, geometry, lineups
+
+    # 3. TRACKING
+    def _tracking(self, rng, geometry: pd.DataFrame, supp: pd.DataFrame,
+                  lineups: np.ndarray) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        m, P = lineups.shape
+        n_def = self.n_defense
+        players = self.players
+
+        los_x = geometry['los_x'].values
+        n_in = geometry['n_in'].values
+        n_out = geometry['n_out'].values
+        t_throw = (n_in - 1) * FRAME_S
+        t_arrive = t_throw + n_out * FRAME_S
+
+        # Per (play, player) start/end points and path horizon
+        start_x, start_y = np.zeros((m, P)), np.zeros((m, P))
+        end_x, end_y = np.zeros((m, P)), np.zeros((m, P))
+        horizon = np.tile(t_throw[:, None], (1, P))
+
+        # QB drops back from the snap
+        start_x[:, 0] = los_x - rng.uniform(1, 5, m)
+        start_y[:, 0] = FIELD_Y / 2 + rng.normal(0, 0.5, m)
+        end_x[:, 0] = start_x[:, 0] - geometry['dropback_distance'].values
+        end_y[:, 0] = start_y[:, 0] + rng.normal(0, 1.0, m)
+
+        # Targeted receiver runs to the landing spot, arriving on the last output frame
+        start_x[:, 1] = los_x - rng.uniform(0, 1, m)
+        start_y[:, 1] = rng.uniform(4, FIELD_Y - 4, m)
+        land_x = np.clip(los_x + geometry['pass_length'].values + rng.uniform(-0.5, 0.5, m), 1, FIELD_X - 1)
+        land_y = np.clip(start_y[:, 1] + rng.normal(0, 6, m), 1, FIELD_Y - 1)
+        end_x[:, 1], end_y[:, 1] = land_x, land_y
+        horizon[:, 1] = t_arrive
+
+        # Other route runners release downfield
+        k = self.n_offense - 2
+        if k:
+            start_x[:, 2:2 + k] = los_x[:, None] - rng.uniform(0, 1, (m, k))
+            start_y[:, 2:2 + k] = rng.uniform(3, FIELD_Y - 3, (m, k))
+            end_x[:, 2:2 + k] = start_x[:, 2:2 + k] + rng.uniform(4, 18, (m, k))
+            end_y[:, 2:2 + k] = start_y[:, 2:2 + k] + rng.normal(0, 5, (m, k))
+
+        # Defenders drop into zones by position
+        d = slice(self.n_offense, P)
+        positions = players['player_position'].values[lineups[:, d]]
+        is_cb, is_s = positions == 'CB', np.isin(positions, ['FS', 'SS'])
+        depth = np.select([is_cb, is_s], [rng.uniform(5, 8, (m, n_def)), rng.uniform(10, 15, (m, n_def))],
+                          rng.uniform(3, 6, (m, n_def)))
+        width = np.where(is_cb, np.where(rng.random((m, n_def)) < 0.5, rng.uniform(4, 14, (m, n_def)),
+                                         rng.uniform(FIELD_Y - 14, FIELD_Y - 4, (m, n_def))),
+                         rng.uniform(15, FIELD_Y - 15, (m, n_def)))
+        start_x[:, d], start_y[:, d] = los_x[:, None] + depth, width
+        end_x[:, d] = start_x[:, d] + rng.uniform(1, 8, (m, n_def))
+        end_y[:, d] = start_y[:, d] + rng.normal(0, 4, (m, n_def))
+
+        # One defender per play ends up tight / neutral / open on the target at the throw
+        u_throw = (t_throw / t_arrive) ** 1.5
+        target_throw_x = start_x[:, 1] + (land_x - start_x[:, 1]) * u_throw
+        target_throw_y = start_y[:, 1] + (land_y - start_y[:, 1]) * u_throw
+        primary = self.n_offense + rng.integers(0, min(n_def, 4), m)
+        window = rng.choice(3, size=m, p=[0.3, 0.4, 0.3])
+        radius = np.choose(window, [rng.uniform(0.5, 1.9, m), rng.uniform(2.1, 4.9, m), rng.uniform(5.1, 9, m)])
+        angle = rng.uniform(0, 2 * np.pi, m)
+        rows = np.arange(m)
+        end_x[rows, primary] = target_throw_x + radius * np.cos(angle)
+        end_y[rows, primary] = target_throw_y + radius * np.sin(angle)
+        reach = rng.uniform(0.2, 0.6, m) * 8.0 * t_throw
+        angle = rng.uniform(0, 2 * np.pi, m)
+        start_x[rows, primary] = end_x[rows, primary] + reach * np.cos(angle)
+        start_y[rows, primary] = end_y[rows, primary] + reach * np.sin(angle)
+
+        # Flatten to (play, player) pairs
+        pair_play = np.repeat(np.arange(m), P)
+        slot = np.tile(np.arange(P), m)
+        player_row = lineups.ravel()
+        sx, sy, ex, ey, hz = (a.ravel() for a in (start_x, start_y, end_x, end_y, horizon))
+        dx, dy = ex - sx, ey - sy
+        dist = np.hypot(dx, dy)
+        heading = (90 - np.degrees(np.arctan2(dy, dx))) % 360  # NFL dir: 0 = +y, clockwise
+
+        def expand(counts):
+            reps = counts[pair_play]
+            pair = np.repeat(np.arange(len(pair_play)), reps)
+            frame = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps) + 1
+            return pair, frame
+
+        # Pre-throw: start from rest, u^1.5 along the path
+        pair, frame = expand(n_in)
+        u = np.minimum((frame - 1) * FRAME_S / hz[pair], 1.0)
+        x = sx[pair] + dx[pair] * u ** 1.5 + rng.normal(0, 0.03, len(pair))
+        y = sy[pair] + dy[pair] * u ** 1.5 + rng.normal(0, 0.03, len(pair))
+        speed = 1.5 * dist[pair] / hz[pair] * np.sqrt(u)
+        accel = np.minimum(0.75 * dist[pair] / hz[pair] ** 2 / np.sqrt(np.maximum(u, 0.05)), 8.0)
+        accel = np.where(u >= 1.0, 0.0, accel)
+
+        play = in_play = pair_play[pair]
+        role = np.select([slot[pair] == 0, slot[pair] == 1, slot[pair] < self.n_offense],
+                         ['Passer', 'Targeted Receiver', 'Other Route Runner'], 'Defensive Coverage')
+        direction = geometry['play_direction'].values[play]
+        rows_player = player_row[pair]
+
+        input_df = pd.DataFrame({
+            'game_id': supp['game_id'].values[play],
+            'play_id': supp['play_id'].values[play],
+            'player_to_predict': (role == 'Targeted Receiver') | (role == 'Defensive Coverage'),
+            'nfl_id': players['nfl_id'].values[rows_player],
+            'frame_id': frame,
+            'play_direction': direction,
+            'absolute_yardline_number': np.where(direction == 'left', FIELD_X - los_x[play], los_x[play]).round().astype(int),
+            'player_name': players['player_name'].values[rows_player],
+            'player_height': players['player_height'].values[rows_player],
+            'player_weight': players['player_weight'].values[rows_player],
+            'player_birth_date': players['player_birth_date'].values[rows_player],
+            'player_position': players['player_position'].values[rows_player],
+            'player_side': players['player_side'].values[rows_player],
+            'player_role': role,
+            'x': x, 'y': y,
+            's': np.abs(speed + rng.normal(0, 0.05, len(pair))),
+            'a': np.abs(accel + rng.normal(0, 0.05, len(pair))),
+            'dir': heading[pair],
+            'o': (heading[pair] + rng.normal(0, 20, len(pair))) % 360,
+            'num_frames_output': n_out[play],
+            'ball_land_x': land_x[play], 'ball_land_y': land_y[play]
+        })
+
+        # Post-throw: target keeps running to the ball; defenders pursue the landing spot
+        predicted = np.flatnonzero(slot >= 1)
+        predicted = predicted[(slot[predicted] == 1) | (slot[predicted] >= self.n_offense)]
+        reps = n_out[pair_play[predicted]]
+        pair = np.repeat(predicted, reps)
+        frame = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps) + 1
+        play = pair_play[pair]
+        t = frame * FRAME_S
+
+        u = np.minimum((t_throw[play] + t) / hz[pair], 1.0)
+        target_x, target_y = sx[pair] + dx[pair] * u ** 1.5, sy[pair] + dy[pair] * u ** 1.5
+
+        throw_x, throw_y = ex[pair], ey[pair]  # defenders finish their zone path at the throw
+        to_land_x, to_land_y = land_x[play] - throw_x, land_y[play] - throw_y
+        to_land = np.maximum(np.hypot(to_land_x, to_land_y), 1e-6)
+        pursuit = players['pursuit_speed'].values[player_row[pair]] * (1 + rng.normal(0, 0.08, len(pair)))
+        covered = np.minimum(pursuit * t, to_land)
+        def_x = throw_x + to_land_x / to_land * covered
+        def_y = throw_y + to_land_y / to_land * covered
+
+        is_target = slot[pair] == 1
+        output_df = pd.DataFrame({
+            'game_id': supp['game_id'].values[play],
+            'play_id': supp['play_id'].values[play],
+            'nfl_id': players['nfl_id'].values[player_row[pair]],
+            'frame_id': frame,
+            'x': np.where(is_target, target_x, def_x) + rng.normal(0, 0.03, len(pair)),
+            'y': np.where(is_target, target_y, def_y) + rng.normal(0, 0.03, len(pair))
+        })
+
+        # Raw coordinates: plays to the left are mirrored, like the real feed
+        for df, df_play in ((input_df, in_play), (output_df, play)):
+            mirror = geometry['play_direction'].values[df_play] == 'left'
+            df['x'] = np.clip(np.where(mirror, FIELD_X - df['x'], df['x']), 0.01, FIELD_X - 0.01)
+            df['y'] = np.clip(np.where(mirror, FIELD_Y - df['y'], df['y']), 0.01, FIELD_Y - 0.01)
+        mirror = input_df['play_direction'].values == 'left'
+        input_df['ball_land_x'] = np.where(mirror, FIELD_X - input_df['ball_land_x'], input_df['ball_land_x'])
+        input_df['ball_land_y'] = np.where(mirror, FIELD_Y - input_df['ball_land_y'], input_df['ball_land_y'])
+        input_df['dir'] = np.where(mirror, (input_df['dir'] + 180) % 360, input_df['dir'])
+        input_df['o'] = np.where(mirror, (input_df['o'] + 180) % 360, input_df['o'])
+
+        float_cols = ['x', 'y', 's', 'a', 'dir', 'o', 'ball_land_x', 'ball_land_y']
+        input_df[float_cols] = input_df[float_cols].round(2)
+        output_df[['x', 'y']] = output_df[['x', 'y']].round(2)
+        return input_df, output_df
+
+    # 4. WRITE
+    def generate_week(self, week: int, train_dir: str) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """
+        Writes input/output CSVs for one week; returns its supplementary rows and row counts.
+        """
+        rng = np.random.default_rng([self.seed, week])
+        supp, geometry, lineups = self._plays(week, rng)
+
+        input_path = os.path.join(train_dir, f'input_2023_w{week:02d}.csv')
+        output_path = os.path.join(train_dir, f'output_2023_w{week:02d}.csv')
+        stats = {'week': week, 'plays': len(supp), 'input_rows': 0, 'output_rows': 0}
+
+        for i, lo in enumerate(range(0, len(supp), self.chunk_plays)):
+            hi = lo + self.chunk_plays
+            chunk_rng = np.random.default_rng([self.seed, week, i + 1])
+            input_df, output_df = self._tracking(
+                chunk_rng, geometry.iloc[lo:hi].reset_index(drop=True),
+                supp.iloc[lo:hi].reset_index(drop=True), lineups[lo:hi])
+            mode, header = ('w', True) if i == 0 else ('a', False)
+            input_df.to_csv(input_path, mode=mode, header=header, index=False)
+            output_df.to_csv(output_path, mode=mode, header=header, index=False)
+            stats['input_rows'] += len(input_df)
+            stats['output_rows'] += len(output_df)
+
+        return supp, stats
+
+    def generate(self, output_dir: str) -> Dict[str, str]:
+        """
+        Writes the full season. Returns the paths to pass to the data pipeline.
+        """
+        train_dir = os.path.join(output_dir, 'train')
+        os.makedirs(train_dir, exist_ok=True)
+        supp_file = os.path.join(output_dir, 'supplementary_data.csv')
+
+        print(f"Generating {self.weeks} weeks x {self.plays_per_week} plays x {self.players_per_play} players "
+              f"(seed {self.seed}) -> {output_dir}")
+        supp_frames = []
+        for week in range(1, self.weeks + 1):
+            start = time.perf_counter()
+            supp, stats = self.generate_week(week, train_dir)
+            supp_frames.append(supp)
+            print(f"   -> Week {week:02d}: {stats['plays']} plays, {stats['input_rows']:,} input rows, "
+                  f"{stats['output_rows']:,} output rows in {time.perf_counter() - start:.1f}s")
+
+        pd.concat(supp_frames, ignore_index=True).to_csv(supp_file, index=False)
+        return {'data_dir': train_dir, 'supp_file': supp_file}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="NFL Void Engine - synthetic BDB-shaped data for scale testing")
+    parser.add_argument('--output-dir', default='data/synthetic')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help=f"Multiple of a 2023 season's plays ({SEASON_PLAYS_PER_WEEK} per week), e.g. 1, 10, 100.")
+    parser.add_argument('--plays-per-week', type=int, default=None, help="Overrides --scale.")
+    parser.add_argument('--weeks', type=int, default=SEASON_WEEKS)
+    parser.add_argument('--players-per-play', type=int, default=13)
+    parser.add_argument('--games-per-week', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    plays_per_week = args.plays_per_week or round(SEASON_PLAYS_PER_WEEK * args.scale)
+    generator = SyntheticDataGenerator(weeks=args.weeks, plays_per_week=plays_per_week,
+                                       players_per_play=args.players_per_play,
+                                       games_per_week=args.games_per_week, seed=args.seed)
+    paths = generator.generate(args.output_dir)
+    print(f"\nRun the pipeline on it:\n   python -m src.orchestrator --data-dir {paths['data_dir']} "
+          f"--supp-file {paths['supp_file']} --output-dir {os.path.join(args.output_dir, 'processed')}")
@@ -0,0 +1,227 @@
+import os
+import sys
+import json
+import time
+import platform
+import tracemalloc
+from contextlib import contextmanager, ExitStack
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+from src.validation import validation_clock, get_validation_policy
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Process high-water mark RSS. ru_maxrss is KB on Linux, bytes on macOS.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return round(peak / scale, 1)
+
+
+def frame_size(obj, deep: bool = True) -> Dict[str, int]:
+    """
+    Rows and in-memory bytes of a DataFrame (or a dict of them). Anything else counts as 0.
+    deep=False skips sizing the strings of object columns (pointer size only), which is cheap.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return {'rows': len(obj), 'bytes': int(obj.memory_usage(index=True, deep=deep).sum())}
+    if isinstance(obj, dict):
+        sizes = [frame_size(v, deep) for v in obj.values()]
+        return {'rows': sum(s['rows'] for s in sizes), 'bytes': sum(s['bytes'] for s in sizes)}
+    return {'rows': 0, 'bytes': 0}
+
+
+def count_groups(df: pd.DataFrame, keys=('game_id', 'play_id')) -> int:
+    if df is None or df.empty:
+        return 0
+    keys = [k for k in keys if k in df.columns]
+    if not keys:
+        return 0
+    return int(df[keys].drop_duplicates().shape[0])
+
+
+class StageRecord:
+    """
+    Mutable record for one stage; the orchestrator fills in data volumes.
+    Time spent measuring frame sizes is excluded from wall/CPU time; validation_s is the
+    part of wall_s spent in pandera checks. Byte counts are deep only when deep=True.
+    """
+    def __init__(self, name: str, active: bool = True, tags: dict = None, deep: bool = False):
+        self.name = name
+        self.tags = tags or {}
+        self.status = 'ok'
+        self.cached = False
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.validation_s = 0.0
+        self.peak_rss_mb = None
+        self.tracemalloc_peak_mb = None
+        self.rows_in = 0
+        self.bytes_in = 0
+        self.rows_out = 0
+        self.bytes_out = 0
+        self.groups = 0
+        self._overhead = [0.0, 0.0]
+        self._active = active
+        self._deep = deep
+
+    def _measure(self, frames):
+        if not self._active:
+            return 0, 0
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        rows, nbytes = 0, 0
+        for df in frames:
+            size = frame_size(df, self._deep)
+            rows += size['rows']
+            nbytes += size['bytes']
+        self._overhead[0] += time.perf_counter() - wall0
+        self._overhead[1] += time.process_time() - cpu0
+        return rows, nbytes
+
+    def inputs(self, *frames):
+        rows, nbytes = self._measure(frames)
+        self.rows_in += rows
+        self.bytes_in += nbytes
+
+    def outputs(self, *frames):
+        rows, nbytes = self._measure(frames)
+        self.rows_out += rows
+        self.bytes_out += nbytes
+
+    def to_dict(self) -> dict:
+        record = {k: v for k, v in vars(self).items() if not k.startswith('_') and k != 'tags'}
+        record.update(self.tags)
+        return record
+
+
+class Telemetry:
+    """
+    Per-stage wall/CPU time, memory peaks and data volumes for one pipeline run.
+
+    Usage:
+        with telemetry.stage('physics') as st:
+            st.inputs(df_in)
+            df_out = ...
+            st.outputs(df_out)
+
+    trace_memory turns on tracemalloc, which tracks Python + numpy allocations
+    (peak per stage), and deep frame sizes, at the cost of a several-fold slowdown.
+    Off, data volumes count object columns at pointer size.
+    hooks are objects with a stage(name) -> context manager (e.g. StageProfiler);
+    they wrap every stage, even when telemetry itself is disabled. A hook with a
+    report() -> dict adds that to the JSON report.
+    """
+    def __init__(self, pipeline: str, output_dir: Optional[str] = None,
+                 enabled: bool = True, trace_memory: bool = False, hooks: Iterable = ()):
+        self.pipeline = pipeline
+        self.hooks = list(hooks)
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.stages: List[StageRecord] = []
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str, **tags):
+        """
+        tags (e.g. week=3) are stored on the record; a stage may run once per tag value.
+        """
+        with ExitStack() as hooks:
+            for hook in self.hooks:
+                hooks.enter_context(hook.stage(name))
+            with self._record(name, tags) as record:
+                yield record
+
+    @contextmanager
+    def _record(self, name: str, tags: dict):
+        record = StageRecord(name, active=self.enabled, tags=tags, deep=self.trace_memory)
+        if not self.enabled:
+            yield record
+            return
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+
+        wall0, cpu0, valid0 = time.perf_counter(), time.process_time(), validation_clock()
+        try:
+            yield record
+        except BaseException:
+            record.status = 'failed'
+            raise
+        finally:
+            record.wall_s = round(time.perf_counter() - wall0 - record._overhead[0], 3)
+            record.cpu_s = round(time.process_time() - cpu0 - record._overhead[1], 3)
+            record.validation_s = round(validation_clock() - valid0, 3)
+            record.peak_rss_mb = peak_rss_mb()
+            if self.trace_memory and tracemalloc.is_tracing():
+                record.tracemalloc_peak_mb = round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 1)
+            self.stages.append(record)
+
+    def report(self) -> dict:
+        report = {
+            'pipeline': self.pipeline,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_wall_s': round(time.perf_counter() - self._t0, 3),
+            'peak_rss_mb': peak_rss_mb(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'validation_level': get_validation_policy().level,
+            'validation': get_validation_policy().records(),
+            'stages': [s.to_dict() for s in self.stages]
+        }
+        for hook in self.hooks:
+            if hasattr(hook, 'report'):
+                report.update(hook.report())
+        return report
+
+    def summary_table(self) -> str:
+        if not self.stages:
+            return f"[{self.pipeline}] no stages recorded"
+        df = pd.DataFrame([s.to_dict() for s in self.stages]).set_index('name')
+        df['mb_in'] = (df.pop('bytes_in') / 1024 ** 2).round(1)
+        df['mb_out'] = (df.pop('bytes_out') / 1024 ** 2).round(1)
+        tag_cols = sorted({k for s in self.stages for k in s.tags})
+        for col in tag_cols:
+            df[col] = [s.tags.get(col, '') for s in self.stages]
+        cols = tag_cols + ['status', 'cached', 'wall_s', 'cpu_s', 'validation_s', 'peak_rss_mb', 'tracemalloc_peak_mb',
+                           'rows_in', 'mb_in', 'rows_out', 'mb_out', 'groups']
+        return df[cols].to_string()
+
+    def write(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Writes the JSON report (default: OUTPUT_DIR/telemetry/<pipeline>_<timestamp>.json)
+        and prints the summary table. Stops tracemalloc if this run started it.
+        """
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started_tracing = False
+        if not self.enabled:
+            return None
+
+        if path is None:
+            stamp = self.started_at.strftime('%Y%m%d_%H%M%S')
+            path = os.path.join(self.output_dir or '.', 'telemetry', f'{self.pipeline}_{stamp}.json')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+        print(f"\n--- Stage telemetry ({self.pipeline}) ---")
+        print(self.summary_table())
+        print(f"   -> Telemetry report saved: {path}")
+        return path
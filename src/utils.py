@@ -0,0 +1,9 @@
+import numpy as np
+
+
+def rank_desc(scores: np.ndarray) -> np.ndarray:
+    """
+    Row-wise ranks of a 2-D score array, 1 = best. Missing scores sink to the bottom.
+    """
+    filled = np.where(np.isnan(scores), -np.inf, scores)
+    return (-filled).argsort(axis=1).argsort(axis=1) + 1
@@ -0,0 +1,124 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+import pandas as pd
+from pandera.engines import pandas_engine
+
+LEVELS = ('full', 'boundary', 'sample', 'off')
+
+
+def conform(schema, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    What schema.validate() does to the data, without the checks: drops the columns a
+    strict='filter' schema filters and casts coerce=True columns whose dtype differs.
+    """
+    schema_obj = schema.to_schema()
+    if schema_obj.strict == 'filter':
+        df = df[[c for c in df.columns if c in schema_obj.columns]]
+
+    casts = {}
+    for name, column in schema_obj.columns.items():
+        if name not in df.columns or not (column.coerce or schema_obj.coerce):
+            continue
+        if not column.dtype.check(pandas_engine.Engine.dtype(df[name].dtype)):
+            casts[name] = column.dtype.coerce(df[name])
+    # Like validate(), always a new frame
+    return df.assign(**casts)
+
+
+class ValidationPolicy:
+    """
+    How much pandera checking the data pipeline pays for:
+
+      full      every schema, every stage (default)
+      boundary  full checks where data enters (raw CSVs) and leaves (exports); stages in between
+                only conform their outputs
+      sample    dtypes plus a random sample of sample_rows rows, everywhere
+      off       conform only
+
+    Every level leaves the data exactly as full validation would (same columns and dtypes), so
+    the outputs and the stage cache keys do not depend on it; only the checks are skipped.
+    Used as a telemetry hook, it also attributes validation time to the running stage.
+    """
+    def __init__(self, level: str = 'full', sample_rows: int = 10_000, seed: int = 0):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown validation level: {level}. Valid: {list(LEVELS)}")
+        self.level = level
+        self.sample_rows = sample_rows
+        self.seed = seed
+        self.seconds = 0.0
+        self._stats: Dict[tuple, dict] = {}
+        self._stage = None
+
+    def validate(self, schema, df: pd.DataFrame, boundary: bool = False) -> pd.DataFrame:
+        start = time.perf_counter()
+
+        if self.level == 'full' or (boundary and self.level == 'boundary'):
+            mode, out = 'full', schema.validate(df)
+        elif self.level == 'sample':
+            if len(df) > self.sample_rows:
+                mode, out = 'sample', schema.validate(df, sample=self.sample_rows, random_state=self.seed)
+            else:
+                mode, out = 'full', schema.validate(df)
+        else:
+            mode, out = 'conform', conform(schema, df)
+
+        elapsed = time.perf_counter() - start
+        self.seconds += elapsed
+
+        stats = self._stats.setdefault((self._stage, schema.__name__, mode),
+                                       {'calls': 0, 'rows': 0, 'seconds': 0.0})
+        stats['calls'] += 1
+        stats['rows'] += len(df)
+        stats['seconds'] += elapsed
+        return out
+
+    @contextmanager
+    def stage(self, name: str):
+        previous, self._stage = self._stage, name
+        try:
+            yield
+        finally:
+            self._stage = previous
+
+    def records(self) -> List[dict]:
+        return [{'stage': stage, 'schema': schema, 'mode': mode, 'calls': s['calls'], 'rows': s['rows'],
+                 'seconds': round(s['seconds'], 3)}
+                for (stage, schema, mode), s in self._stats.items()]
+
+    def summary_table(self) -> str:
+        if not self._stats:
+            return f"[validation={self.level}] no validations"
+        df = pd.DataFrame(self.records())
+        df['stage'] = df['stage'].fillna('-')
+        return df.sort_values('seconds', ascending=False).to_string(index=False)
+
+
+_policy = ValidationPolicy()
+
+
+def configure_validation(level: str = 'full', sample_rows: int = 10_000, seed: int = 0) -> ValidationPolicy:
+    """
+    Installs the process-wide policy (worker processes configure their own).
+    """
+    global _policy
+    _policy = ValidationPolicy(level, sample_rows, seed)
+    return _policy
+
+
+def get_validation_policy() -> ValidationPolicy:
+    return _policy
+
+
+def validate(schema, df: pd.DataFrame, boundary: bool = False) -> pd.DataFrame:
+    """
+    schema.validate(df) under the active policy. boundary=True marks ingest / export checks.
+    """
+    return _policy.validate(schema, df, boundary=boundary)
+
+
+def validation_clock() -> float:
+    """
+    Seconds spent validating so far in this process (telemetry takes per-stage deltas).
+    """
+    return _policy.seconds
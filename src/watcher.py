@@ -0,0 +1,78 @@
+import os
+import glob
+import time
+import traceback
+from typing import Callable, Dict, Optional, Tuple
+
+
+class DirectoryWatcher:
+    """
+    Polls DATA_DIR's week files (input_*.csv / output_*.csv) and SUPP_FILE for additions and
+    changes. Polling rather than inotify: it works the same on network mounts and containers,
+    and new weeks arrive about once a week. A change only counts once the files have stayed
+    the same for settle_polls further polls, so half-copied CSVs are never read.
+    """
+    PATTERNS = ('input_*.csv', 'output_*.csv')
+
+    def __init__(self, data_dir: str, supp_file: str, poll_seconds: float = 60.0, settle_polls: int = 1):
+        self.data_dir = data_dir
+        self.supp_file = supp_file
+        self.poll_seconds = poll_seconds
+        self.settle_polls = settle_polls
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """
+        {path: (size, mtime_ns)} of every watched file that exists now.
+        """
+        paths = [p for pattern in self.PATTERNS for p in glob.glob(os.path.join(self.data_dir, pattern))]
+        if self.supp_file:
+            paths.append(self.supp_file)
+        state = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state[path] = (st.st_size, st.st_mtime_ns)
+        return state
+
+    def wait_for_change(self, previous: Dict, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Blocks until the snapshot differs from previous and has settled; returns the new
+        snapshot, or None once timeout seconds have passed without one.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        current, stable = previous, 0
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(self.poll_seconds)
+            state = self.snapshot()
+            if state == previous:
+                current, stable = previous, 0
+            elif state == current:
+                stable += 1
+                if stable >= self.settle_polls:
+                    return state
+            else:
+                current, stable = state, 0
+        return None
+
+
+def watch(run: Callable, watcher: DirectoryWatcher, max_runs: int = None):
+    """
+    Runs once, then again every time the watched files change. A failing run is reported and
+    the watch goes on (the week checkpoints keep what it finished).
+    """
+    runs = 0
+    state = watcher.snapshot()
+    while max_runs is None or runs < max_runs:
+        try:
+            run()
+        except Exception:
+            traceback.print_exc()
+            print("   -> [watch] run failed, waiting for the next change")
+        runs += 1
+        if max_runs is not None and runs >= max_runs:
+            break
+        print(f"   -> [watch] watching {watcher.data_dir} every {watcher.poll_seconds:g}s (Ctrl+C to stop)")
+        state = watcher.wait_for_change(state)
+    return runs
@@ -0,0 +1,437 @@
+import os
+import gc
+import json
+import time
+import shutil
+import socket
+import hashlib
+from datetime import datetime
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from src.load_data import DataLoader
+from src.data_preprocessor import DataPreProcessor
+from src.physics_engine import PhysicsEngine
+from src.context_engine import ContextEngine
+from src.eraser_engine import EraserEngine
+from src.benchmarking_engine import BenchmarkingEngine
+from src.telemetry import Telemetry, count_groups
+from src.stage_cache import StageCache
+from src.validation import configure_validation, get_validation_policy
+from src.work_queue import LeaseLost
+from src.cohorts import CohortSpec, DEFAULT_COHORT
+
+
+class WeeklyPipeline:
+    """
+    Per-week execution: preprocess -> physics -> context -> eraser run on one week at a time
+    (none of them needs cross-week data) and spill their results to work_dir/week_NN/.
+    Only the CEOE baselines are global; reduce() builds them from the per-week partials.
+
+    Peak memory is roughly one week of tracking data instead of the whole season.
+
+    Each week directory is a checkpoint: it lands atomically with a _SUCCESS marker holding
+    the week's key (its raw files + its plays' context rows + engine code and config) and stats,
+    and work_dir/manifest.json tracks the run. start_run(resume=True) keeps the weeks whose
+    key still matches, so a crashed run restarts at the first incomplete week.
+    cohorts select the plays (a single cohort; several cohorts need the batch mode).
+    """
+    VERSION = 1
+    TABLES = ['frames', 'player_plays', 'context', 'report', 'partials']
+    MARKER = '_SUCCESS'
+    MANIFEST = 'manifest.json'
+    # Modules besides the engines' own whose source a week checkpoint depends on
+    CODE_MODULES = ('src.expectation_model', 'src.cohorts', 'src.load_data')
+
+    def __init__(self, work_dir: str, expectation: str = 'cell', model_cache_dir: str = None,
+                 eraser_engine: EraserEngine = None, telemetry: Telemetry = None,
+                 week_keys: Dict[int, str] = None, cohorts: List[CohortSpec] = None):
+        self.work_dir = work_dir
+        self.cohorts = cohorts or [DEFAULT_COHORT]
+        self.telemetry = telemetry or Telemetry('weekly', enabled=False)
+        self.week_keys = week_keys or {}
+
+        self.processor = DataPreProcessor()
+        self.physics_engine = PhysicsEngine()
+        self.context_engine = ContextEngine()
+        self.eraser_engine = eraser_engine or EraserEngine()
+        self.benchmarker = BenchmarkingEngine(expectation=expectation, model_cache_dir=model_cache_dir)
+
+    def week_dir(self, week_num) -> str:
+        return os.path.join(self.work_dir, f'week_{int(week_num):02d}')
+
+    def reset(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        os.makedirs(self.work_dir, exist_ok=True)
+
+    def filter_context(self, supp_df: pd.DataFrame) -> pd.DataFrame:
+        return self.processor.filter_context(supp_df, cohorts=self.cohorts)
+
+    def compute_week_keys(self, loader: DataLoader, clean_context: pd.DataFrame) -> Dict[int, str]:
+        """
+        Checkpoint identity of every week the loader will run. A week is redone when its raw
+        files, its rows of the filtered context, the selection, the cohort, an engine or the
+        engine config change. Only the week's own context rows count, so appending a new week to the
+        supplementary file leaves the other weeks' keys alone.
+        """
+        engines = [DataPreProcessor, PhysicsEngine, ContextEngine, EraserEngine, BenchmarkingEngine, WeeklyPipeline]
+        shared = {
+            'code': [StageCache.code_fingerprint(cls, self.CODE_MODULES) for cls in engines],
+            'selection': loader.selection.model_dump(),
+            'cohorts': [c.model_dump() for c in self.cohorts],
+            'config': {'expectation': self.benchmarker.expectation, 'max_speed': self.eraser_engine.max_speed,
+                       'max_accel': self.eraser_engine.max_accel}
+        }
+        keys = {}
+        for week_num in loader.week_numbers():
+            paths = [p for p in (loader.input_map.get(week_num), loader.output_map.get(week_num)) if p]
+            context = clean_context[clean_context['week'] == int(week_num)].sort_values(['game_id', 'play_id'])
+            context_hash = hashlib.sha256(
+                pd.util.hash_pandas_object(context[sorted(context.columns)], index=False).values.tobytes()).hexdigest()
+            payload = dict(shared, week=int(week_num), files=StageCache.fingerprint_files(paths), context=context_hash)
+            blob = json.dumps(payload, sort_keys=True, default=str).encode()
+            keys[int(week_num)] = hashlib.sha256(blob).hexdigest()[:20]
+        return keys
+
+    def start_run(self, week_keys: Dict[int, str], resume: bool = False) -> List[int]:
+        """
+        Fresh run: clears work_dir. Resume: keeps the checkpointed weeks whose key matches
+        and drops the rest (stale keys, half-written temp dirs, weeks outside this run).
+        Returns the weeks that will be reused.
+        """
+        self.week_keys = dict(week_keys)
+        if not resume:
+            self.reset()
+        else:
+            os.makedirs(self.work_dir, exist_ok=True)
+            for name in os.listdir(self.work_dir):
+                path = os.path.join(self.work_dir, name)
+                if not name.startswith('week_'):
+                    continue
+                if '.tmp' in name or int(name[5:7]) not in self.week_keys or not self.is_checkpointed(int(name[5:7])):
+                    shutil.rmtree(path, ignore_errors=True)
+
+        reused = [w for w in sorted(self.week_keys) if self.is_checkpointed(w)]
+        self._write_manifest({
+            'version': self.VERSION,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'resumed': bool(resume),
+            'weeks': {str(w): {'key': key, 'status': 'done' if w in reused else 'pending',
+                               'stats': self.checkpoint(w)['stats'] if w in reused else None}
+                      for w, key in sorted(self.week_keys.items())}
+        })
+        return reused
+
+    def checkpoint(self, week: int) -> Optional[Dict]:
+        path = os.path.join(self.week_dir(week), self.MARKER)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def is_checkpointed(self, week: int) -> bool:
+        """
+        Week directory complete, and (when keys are set) written for this week's current key.
+        """
+        marker = self.checkpoint(week)
+        if marker is None:
+            return False
+        return week not in self.week_keys or marker.get('key') == self.week_keys[week]
+
+    def manifest(self) -> Optional[Dict]:
+        path = os.path.join(self.work_dir, self.MANIFEST)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def record_week(self, stats: Dict):
+        """
+        Marks a finished week in the manifest (parent process only; workers write markers).
+        """
+        manifest = self.manifest() or {'version': self.VERSION, 'weeks': {}}
+        entry = manifest['weeks'].setdefault(str(stats['week']), {'key': self.week_keys.get(stats['week'])})
+        entry.update(status='done', stats=stats, completed_at=datetime.now().isoformat(timespec='seconds'))
+        self._write_manifest(manifest)
+
+    def _write_manifest(self, manifest: Dict):
+        path = os.path.join(self.work_dir, self.MANIFEST)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(path + '.tmp', path)
+
+    def process_week(self, week_num: str, input_df: pd.DataFrame, output_df: pd.DataFrame,
+                     clean_context: pd.DataFrame, owns: Callable[[], bool] = None) -> Dict[str, int]:
+        """
+        Runs the per-week stages and writes their tables. Returns row counts for the week.
+        owns (work queue): checked right before the week directory is landed; if it returns
+        False the week is discarded and LeaseLost is raised.
+        """
+        week = int(week_num)
+        stats = {'week': week, 'frames': 0, 'plays': 0, 'defenders': 0}
+        stage = self.telemetry.stage
+
+        with stage('preprocess', week=week) as st:
+            st.inputs(input_df, output_df)
+            df_week = self.processor.process_single_week(week_num, input_df, output_df, clean_context)
+            del input_df, output_df
+            tables = {'player_plays': self.processor.build_player_plays(df_week)} if not df_week.empty else {}
+            st.outputs(df_week)
+            st.groups = count_groups(df_week)
+
+        if df_week.empty:
+            self._write_week(week, {}, stats, owns)
+            return stats
+
+        with stage('physics', week=week) as st:
+            st.inputs(df_week)
+            df_physics = self.physics_engine.derive_metrics(df_week)
+            del df_week
+            st.outputs(df_physics)
+            st.groups = count_groups(df_physics)
+
+        with stage('context', week=week) as st:
+            df_context = self.context_engine.calculate_void_context(df_physics)
+            tables['context'] = df_context
+            st.inputs(df_physics)
+            st.outputs(df_context)
+            st.groups = count_groups(df_context)
+
+        # Weeks whose plays all drop out of the void context still export their frames
+        if not df_context.empty:
+            with stage('eraser', week=week) as st:
+                df_metrics = self.eraser_engine.calculate_eraser(df_physics, df_context)
+                df_report = self.benchmarker.prepare_report(
+                    df_metrics, df_context, df_players=tables['player_plays'])
+                tables['report'] = df_report
+                tables['partials'] = self.benchmarker.baseline_partials(df_report)
+                stats['defenders'] = len(df_report)
+                st.inputs(df_physics, df_context)
+                st.outputs(df_report)
+                st.groups = count_groups(df_report)
+
+        tables['frames'] = df_physics
+        stats['frames'] = len(df_physics)
+        stats['plays'] = count_groups(df_context)
+
+        self._write_week(week, tables, stats, owns)
+        del tables, df_physics
+        gc.collect()
+
+        return stats
+
+    def _write_week(self, week: int, tables: Dict[str, pd.DataFrame], stats: Dict = None,
+                    owns: Callable[[], bool] = None):
+        week_dir = self.week_dir(week)
+        # Unique per writer: with a shared work queue, a re-claimed week may have two writers
+        tmp_dir = f"{week_dir}.tmp-{socket.gethostname()}-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        for name, df in tables.items():
+            df.to_parquet(os.path.join(tmp_dir, f'{name}.parquet'), index=False)
+        # Written last: a week directory without it never counts as done
+        with open(os.path.join(tmp_dir, self.MARKER), 'w') as f:
+            json.dump({'week': week, 'key': self.week_keys.get(week), 'tables': list(tables),
+                       'stats': stats or {}}, f)
+
+        # A writer whose lease was taken over must not replace the new owner's week
+        if owns is not None and not owns():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise LeaseLost(f"lease on week {week} was taken over, discarding this copy")
+
+        shutil.rmtree(week_dir, ignore_errors=True)
+        try:
+            os.replace(tmp_dir, week_dir)
+        except OSError:
+            # Another writer landed the same (deterministic) week first
+            if not os.path.isdir(week_dir):
+                raise
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def completed_weeks(self) -> List[int]:
+        if not os.path.isdir(self.work_dir):
+            return []
+        weeks = [int(d.split('_')[1]) for d in os.listdir(self.work_dir)
+                 if d.startswith('week_') and '.tmp' not in d
+                 and os.path.exists(os.path.join(self.work_dir, d, self.MARKER))]
+        return sorted(weeks)
+
+    def load_week(self, week: int, table: str) -> Optional[pd.DataFrame]:
+        path = os.path.join(self.week_dir(week), f'{table}.parquet')
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def _concat(self, table: str, weeks: Iterable[int]) -> pd.DataFrame:
+        parts = [df for df in (self.load_week(w, table) for w in weeks) if df is not None]
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts, ignore_index=True)
+
+    def reduce(self, weeks: Iterable[int] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Global step: baselines from the per-week partials, applied to the per-week reports.
+        Only the small tables are loaded; frames stay on disk for iter_frames().
+        """
+        weeks = self.completed_weeks() if weeks is None else sorted(weeks)
+
+        df_report = self._concat('report', weeks)
+        df_players = self._concat('player_plays', weeks)
+
+        if df_report.empty:
+            return {'summary': pd.DataFrame(), 'player_plays': df_players}
+
+        if self.benchmarker.expectation == 'model':
+            df_final = self.benchmarker.apply_expected_model(df_report)
+        else:
+            partials = [p for p in (self.load_week(w, 'partials') for w in weeks) if p is not None]
+            baselines = self.benchmarker.merge_partials(partials)
+            df_final = self.benchmarker.apply_baselines(df_report, baselines)
+
+        return {'summary': df_final, 'player_plays': df_players}
+
+    def iter_frames(self, weeks: Iterable[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Physics frames one week at a time, in week order (the exporter's chunked input).
+        """
+        weeks = self.completed_weeks() if weeks is None else sorted(weeks)
+        for week in weeks:
+            df = self.load_week(week, 'frames')
+            if df is not None and not df.empty:
+                yield df
+
+
+def _limit_worker_memory(max_memory_mb: int):
+    """
+    Pool initializer: caps the worker's address space, so a runaway week raises
+    MemoryError in that worker instead of pushing the whole box into swap.
+    """
+    if not max_memory_mb:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows: no per-process limit
+        return
+    limit = int(max_memory_mb) * 1024 ** 2
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _run_week_task(pipeline_kwargs: dict, data_dir: str, supp_file: str, selection, week_num: str,
+                   clean_context: pd.DataFrame, telemetry_enabled: bool, trace_memory: bool,
+                   validation: tuple = None, chunk_rows: int = None):
+    """
+    Worker entry point: loads its own week from disk (raw frames never cross processes)
+    and returns the week stats plus its telemetry records.
+    validation is the parent's (level, sample_rows, seed), so workers check as much as it does.
+    """
+    start = time.perf_counter()
+    if validation:
+        configure_validation(*validation)
+    telemetry = Telemetry('week', enabled=telemetry_enabled, trace_memory=trace_memory)
+    pipeline = WeeklyPipeline(telemetry=telemetry, **pipeline_kwargs)
+
+    loader = DataLoader(data_dir, supp_file, selection=selection, chunk_rows=chunk_rows, cohorts=pipeline.cohorts)
+    input_df, output_df = loader.load_week(week_num)
+    stats = pipeline.process_week(week_num, input_df, output_df, clean_context)
+
+    stats['pid'] = os.getpid()
+    stats['wall_s'] = round(time.perf_counter() - start, 3)
+    for record in telemetry.stages:
+        record.tags['pid'] = stats['pid']
+    return stats, telemetry.stages
+
+
+class ParallelWeekExecutor:
+    """
+    Runs WeeklyPipeline.process_week for several weeks at once in a process pool.
+
+    Each worker reads its own week from disk and writes its own week_NN/ directory, so
+    only the small filtered context and the per-week stats are pickled. Results are
+    returned in week order whatever order the workers finish in, and reduce() reads
+    the week directories in week order, so outputs match a serial run.
+    Stage profiling hooks only see the parent process (use workers=1 to profile).
+    Weeks already checkpointed for their current key are skipped (their stats come from
+    the marker); every finished week is recorded in the manifest as it completes.
+    """
+    def __init__(self, pipeline: WeeklyPipeline, workers: int = 1, max_memory_mb: int = 0):
+        self.pipeline = pipeline
+        self.workers = max(1, int(workers))
+        self.max_memory_mb = max_memory_mb
+
+    def run(self, loader: DataLoader, clean_context: pd.DataFrame) -> List[Dict]:
+        all_weeks = loader.week_numbers()
+        telemetry = self.pipeline.telemetry
+
+        checkpointed = {}
+        for week_num in all_weeks:
+            if self.pipeline.is_checkpointed(int(week_num)):
+                checkpointed[week_num] = dict(self.pipeline.checkpoint(int(week_num))['stats'], resumed=True)
+        weeks = [w for w in all_weeks if w not in checkpointed]
+        if checkpointed:
+            print(f"   -> Resuming: weeks {', '.join(checkpointed)} already checkpointed, "
+                  f"{len(weeks)} to run")
+
+        if self.workers == 1 or len(weeks) <= 1:
+            results = dict(checkpointed)
+            for week_num in weeks:
+                start = time.perf_counter()
+                print(f"Streaming Week {week_num}...")
+                input_df, output_df = loader.load_week(week_num)
+                stats = self.pipeline.process_week(week_num, input_df, output_df, clean_context)
+                del input_df, output_df
+                gc.collect()
+                stats['pid'] = os.getpid()
+                stats['wall_s'] = round(time.perf_counter() - start, 3)
+                self.pipeline.record_week(stats)
+                self._report(stats)
+                results[week_num] = stats
+            return [results[w] for w in all_weeks]
+
+        pipeline_kwargs = {
+            'work_dir': self.pipeline.work_dir,
+            'expectation': self.pipeline.benchmarker.expectation,
+            'model_cache_dir': self.pipeline.benchmarker.model_cache_dir,
+            'eraser_engine': self.pipeline.eraser_engine,
+            'week_keys': self.pipeline.week_keys,
+            'cohorts': self.pipeline.cohorts
+        }
+        workers = min(self.workers, len(weeks))
+        print(f"   -> Running {len(weeks)} weeks on {workers} worker processes"
+              + (f" (memory limit {self.max_memory_mb} MB each)" if self.max_memory_mb else ""))
+
+        policy = get_validation_policy()
+        validation = (policy.level, policy.sample_rows, policy.seed)
+
+        results, records = dict(checkpointed), {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_limit_worker_memory,
+                                 initargs=(self.max_memory_mb,)) as pool:
+            futures = {
+                pool.submit(_run_week_task, pipeline_kwargs, loader.data_dir, loader.supp_file,
+                            loader.selection, week_num, clean_context, telemetry.enabled, telemetry.trace_memory,
+                            validation, loader.chunk_rows): week_num
+                for week_num in weeks
+            }
+            for future in as_completed(futures):
+                week_num = futures[future]
+                try:
+                    stats, week_records = future.result()
+                except MemoryError as e:
+                    raise MemoryError(
+                        f"Week {week_num} exceeded the worker memory limit of {self.max_memory_mb} MB. "
+                        "Raise WORKER_MAX_MEMORY_MB or lower WORKERS.") from e
+                self.pipeline.record_week(stats)
+                self._report(stats)
+                results[week_num], records[week_num] = stats, week_records
+
+        # Deterministic: collect in week order, not completion order
+        ordered = [results[w] for w in all_weeks]
+        for week_num in weeks:
+            telemetry.stages.extend(records[week_num])
+        return ordered
+
+    @staticmethod
+    def _report(stats: Dict):
+        print(f"   -> Week {stats['week']:02d}: {stats['plays']} plays, {stats['defenders']} defender-plays, "
+              f"{stats['frames']} frames in {stats['wall_s']:.1f}s (pid {stats['pid']})")
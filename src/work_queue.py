@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class LeaseLost(RuntimeError):
+    """
+    Raised when a worker finishes a task whose lease another worker has taken over.
+    """
+
+
+class FileWorkQueue:
+    """
+    Work queue on a shared filesystem, no scheduler needed.
+
+    queue_dir/
+      tasks/<task>.json              task spec, written once (enqueue is idempotent)
+      claims/<task>.<attempt>.lock   created with O_CREAT|O_EXCL; the highest attempt owns the task
+      done/<task>.json               result, written atomically by the owner
+
+    A lease is alive while its lock file's mtime is younger than lease_seconds; the owner
+    heartbeats by touching it. Once a lease expires, any worker may claim attempt + 1.
+    O_EXCL on that new name makes the takeover atomic, so two workers can never both win.
+    Hosts must share a roughly synced clock (lease_seconds should dwarf the skew).
+    """
+    def __init__(self, queue_dir: str, lease_seconds: float = 600, worker_id: str = None):
+        self.queue_dir = queue_dir
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+        for sub in ('tasks', 'claims', 'done'):
+            os.makedirs(os.path.join(queue_dir, sub), exist_ok=True)
+
+    def _path(self, sub: str, name: str) -> str:
+        return os.path.join(self.queue_dir, sub, name)
+
+    @staticmethod
+    def _write_atomic(path: str, payload: dict):
+        tmp = f"{path}.{socket.gethostname()}-{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    def enqueue(self, tasks: Dict[str, dict]):
+        """
+        tasks: task_id -> spec. Existing tasks are left alone, so every worker may call this.
+        """
+        for task_id, spec in tasks.items():
+            path = self._path('tasks', f'{task_id}.json')
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            with os.fdopen(fd, 'w') as f:
+                json.dump(spec, f)
+
+    def task_ids(self):
+        return sorted(f[:-len('.json')] for f in os.listdir(os.path.join(self.queue_dir, 'tasks'))
+                      if f.endswith('.json'))
+
+    def spec(self, task_id: str) -> dict:
+        with open(self._path('tasks', f'{task_id}.json')) as f:
+            return json.load(f)
+
+    def is_done(self, task_id: str) -> bool:
+        return os.path.exists(self._path('done', f'{task_id}.json'))
+
+    def result(self, task_id: str) -> Optional[dict]:
+        if not self.is_done(task_id):
+            return None
+        with open(self._path('done', f'{task_id}.json')) as f:
+            return json.load(f)
+
+    def _current_attempt(self, task_id: str) -> int:
+        prefix = f'{task_id}.'
+        attempts = [int(f[len(prefix):-len('.lock')]) for f in os.listdir(os.path.join(self.queue_dir, 'claims'))
+                    if f.startswith(prefix) and f.endswith('.lock')]
+        return max(attempts, default=0)
+
+    def _lock_path(self, task_id: str, attempt: int) -> str:
+        return self._path('claims', f'{task_id}.{attempt}.lock')
+
+    def _lease_expired(self, lock_path: str) -> bool:
+        try:
+            return time.time() - os.stat(lock_path).st_mtime > self.lease_seconds
+        except FileNotFoundError:
+            return True
+
+    def claim(self) -> Optional[tuple]:
+        """
+        Claims the first unfinished task that is unclaimed or whose lease expired.
+        Returns (task_id, attempt) or None when nothing is claimable right now.
+        """
+        for task_id in self.task_ids():
+            if self.is_done(task_id):
+                continue
+
+            attempt = self._current_attempt(task_id)
+            if attempt and not self._lease_expired(self._lock_path(task_id, attempt)):
+                continue
+
+            try:
+                fd = os.open(self._lock_path(task_id, attempt + 1), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue  # another worker won this attempt
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'worker': self.worker_id, 'claimed_at': time.time()}, f)
+
+            if attempt:
+                print(f"   -> [{self.worker_id}] lease on {task_id} expired, taking over (attempt {attempt + 1})")
+            return task_id, attempt + 1
+        return None
+
+    def owns(self, task_id: str, attempt: int) -> bool:
+        return self._current_attempt(task_id) == attempt
+
+    def renew(self, task_id: str, attempt: int):
+        os.utime(self._lock_path(task_id, attempt))
+
+    @contextmanager
+    def lease(self, task_id: str, attempt: int):
+        """
+        Keeps the lease alive from a heartbeat thread while the task runs.
+        """
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(self.lease_seconds / 3):
+                try:
+                    self.renew(task_id, attempt)
+                except FileNotFoundError:
+                    return
+
+        thread = threading.Thread(target=heartbeat, name=f'lease-{task_id}', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, task_id: str, attempt: int, result: dict):
+        if not self.owns(task_id, attempt):
+            raise LeaseLost(f"{self.worker_id} lost the lease on {task_id} (attempt {attempt})")
+        self._write_atomic(self._path('done', f'{task_id}.json'),
+                           dict(result, worker=self.worker_id, attempt=attempt))
+
+    def results(self) -> List[dict]:
+        """
+        Result records of the finished tasks, in task order.
+        """
+        return [r for r in (self.result(t) for t in self.task_ids()) if r is not None]
+
+    def status(self) -> Dict[str, int]:
+        counts = {'pending': 0, 'running': 0, 'expired': 0, 'done': 0}
+        for task_id in self.task_ids():
+            attempt = self._current_attempt(task_id)
+            if self.is_done(task_id):
+                counts['done'] += 1
+            elif not attempt:
+                counts['pending'] += 1
+            elif self._lease_expired(self._lock_path(task_id, attempt)):
+                counts['expired'] += 1
+            else:
+                counts['running'] += 1
+        return counts
+
+    def all_done(self) -> bool:
+        return all(self.is_done(t) for t in self.task_ids())
+
+    def wait_all(self, poll_seconds: float = 5.0, timeout: float = None, work: Callable[[], object] = None):
+        """
+        Blocks until every task is done (the reducer's barrier). work() runs before every
+        check, e.g. to help with tasks that are pending or whose lease expired.
+        """
+        start = time.time()
+        while True:
+            if work is not None:
+                work()
+            if self.all_done():
+                return
+            if timeout is not None and time.time() - start > timeout:
+                raise TimeoutError(f"Work queue {self.queue_dir} not finished: {self.status()}")
+            time.sleep(poll_seconds)
@@ -0,0 +1,30 @@
+from benchmarks.bench_engines import run_suite, compare, regressions, write_results, load_results
+
+def _results(*rows):
+    return {'meta': {}, 'results': [dict(zip(['engine', 'size', 'wall_s', 'peak_mb'], r)) for r in rows]}
+
+def test_compare_flags_only_real_regressions():
+    baseline = _results(('physics', 100, 2.0, 50.0), ('context', 100, 0.01, 5.0), ('eraser', 100, 1.0, 20.0))
+    current = _results(('physics', 100, 3.0, 51.0),    # +50% time
+                       ('context', 100, 0.02, 5.0),    # +100%, but under the noise floor
+                       ('eraser', 100, 0.5, 40.0),     # faster, but +100% memory
+                       ('tables', 100, 0.1, 1.0))      # not in the baseline
+
+    status = compare(current, baseline, threshold_pct=20).set_index('engine')['status']
+
+    assert status['physics'] == 'REGRESSION (time)'
+    assert status['context'] == 'ok'
+    assert status['eraser'] == 'REGRESSION (memory)'
+    assert status['tables'] == 'new'
+    assert len(regressions(compare(current, baseline, threshold_pct=20))) == 2
+    assert regressions(compare(current, baseline, threshold_pct=60, memory_threshold_pct=150)).empty
+
+def test_suite_records_selected_engines(tmp_path):
+    results = run_suite(sizes=[20], engines=['context', 'benchmarking'], repeat=1, work_dir=str(tmp_path))
+
+    assert [(r['engine'], r['size']) for r in results['results']] == [('context', 20), ('benchmarking', 20)]
+    assert all(r['wall_s'] >= 0 and r['peak_mb'] > 0 and r['rows_in'] > 0 for r in results['results'])
+
+    # Round trip through JSON; a run compared with itself never regresses
+    path = write_results(results, str(tmp_path / 'run.json'))
+    assert regressions(compare(results, load_results(path))).empty
@@ -124,4 +124,127 @@ def test_benchmarking_math_sign():
     # Player 1 (20.0) vs Avg (15.0) -> +5.0
     p1 = result[result['nfl_id'] == 100.0].iloc[0]
     assert p1['ceoe_score'] > 0, "Better than average should be positive"
-    assert np.isclose(p1['ceoe_score'], 5.0)
\ No newline at end of file
+    assert np.isclose(p1['ceoe_score'], 5.0)
+
+def make_player_plays(nfl_ids, positions):
+    n = len(nfl_ids)
+    return pd.DataFrame({
+        'game_id': [1] * n, 'play_id': np.arange(1, n + 1),
+        'nfl_id': nfl_ids,
+        'player_role': ['Defensive Coverage'] * n,
+        'player_name': [f"Player {i}" for i in range(n)],
+        'player_position': positions,
+        'week': [1] * n, 'down': [1] * n,
+        'team_coverage_type': ['COVER_3_ZONE'] * n,
+        'pass_result': ['C'] * n,
+        'yards_gained': [5] * n, 'pass_length': [5] * n,
+        'expected_points_added': [0.1] * n
+    })
+
+def test_benchmarking_player_play_dimension():
+    """
+    TEST 4: Dimension Join.
+    With the Player-Play table supplied, the frames table is never needed.
+    """
+    df_metrics = pd.DataFrame({
+        'game_id': [1, 1, 1], 'play_id': [1, 2, 3],
+        'nfl_id': [101.0, 102.0, 201.0],
+        'avg_closing_speed': [20.0, 10.0, 10.0],
+        'vis_score': [0.0]*3,
+        'dist_at_arrival': [0.0]*3,
+        'p_dist_at_throw': [5.0]*3
+    })
+
+    df_context = pd.DataFrame({
+        'game_id': [1]*3, 'play_id': [1, 2, 3],
+        'void_type': ['High Void']*3,
+        'dist_at_throw': [10.0]*3
+    })
+
+    df_players = make_player_plays([101.0, 102.0, 201.0], ['CB', 'CB', 'LB'])
+
+    engine = BenchmarkingEngine()
+    result = engine.calculate_ceoe(df_metrics, df_context, df_players=df_players)
+
+    assert len(result) == 3
+    cb1 = result[result['nfl_id'] == 101.0].iloc[0]
+    assert np.isclose(cb1['ceoe_score'], 5.0)
+    assert cb1['player_name'] == 'Player 0'
+
+
+def test_benchmarking_sharded_partials():
+    """
+    TEST 5: Map-Reduce.
+    Baselines merged from per-week partials must match a single in-memory pass.
+    """
+    rng = np.random.default_rng(7)
+    n = 40
+    positions = rng.choice(['CB', 'FS', 'LB'], size=n)
+
+    df_metrics = pd.DataFrame({
+        'game_id': [1] * n, 'play_id': np.arange(1, n + 1),
+        'nfl_id': np.arange(100, 100 + n).astype(float),
+        'avg_closing_speed': rng.normal(2.0, 3.0, size=n),
+        'vis_score': [0.0] * n,
+        'dist_at_arrival': [0.0] * n,
+        'p_dist_at_throw': [5.0] * n
+    })
+    df_context = pd.DataFrame({
+        'game_id': [1] * n, 'play_id': np.arange(1, n + 1),
+        'void_type': rng.choice(['High Void', 'Neutral', 'Tight Window'], size=n),
+        'dist_at_throw': [5.0] * n
+    })
+    df_players = make_player_plays(df_metrics['nfl_id'].tolist(), positions)
+    df_players['week'] = np.repeat([1, 2, 3, 4], n // 4)
+
+    engine = BenchmarkingEngine()
+    full = engine.calculate_ceoe(df_metrics, df_context, df_players=df_players)
+
+    # Each week is a separate shard
+    report = engine.prepare_report(df_metrics, df_context, df_players=df_players)
+    partials = [engine.baseline_partials(shard) for _, shard in report.groupby('week')]
+    baselines = engine.merge_partials(partials)
+    sharded = engine.apply_baselines(report, baselines)
+
+    assert np.allclose(full['ceoe_score'], sharded['ceoe_score'])
+
+    # ... and the original groupby-transform definition
+    expected = report['avg_closing_speed'] - report.groupby(
+        ['player_position', 'void_type'])['avg_closing_speed'].transform('mean')
+    assert np.allclose(sharded['ceoe_score'], expected)
+
+    # Moments reproduce the per-cell spread
+    cb_high = report[(report['player_position'] == 'CB') & (report['void_type'] == 'High Void')]
+    row = baselines[(baselines['player_position'] == 'CB') & (baselines['void_type'] == 'High Void')].iloc[0]
+    assert row['speed_count'] == len(cb_high)
+    assert np.isclose(row['baseline_std'], cb_high['avg_closing_speed'].std())
+
+
+def test_benchmarking_model_expectation(tmp_path):
+    """
+    TEST 6: Context Model Backend.
+    Same report contract, expectation comes from the fitted model.
+    """
+    n = 60
+    df_metrics = pd.DataFrame({
+        'game_id': [1] * n, 'play_id': np.arange(1, n + 1),
+        'nfl_id': np.arange(100, 100 + n).astype(float),
+        'avg_closing_speed': np.linspace(-2, 8, n),
+        'vis_score': [0.0] * n,
+        'dist_at_arrival': [0.0] * n,
+        'p_dist_at_throw': np.linspace(0, 12, n)
+    })
+    df_context = pd.DataFrame({
+        'game_id': [1] * n, 'play_id': np.arange(1, n + 1),
+        'void_type': ['Neutral'] * n,
+        'dist_at_throw': [4.0] * n
+    })
+    df_players = make_player_plays(df_metrics['nfl_id'].tolist(), ['CB'] * n)
+
+    engine = BenchmarkingEngine(expectation='model', model_cache_dir=str(tmp_path))
+    result = engine.calculate_ceoe(df_metrics, df_context, df_players=df_players)
+
+    assert len(result) == n
+    assert result['ceoe_score'].notna().all()
+    # Residuals are centred on the expectation
+    assert abs(result['ceoe_score'].mean()) < 0.5
@@ -0,0 +1,52 @@
+import pandas as pd
+import numpy as np
+from src.analysis.bootstrap_engine import BootstrapEngine
+from src.analysis.table_generator import TableGenerator
+
+def make_summary(seed=0):
+    """
+    12 players x 30 plays. Player 0 is clearly best, the rest are noise around zero.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for pid in range(12):
+        pos = 'FS' if pid % 2 == 0 else 'CB'
+        mean = 3.0 if pid == 0 else 0.0
+        for play in range(30):
+            rows.append({
+                'game_id': 1, 'play_id': pid * 100 + play, 'nfl_id': float(pid),
+                'player_name': f"Player {pid}", 'player_position': pos,
+                'player_role': 'Defensive Coverage',
+                'ceoe_score': rng.normal(mean, 1.0),
+                'vis_score': 0.0, 'p_dist_at_throw': 5.0
+            })
+    return pd.DataFrame(rows)
+
+def test_bootstrap_matches_point_leaderboard():
+    """
+    Point estimates must equal the existing shrunk leaderboard.
+    """
+    df = make_summary()
+    board = BootstrapEngine(df, n_boot=200).run(min_snaps=15, prior_m=20)
+    leaderboard = TableGenerator(df).generate_shrunk_leaderboard(min_snaps=15, prior_m=20)
+
+    merged = leaderboard.merge(board, on='nfl_id', suffixes=('_lb', ''))
+    assert np.allclose(merged['shrunk_ceoe_lb'], merged['shrunk_ceoe'], atol=1e-3)
+    assert (board['shrunk_ceoe_lo'] <= board['shrunk_ceoe']).all()
+    assert (board['shrunk_ceoe'] <= board['shrunk_ceoe_hi']).all()
+
+    # The standout is #1 with a tight rank interval, the pack overlaps
+    top = board.iloc[0]
+    assert top['nfl_id'] == 0.0
+    assert top['rank_hi'] <= 2
+    assert (board.iloc[1:]['rank_hi'] - board.iloc[1:]['rank_lo']).max() > 3
+
+def test_bootstrap_deterministic_across_workers():
+    """
+    Same seed -> same intervals, whether blocks run inline or in a process pool.
+    """
+    df = make_summary()
+    inline = BootstrapEngine(df, n_boot=300, block_size=100, n_workers=1, seed=7).run()
+    pooled = BootstrapEngine(df, n_boot=300, block_size=100, n_workers=2, seed=7).run()
+
+    pd.testing.assert_frame_equal(inline, pooled)
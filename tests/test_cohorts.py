@@ -0,0 +1,87 @@
+import os
+import pandas as pd
+import pytest
+from src.synthetic_data import SyntheticDataGenerator
+from src.load_data import DataLoader
+from src.data_preprocessor import DataPreProcessor
+from src.orchestrator import run_full_pipeline
+from src.cohorts import CohortSpec, PRESETS, parse_cohorts, select_cohort
+
+@pytest.fixture
+def synthetic(tmp_path):
+    return SyntheticDataGenerator(weeks=2, plays_per_week=40, players_per_play=7, seed=11).generate(str(tmp_path / 'raw'))
+
+def test_cohort_masks_in_one_pass(synthetic):
+    supp = DataLoader(synthetic['data_dir'], synthetic['supp_file']).load_supplementary()
+    processor = DataPreProcessor()
+    zone_only = processor.filter_context(supp.copy())
+    assert list(processor.cohort_membership.columns) == ['game_id', 'play_id', 'zone']
+
+    late = CohortSpec(name='late_downs', downs=[3, 4], exclude_screens=False, query='yards_to_go >= 5')
+    union = processor.filter_context(supp.copy(), cohorts=[PRESETS['zone'], PRESETS['man'], late])
+    membership = processor.cohort_membership
+    assert len(union) == len(membership) and membership[['zone', 'man', 'late_downs']].any(axis=1).all()
+    assert membership['zone'].sum() == len(zone_only)
+    assert membership['man'].sum() > 0 and not (membership['zone'] & membership['man']).any()
+
+    late_plays = select_cohort(union, membership, 'late_downs')
+    assert len(late_plays) == membership['late_downs'].sum()
+    assert late_plays['down'].isin([3, 4]).all() and (late_plays['yards_to_go'] >= 5).all()
+
+def test_parse_cohorts(tmp_path):
+    assert [c.name for c in parse_cohorts('')] == ['zone']
+    assert [c.name for c in parse_cohorts('man, third_down')] == ['man', 'third_down']
+
+    path = tmp_path / 'cohorts.json'
+    path.write_text('[{"name": "red_zone", "field_position": [80, 100]}, {"name": "man", "coverage": "man"}]')
+    assert parse_cohorts(str(path))[0].field_position == (80, 100)
+
+    for bad in ['nickel', 'zone,zone']:
+        with pytest.raises(ValueError):
+            parse_cohorts(bad)
+    with pytest.raises(ValueError):
+        CohortSpec(name='../escape')
+
+def test_multi_cohort_run_matches_separate_runs(synthetic, tmp_path):
+    """
+    One pass over zone + man equals a zone run (main outputs) and a man run (its cohort dir).
+    """
+    runs = {}
+    for cohorts in ['zone', 'man', 'zone,man']:
+        runs[cohorts] = str(tmp_path / cohorts.replace(',', '_'))
+        run_full_pipeline(synthetic['data_dir'], synthetic['supp_file'], runs[cohorts], use_cache=False,
+                          cohorts=cohorts)
+
+    both = runs['zone,man']
+    for name in ['eraser_analysis_summary.csv', 'master_animation_data.csv']:
+        with open(os.path.join(runs['zone'], name), 'rb') as a, open(os.path.join(both, name), 'rb') as b:
+            assert a.read() == b.read()
+
+    for cohort in ['zone', 'man']:
+        pd.testing.assert_frame_equal(
+            pd.read_csv(os.path.join(both, 'cohorts', cohort, 'eraser_analysis_summary.csv')),
+            pd.read_csv(os.path.join(runs[cohort], 'eraser_analysis_summary.csv')))
+
+    overview = pd.read_csv(os.path.join(both, 'cohorts', 'cohorts.csv'))
+    assert overview['cohort'].tolist() == ['zone', 'man'] and (overview['plays'] > 0).all()
+
+    with pytest.raises(ValueError):
+        run_full_pipeline(synthetic['data_dir'], synthetic['supp_file'], str(tmp_path / 'weekly'), use_cache=False,
+                          cohorts='zone,man', mode='weekly')
+
+def test_single_cohort_weekly_matches_batch(synthetic, tmp_path):
+    """
+    A non-default cohort selects the same plays in the weekly mode as in batch.
+    """
+    batch, weekly = str(tmp_path / 'batch'), str(tmp_path / 'weekly')
+    run_full_pipeline(synthetic['data_dir'], synthetic['supp_file'], batch, use_cache=False, cohorts='man')
+    run_full_pipeline(synthetic['data_dir'], synthetic['supp_file'], weekly, use_cache=False, cohorts='man',
+                      mode='weekly')
+
+    for name in ['eraser_analysis_summary.csv', 'master_animation_data.csv']:
+        pd.testing.assert_frame_equal(pd.read_csv(os.path.join(batch, name)), pd.read_csv(os.path.join(weekly, name)),
+                                      check_exact=False)
+    supp = DataLoader(synthetic['data_dir'], synthetic['supp_file']).load_supplementary()
+    man_plays = DataPreProcessor().filter_context(supp, cohorts=[PRESETS['man']])
+    summary = pd.read_csv(os.path.join(weekly, 'eraser_analysis_summary.csv'))
+    assert len(summary) and len(summary.merge(man_plays[['game_id', 'play_id']])) == len(summary)
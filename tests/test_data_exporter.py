@@ -142,4 +142,219 @@ def test_exporter_io_creation(tmp_path):
     exporter.export_results(df_summary, df_frames)
     
     assert os.path.exists(os.path.join(output_dir, 'eraser_analysis_summary.csv'))
-    assert os.path.exists(os.path.join(output_dir, 'master_animation_data.csv'))
\ No newline at end of file
+    assert os.path.exists(os.path.join(output_dir, 'master_animation_data.csv'))
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_exporter_columnar_partitions(tmp_path, fmt):
+    """
+    PRIORITY 4: Columnar Export.
+    Week-partitioned output that the vis DataLoader reads back natively.
+    """
+    from src.analysis.data_loader import DataLoader
+
+    output_dir = str(tmp_path)
+
+    df_summary = mock_data_from_schema(
+        AnalysisReportSchema, n_rows=2,
+        game_id=1, play_id=[1, 2], nfl_id=100.0, week=[1, 2],
+        yards_gained=5, pass_length=10,
+        ceoe_score=[1.5, -0.5], void_type='Neutral'
+    )
+
+    df_frames = mock_data_from_schema(
+        PhysicsSchema, n_rows=6,
+        game_id=1, play_id=[1, 1, 1, 2, 2, 2], nfl_id=100.0,
+        frame_id=[1, 2, 3, 1, 2, 3], week=[1, 1, 1, 2, 2, 2],
+        yards_gained=5, pass_length=10, phase='post_throw'
+    )
+
+    exporter = DataExporter(output_dir, fmt=fmt)
+    exporter.export_results(df_summary, df_frames)
+
+    final_path = os.path.join(output_dir, f'master_animation_data.{fmt}')
+    assert sorted(os.listdir(final_path)) == ['week=1', 'week=2']
+
+    loader = DataLoader(os.path.join(output_dir, 'eraser_analysis_summary.csv'), final_path)
+    _, frames = loader.load_data()
+
+    assert len(frames) == 6
+    frames = frames.sort_values(['play_id', 'frame_id'])
+    assert frames['ceoe_score'].tolist() == [1.5] * 3 + [-0.5] * 3
+    # Strings come back dictionary-encoded
+    assert isinstance(frames['player_role'].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_exporter_star_schema(tmp_path, fmt):
+    """
+    PRIORITY 5: Star Schema.
+    Slim frame table + dimensions, re-joined per play by the vis loader.
+    """
+    from src.analysis.data_loader import DataLoader, select_play
+
+    output_dir = str(tmp_path)
+
+    df_summary = mock_data_from_schema(
+        AnalysisReportSchema, n_rows=1,
+        game_id=1, play_id=1, nfl_id=100.0, week=1,
+        yards_gained=5, pass_length=10,
+        ceoe_score=2.0, vis_score=1.0, dist_at_throw=4.0, void_type='Neutral'
+    )
+
+    df_frames = mock_data_from_schema(
+        PhysicsSchema, n_rows=8,
+        game_id=1, play_id=[1] * 4 + [2] * 4, nfl_id=100.0,
+        frame_id=[1, 2, 3, 4] * 2, week=1,
+        x=np.arange(8, dtype=float),
+        yards_gained=5, pass_length=10,
+        phase=['pre_throw', 'pre_throw', 'post_throw', 'post_throw'] * 2
+    )
+
+    exporter = DataExporter(output_dir, fmt=fmt, layout='star')
+    exporter.export_results(df_summary, df_frames)
+
+    star_dir = os.path.join(output_dir, 'animation_star')
+    assert not os.path.exists(os.path.join(output_dir, 'master_animation_data.csv'))
+
+    frames_path = os.path.join(star_dir, f'frames.{fmt}')
+    if fmt == 'csv':
+        slim = pd.read_csv(frames_path)
+        assert set(slim.columns) == {'game_id', 'play_id', 'nfl_id', 'frame_id', 'x', 'y', 's_derived', 'a_derived'}
+
+    loader = DataLoader(os.path.join(output_dir, 'eraser_analysis_summary.csv'), star_dir)
+    _, frames = loader.load_data()
+
+    play = select_play(frames, 1, 1).sort_values('frame_id')
+    assert len(play) == 4
+    assert play['x'].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert play['phase'].tolist() == ['pre_throw', 'pre_throw', 'post_throw', 'post_throw']
+    assert (play['ceoe_score'] == 2.0).all()
+    assert (play['void_type'] == 'Neutral').all()
+    assert (play['player_role'] == 'dummy_string').all()
+
+    # Play without a summary row keeps frames, scores are missing
+    other = select_play(frames, 1, 2)
+    assert len(other) == 4
+    assert other['ceoe_score'].isna().all()
+
+
+def test_exporter_play_shards(tmp_path):
+    """
+    PRIORITY 6: Play Shards.
+    The index points at exactly one play's bytes; loading never needs the frame table.
+    """
+    from src.analysis.data_loader import DataLoader, PlayShardReader, select_play
+
+    output_dir = str(tmp_path)
+
+    df_summary = mock_data_from_schema(
+        AnalysisReportSchema, n_rows=1,
+        game_id=7, play_id=3, nfl_id=100.0, week=2,
+        yards_gained=5, pass_length=10, ceoe_score=1.0, void_type='High Void'
+    )
+
+    df_frames = mock_data_from_schema(
+        PhysicsSchema, n_rows=9,
+        game_id=7, play_id=[1, 1, 1, 2, 2, 2, 3, 3, 3], nfl_id=100.0,
+        frame_id=[3, 1, 2] * 3, week=[1, 1, 1, 1, 1, 1, 2, 2, 2],
+        x=np.arange(9, dtype=float),
+        yards_gained=5, pass_length=10, phase='post_throw'
+    )
+
+    exporter = DataExporter(output_dir, layout='star', play_shards=True)
+    exporter.export_results(df_summary, df_frames)
+
+    star_dir = os.path.join(output_dir, 'animation_star')
+    shard_dir = os.path.join(star_dir, 'play_shards')
+    assert sorted(os.listdir(shard_dir)) == ['play_index.csv', 'week_01.bin', 'week_02.bin']
+
+    reader = PlayShardReader(shard_dir)
+    assert sorted(reader.keys()) == [(7, 1), (7, 2), (7, 3)]
+
+    # Shard rows come back sorted by frame
+    play = reader.read_play(7, 2)
+    assert play['frame_id'].tolist() == [1, 2, 3]
+    assert play['x'].tolist() == [4.0, 5.0, 3.0]
+
+    # Remove the frame table: the lazy loader must be served from shards alone
+    os.remove(os.path.join(star_dir, 'frames.csv'))
+    loader = DataLoader(os.path.join(output_dir, 'eraser_analysis_summary.csv'), star_dir)
+    _, frames = loader.load_data()
+
+    joined = select_play(frames, 7, 3)
+    assert len(joined) == 3
+    assert (joined['ceoe_score'] == 1.0).all()
+    assert reader.read_play(7, 99).empty
+
+
+@pytest.mark.parametrize("fmt,layout", [("csv", "wide"), ("parquet", "wide"), ("feather", "star")])
+def test_exporter_chunked_stream(tmp_path, fmt, layout):
+    """
+    PRIORITY 7: Streaming Export.
+    Writing week chunks from an iterator gives the same data as one big frame.
+    """
+    from src.analysis.data_loader import DataLoader, select_play
+
+    df_summary = mock_data_from_schema(
+        AnalysisReportSchema, n_rows=2,
+        game_id=1, play_id=[1, 2], nfl_id=100.0, week=[1, 2],
+        yards_gained=5, pass_length=10, ceoe_score=[1.0, 2.0], void_type='Neutral'
+    )
+    df_frames = mock_data_from_schema(
+        PhysicsSchema, n_rows=6,
+        game_id=1, play_id=[1, 1, 1, 2, 2, 2], nfl_id=100.0,
+        frame_id=[1, 2, 3] * 2, week=[1, 1, 1, 2, 2, 2],
+        x=np.arange(6, dtype=float),
+        yards_gained=5, pass_length=10, phase='post_throw'
+    )
+
+    loaded = []
+    for name, frames in [('single', df_frames), ('chunked', (g for _, g in df_frames.groupby('week')))]:
+        output_dir = str(tmp_path / name)
+        os.makedirs(output_dir)
+        DataExporter(output_dir, fmt=fmt, layout=layout).export_results(df_summary, frames)
+
+        if layout == 'star':
+            frames_path = os.path.join(output_dir, 'animation_star')
+        else:
+            frames_path = os.path.join(output_dir, f'master_animation_data.{fmt}')
+
+        loader = DataLoader(os.path.join(output_dir, 'eraser_analysis_summary.csv'), frames_path)
+        _, store = loader.load_data()
+        both = pd.concat([select_play(store, 1, 1), select_play(store, 1, 2)])
+        loaded.append(both.sort_values(['play_id', 'frame_id']).reset_index(drop=True))
+
+    single, chunked = loaded
+    assert len(chunked) == 6
+    assert chunked['x'].tolist() == single['x'].tolist()
+    assert chunked['ceoe_score'].tolist() == [1.0] * 3 + [2.0] * 3
+
+
+@pytest.mark.parametrize("fmt,layout", [("parquet", "wide"), ("feather", "star")])
+def test_exporter_failed_stream_leaves_no_partial_output(tmp_path, fmt, layout):
+    """
+    PRIORITY 8: Failed Export.
+    A chunk that fails half way closes the writers and removes the partial tables.
+    """
+    df_summary = mock_data_from_schema(
+        AnalysisReportSchema, n_rows=1,
+        game_id=1, play_id=1, nfl_id=100.0, week=1,
+        yards_gained=5, pass_length=10, ceoe_score=1.0, void_type='Neutral'
+    )
+    df_frames = mock_data_from_schema(
+        PhysicsSchema, n_rows=3,
+        game_id=1, play_id=1, nfl_id=100.0, frame_id=[1, 2, 3], week=1,
+        yards_gained=5, pass_length=10, phase='post_throw'
+    )
+
+    def failing_chunks():
+        yield df_frames
+        raise RuntimeError("physics chunk failed")
+
+    output_dir = str(tmp_path)
+    exporter = DataExporter(output_dir, fmt=fmt, layout=layout)
+    with pytest.raises(RuntimeError):
+        exporter.export_results(df_summary, failing_chunks())
+
+    tables = [p for p in exporter.output_paths() if not p.endswith('eraser_analysis_summary.csv')]
+    assert tables and not any(os.path.exists(p) for p in tables)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from benchmarks.equivalence import compare_frames, build_inputs, run_equivalence
+from benchmarks import reference_engines as ref
+from src.load_data import DataLoader
+from src.synthetic_data import SyntheticDataGenerator
+
+def test_compare_frames_reports_deviations_and_row_sets():
+    reference = pd.DataFrame({'game_id': [1, 1, 1], 'play_id': [1, 2, 3],
+                              'speed': [1.0, 2.0, np.nan], 'label': ['a', 'b', 'c']})
+    candidate = pd.DataFrame({'game_id': [1, 1, 1], 'play_id': [3, 2, 4],   # reordered, 1 missing, 4 extra
+                              'speed': [np.nan, 2.5, 0.0], 'label': ['c', 'x', 'd']})
+
+    summary, columns = compare_frames(reference, candidate, ['game_id', 'play_id'])
+    columns = columns.set_index('column')
+
+    assert summary['only_in_reference'] == 1 and summary['only_in_candidate'] == 1
+    assert summary['sample_only_in_reference'] == [[1, 1]]
+    assert columns.loc['speed', 'max_abs_dev'] == 0.5
+    assert columns.loc['speed', 'nan_mismatch'] == 0
+    assert columns.loc['label', 'mismatched'] == 1
+    assert not summary['equivalent']
+
+    summary, _ = compare_frames(reference, reference.iloc[::-1], ['game_id', 'play_id'])
+    assert summary['equivalent'] and summary['max_abs_dev'] == 0
+
+def test_current_engines_match_references_and_perturbations_are_caught(tmp_path):
+    paths = SyntheticDataGenerator(weeks=1, plays_per_week=30, seed=2).generate(str(tmp_path))
+    state = build_inputs(DataLoader(paths['data_dir'], paths['supp_file']))
+
+    results = run_equivalence(state, repeat=1)
+    assert [e['engine'] for e in results['engines']] == ['physics', 'context', 'eraser', 'benchmarking']
+    assert all(e['equivalent'] and e['speedup'] > 0 for e in results['engines'])
+
+    def drifting_physics(df):
+        out = ref.derive_metrics(df)
+        out['s_derived'] += 0.01
+        return out.iloc[1:]
+
+    results = run_equivalence(state, {'physics': drifting_physics}, engines=['physics'], repeat=1)
+    physics = results['engines'][0]
+    assert not physics['equivalent']
+    assert physics['only_in_reference'] == 1
+    assert np.isclose(physics['max_abs_dev'], 0.01)
@@ -101,4 +101,39 @@ def test_eraser_engine_ghost_join():
     # d_end should be 5.0 (Frame 5 distance), not NaN or crash
     assert row['dist_at_arrival'] == 5.0
     # VIS should be 5.0 (10 - 5)
-    assert row['vis_score'] == 5.0
\ No newline at end of file
+    assert row['vis_score'] == 5.0
+
+def test_eraser_engine_time_to_intercept():
+    """
+    TEST 4: Physical Baseline.
+    A defender already running at the target needs less time than one starting from rest.
+    """
+    target = make_eraser_input(5, 999, 'Targeted Receiver', 0, 0)
+
+    # Standing still 10 yards away at the throw
+    idle = make_eraser_input(5, 100, 'Defensive Coverage', 10, 10)
+    idle['y'] = 0.0
+
+    # Moving towards the target at 5 yds/s, also 10 yards away at the throw
+    runner_pre = make_eraser_input(2, 200, 'Defensive Coverage', 11, 10.5, phase='pre_throw')
+    runner_post = make_eraser_input(5, 200, 'Defensive Coverage', 10, 8)
+    runner_post['frame_id'] += 2
+
+    df = pd.concat([target, idle, runner_pre, runner_post])
+    df['ball_land_x'] = 0.0
+    df['ball_land_y'] = 20.0
+
+    engine = EraserEngine(max_speed=9.5, max_accel=7.0)
+    result = engine.calculate_eraser(df, pd.DataFrame())
+
+    idle_row = result[result['nfl_id'] == 100].iloc[0]
+    runner_row = result[result['nfl_id'] == 200].iloc[0]
+
+    # From rest: accelerate to 9.5 over 6.45 yds, cruise the remaining 3.55 yds
+    t_accel = 9.5 / 7.0
+    expected = t_accel + (10 - 0.5 * 7.0 * t_accel**2) / 9.5
+    assert np.isclose(idle_row['tti_target_path'], expected)
+
+    assert runner_row['tti_target_path'] < idle_row['tti_target_path']
+    assert idle_row['tti_ball_land'] > idle_row['tti_target_path']
+    assert np.isclose(idle_row['time_to_intercept'], idle_row['tti_target_path'])
@@ -0,0 +1,53 @@
+import os
+import pandas as pd
+import numpy as np
+from src.expectation_model import ExpectedClosingModel
+
+def make_report(n=600, seed=0):
+    """
+    Closing speed driven by start distance, so a context model should beat the cell mean.
+    """
+    rng = np.random.default_rng(seed)
+    p_dist = rng.uniform(0, 15, size=n)
+    return pd.DataFrame({
+        'player_position': rng.choice(['CB', 'FS', 'SS'], size=n),
+        'team_coverage_type': rng.choice(['COVER_2_ZONE', 'COVER_3_ZONE'], size=n),
+        'p_dist_at_throw': p_dist,
+        'pass_length': rng.integers(1, 40, size=n),
+        'down': rng.integers(1, 3, size=n),
+        'avg_closing_speed': 0.5 * p_dist + rng.normal(0, 0.5, size=n)
+    })
+
+def test_expected_model_fit_and_cache(tmp_path):
+    """
+    Same training data -> second fit is loaded from disk, predictions identical.
+    """
+    df = make_report()
+
+    first = ExpectedClosingModel(cache_dir=str(tmp_path)).fit(df)
+    assert not first.cache_hit
+    assert len(os.listdir(tmp_path)) == 1
+
+    second = ExpectedClosingModel(cache_dir=str(tmp_path)).fit(df)
+    assert second.cache_hit
+    assert np.allclose(first.predict(df), second.predict(df))
+
+    # Different data -> different key
+    third = ExpectedClosingModel(cache_dir=str(tmp_path)).fit(make_report(seed=1))
+    assert not third.cache_hit
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_expected_model_batched_predictions():
+    """
+    Batching must not change the predictions, and the model should explain the context.
+    """
+    df = make_report()
+
+    model = ExpectedClosingModel(batch_size=64).fit(df)
+    preds = model.predict(df)
+
+    model.batch_size = len(df)
+    assert np.allclose(preds, model.predict(df))
+
+    residual_std = np.std(df['avg_closing_speed'] - preds)
+    assert residual_std < df['avg_closing_speed'].std() / 2
@@ -0,0 +1,89 @@
+import os
+import json
+import glob
+import pandas as pd
+import pytest
+from src.synthetic_data import SyntheticDataGenerator
+from src.load_data import DataLoader
+from src.schema import RawTrackingSchema
+from src.orchestrator import run_full_pipeline
+from src.memory_planner import (MemoryPlanner, MemoryGuard, MemoryBudgetExceeded, parse_memory,
+                                schema_row_bytes, estimate_csv_rows, process_memory_mb, estimate_keep_fraction)
+from src.cohorts import parse_cohorts
+
+@pytest.fixture
+def synthetic(tmp_path):
+    return SyntheticDataGenerator(weeks=3, plays_per_week=40, players_per_play=9, seed=5).generate(str(tmp_path / 'raw'))
+
+def test_parse_memory():
+    assert parse_memory('16GB') == 16 * 1024
+    assert parse_memory('512m') == 512
+    assert parse_memory('2048') == 2048
+    assert parse_memory('') is None
+    assert parse_memory('auto') > 0
+    with pytest.raises(ValueError):
+        parse_memory('lots')
+
+def test_estimates_track_real_sizes(synthetic):
+    path = os.path.join(synthetic['data_dir'], 'input_2023_w01.csv')
+    df = RawTrackingSchema.validate(pd.read_csv(path))
+
+    assert estimate_csv_rows(path) == pytest.approx(len(df), rel=0.1)
+    actual = df.memory_usage(index=True, deep=True).sum() / len(df)
+    assert schema_row_bytes(RawTrackingSchema) == pytest.approx(actual, rel=0.3)
+
+def test_plan_spills_and_parallelises_by_budget(synthetic):
+    loader = DataLoader(synthetic['data_dir'], synthetic['supp_file'])
+    roomy = MemoryPlanner(10 ** 6, max_workers=8).plan(loader, keep_fraction=0.5)
+    assert roomy.mode == 'batch' and roomy.workers == 1 and roomy.fits
+    assert roomy.raw_rows > 0 and roomy.week_peak_mb < roomy.batch_peak_mb
+
+    # Between one week and the whole season: spill weeks to disk
+    budget = (roomy.week_peak_mb + roomy.batch_peak_mb) / 2
+    tight = MemoryPlanner(budget, max_workers=8).plan(loader, keep_fraction=0.5)
+    assert tight.mode == 'weekly' and tight.spill and tight.fits
+
+    # Room for two weeks side by side (heavy stages, so the season does not fit): two capped workers
+    heavy = MemoryPlanner(10 ** 6, working_set_factor=1000).plan(loader, keep_fraction=0.5)
+    wide = MemoryPlanner(heavy.base_mb + 2.5 * heavy.week_peak_mb, max_workers=8,
+                         working_set_factor=1000).plan(loader, keep_fraction=0.5)
+    assert wide.mode == 'weekly' and wide.workers == 2 and wide.fits
+    assert wide.worker_max_memory_mb > (wide.budget_mb - wide.base_mb) / 2
+
+    starved = MemoryPlanner(1, max_workers=8).plan(loader, keep_fraction=0.5)
+    assert starved.mode == 'weekly' and starved.workers == 1 and not starved.fits and starved.notes
+
+def test_guard_stops_run_over_budget():
+    rss, _ = process_memory_mb()
+    if rss is None:
+        pytest.skip("no /proc on this platform")
+
+    guard = MemoryGuard(budget_mb=rss * 10)
+    with guard.stage('fine'):
+        pass
+    assert guard.records()[0]['stage'] == 'fine'
+
+    with pytest.raises(MemoryBudgetExceeded):
+        with MemoryGuard(budget_mb=1).stage('too_big'):
+            pass
+
+    # Already weekly: the advice is about workers / narrowing, not the mode
+    with pytest.raises(MemoryBudgetExceeded) as err:
+        with MemoryGuard(budget_mb=1, mode='weekly', workers=3).stage('too_big'):
+            pass
+    assert '--mode weekly' not in str(err.value) and '3 workers' in str(err.value)
+
+def test_keep_fraction_follows_cohorts(synthetic):
+    supp = DataLoader(synthetic['data_dir'], synthetic['supp_file']).load_supplementary()
+    zone = estimate_keep_fraction(supp, parse_cohorts('zone'))
+    both = estimate_keep_fraction(supp, parse_cohorts('zone,man'))
+    assert 0 < zone < both <= 1
+
+def test_pipeline_with_budget_records_plan(synthetic, tmp_path):
+    out_dir = str(tmp_path / 'out')
+    run_full_pipeline(synthetic['data_dir'], synthetic['supp_file'], out_dir, use_cache=False, max_memory='64GB')
+
+    assert os.path.exists(os.path.join(out_dir, 'eraser_analysis_summary.csv'))
+    report = json.load(open(glob.glob(os.path.join(out_dir, 'telemetry', '*.json'))[0]))
+    assert report['memory']['plan']['mode'] == 'batch'
+    assert {s['stage'] for s in report['memory']['stages']} >= {'preprocess', 'physics', 'export'}
@@ -0,0 +1,42 @@
+import time
+import pytest
+from contextlib import nullcontext
+from src.profiling import StageProfiler, parse_profile_arg
+from src.telemetry import Telemetry
+
+def _busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(200))
+    return total
+
+def test_profiler_writes_collapsed_stacks_for_selected_stage(tmp_path):
+    profiler = StageProfiler({'physics'}, str(tmp_path), interval=0.001)
+    telemetry = Telemetry('unit', str(tmp_path), hooks=[profiler])
+
+    with telemetry.stage('physics'):
+        _busy_loop(0.2)
+    with telemetry.stage('eraser'):
+        _busy_loop(0.01)
+
+    assert set(profiler.outputs) == {'physics'}
+    lines = open(profiler.outputs['physics']['collapsed']).read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(' ', 1)
+    assert int(count) > 0
+    assert any('_busy_loop' in line for line in lines)
+    assert '_busy_loop' in open(profiler.outputs['physics']['top']).read()
+
+def test_profiler_disabled_is_nullcontext():
+    profiler = StageProfiler()
+    assert not profiler.enabled
+    assert isinstance(profiler.stage('physics'), nullcontext)
+
+def test_parse_profile_arg():
+    stages = ['preprocess', 'physics', 'eraser']
+    assert parse_profile_arg(['physics,eraser'], stages) == {'physics', 'eraser'}
+    assert parse_profile_arg(['all'], stages) == set(stages)
+    assert parse_profile_arg(None, stages) == set()
+    with pytest.raises(ValueError):
+        parse_profile_arg(['nope'], stages)
@@ -0,0 +1,118 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+from src.sampling import sample_plays, SamplingErrorEstimator
+from src.load_data import DataLoader
+from src.selection import RunSelection
+from src.synthetic_data import SyntheticDataGenerator
+from src.data_preprocessor import DataPreProcessor
+from src.cohorts import PRESETS
+from src.orchestrator import run_full_pipeline
+from tests.test_weekly_pipeline import write_raw_weeks
+
+def make_supp(n_per_stratum=20):
+    rows = []
+    for week in (1, 2):
+        for coverage in ('COVER_3_ZONE', 'COVER_2_ZONE'):
+            for i in range(n_per_stratum):
+                rows.append({'game_id': 2023090700 + week, 'play_id': len(rows) + 1,
+                             'week': week, 'team_coverage_type': coverage})
+    return pd.DataFrame(rows)
+
+def test_sample_plays_is_stratified_and_deterministic():
+    supp = make_supp()
+    sample = sample_plays(supp, 0.1, seed=7)
+
+    # ceil(0.1 * 20) = 2 plays per (week, coverage) stratum
+    assert sample.groupby(['week', 'team_coverage_type']).size().tolist() == [2, 2, 2, 2]
+
+    # Same seed -> same plays, whatever the row order; another seed -> another sample
+    shuffled = sample_plays(supp.sample(frac=1, random_state=0), 0.1, seed=7)
+    assert set(sample.play_id) == set(shuffled.play_id)
+    assert set(sample.play_id) != set(sample_plays(supp, 0.1, seed=8).play_id)
+
+def make_summary(n_plays=60, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for play in range(n_plays):
+        for k, position in enumerate(['CB', 'FS', 'SS']):
+            rows.append({'game_id': 1, 'play_id': play, 'nfl_id': float(k * 10 + play % 5),
+                         'player_name': f'P{k}{play % 5}', 'player_position': position,
+                         'week': 1 + play % 2, 'team_coverage_type': 'COVER_3_ZONE',
+                         'void_type': 'High Void' if play % 3 else 'Neutral',
+                         'avg_closing_speed': rng.normal(10 + k, 2)})
+    return pd.DataFrame(rows)
+
+def test_sampling_error_intervals():
+    summary = make_summary()
+    results = SamplingErrorEstimator(summary, frac=0.1, n_boot=300, seed=1, min_snaps=5).run()
+
+    baselines = results['baselines']
+    assert len(baselines) == 6
+    assert (baselines['baseline_lo'] <= baselines['baseline_mean']).all()
+    assert (baselines['baseline_mean'] <= baselines['baseline_hi']).all()
+    assert (baselines['baseline_se'] > 0).all()
+
+    leaderboard = results['leaderboard']
+    assert len(leaderboard) == 15
+    assert (leaderboard['rank_lo'] <= leaderboard['rank']).all()
+    assert (leaderboard['rank'] <= leaderboard['rank_hi']).all()
+
+    # A "sample" of the whole season carries no sampling error
+    full = SamplingErrorEstimator(summary, frac=1.0, n_boot=50).run()
+    assert np.allclose(full['baselines']['baseline_se'], 0)
+
+def test_sampling_error_with_missing_keys():
+    """
+    Rows with no position / void_type join no baseline cell and rows with no nfl_id no
+    player, instead of landing in the last cell (ngroup() == -1).
+    """
+    summary = make_summary()
+    summary.loc[[0, 3, 6], 'player_position'] = None
+    summary.loc[9, 'void_type'] = None
+    summary.loc[12, 'nfl_id'] = np.nan
+    results = SamplingErrorEstimator(summary, frac=0.1, n_boot=100, seed=1, min_snaps=5).run()
+
+    baselines = results['baselines']
+    assert len(baselines) == 6 and baselines['player_position'].notna().all()
+    assert baselines['n_rows'].sum() == len(summary) - 4
+    complete = summary.dropna(subset=['player_position', 'void_type'])
+    expected = complete.groupby(['player_position', 'void_type'])['avg_closing_speed'].mean().values
+    assert np.allclose(baselines['baseline_mean'], expected)
+    assert results['leaderboard']['nfl_id'].notna().all()
+
+def test_loader_reads_only_sampled_plays(tmp_path):
+    data_dir, supp_file = write_raw_weeks(str(tmp_path), weeks=(1, 2), plays_per_week=4)
+    loader = DataLoader(data_dir, supp_file, selection=RunSelection(sample_frac=0.5, sample_seed=3))
+
+    supp = loader.load_supplementary()
+    assert supp.groupby('week').size().tolist() == [2, 2]
+
+    input_df, _ = loader.load_week('01')
+    assert set(zip(input_df.game_id, input_df.play_id)) == set(zip(supp.game_id, supp.play_id)) & \
+        set(zip(input_df.game_id, input_df.play_id))
+    assert input_df.play_id.nunique() == 2
+
+def test_sampled_non_default_cohort(tmp_path):
+    """
+    The sample is drawn within the run's cohort, and the FPC uses that cohort's population.
+    """
+    paths = SyntheticDataGenerator(weeks=2, plays_per_week=40, players_per_play=7, seed=11).generate(str(tmp_path / 'raw'))
+    man = [PRESETS['man']]
+    selection = RunSelection(sample_frac=0.5, sample_seed=3)
+    loader = DataLoader(paths['data_dir'], paths['supp_file'], selection=selection, cohorts=man)
+
+    population = DataPreProcessor().filter_context(DataLoader(paths['data_dir'], paths['supp_file'])
+                                                   .load_supplementary(), cohorts=man)
+    sampled = DataPreProcessor().filter_context(loader.load_supplementary(), cohorts=man)
+    assert 0 < len(sampled) < len(population)
+    assert loader.sample_fraction() == len(sampled) / len(population) >= 0.5
+
+    out_dir = str(tmp_path / 'out')
+    run_full_pipeline(paths['data_dir'], paths['supp_file'], out_dir, use_cache=False, cohorts='man',
+                      selection=selection)
+    run_dir = glob.glob(os.path.join(out_dir, 'subsets', '*'))[0]
+    summary = pd.read_csv(os.path.join(run_dir, 'eraser_analysis_summary.csv'))
+    assert len(summary) and len(summary.merge(sampled[['game_id', 'play_id']])) == len(summary)
+    assert os.path.exists(os.path.join(run_dir, 'sampling_error_baselines.csv'))
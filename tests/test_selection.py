@@ -0,0 +1,46 @@
+import os
+import pandas as pd
+from src.load_data import DataLoader
+from src.orchestrator import run_full_pipeline
+from src.selection import RunSelection
+from tests.test_weekly_pipeline import write_raw_weeks
+
+def test_selection_parsing_and_scope():
+    selection = RunSelection.from_args(weeks='1-3,5', plays='2023090701:51,52', coverage='COVER_3_ZONE')
+
+    assert selection.weeks == [1, 2, 3, 5]
+    assert selection.plays == [(2023090701, 51), (None, 52)]
+    assert selection.needs_play_keys
+    assert selection.scope_name() == 'w01-05_p2023090701_51-52_cCOVER_3_ZONE'
+    assert RunSelection.from_args().is_empty
+
+def test_loader_reads_only_selected_weeks_and_plays(tmp_path):
+    data_dir, supp_file = write_raw_weeks(str(tmp_path), weeks=(1, 2, 3), plays_per_week=3)
+
+    loader = DataLoader(data_dir, supp_file, selection=RunSelection(plays=[(2023090702, 52)]))
+    assert loader.week_numbers() == ['02']
+
+    input_df, output_df = loader.load_week('02')
+    assert set(zip(input_df.game_id, input_df.play_id)) == {(2023090702, 52)}
+    assert set(output_df.play_id) == {52}
+    assert len(loader.load_supplementary()) == 1
+
+    assert DataLoader(data_dir, supp_file, selection=RunSelection(weeks=[1, 3])).week_numbers() == ['01', '03']
+
+def test_single_play_run_writes_scoped_output(tmp_path):
+    data_dir, supp_file = write_raw_weeks(str(tmp_path / 'raw'), weeks=(1, 2))
+    out_dir = str(tmp_path / 'out')
+
+    run_full_pipeline(data_dir, supp_file, out_dir, use_cache=False)
+    run_full_pipeline(data_dir, supp_file, out_dir, use_cache=False,
+                      selection=RunSelection(plays=[(2023090702, 51)]))
+
+    full = pd.read_csv(os.path.join(out_dir, 'eraser_analysis_summary.csv'))
+    subset = pd.read_csv(os.path.join(out_dir, 'subsets', 'p2023090702_51', 'eraser_analysis_summary.csv'))
+
+    assert set(zip(subset.game_id, subset.play_id)) == {(2023090702, 51)}
+    # Per-play metrics are unchanged; the full-season artifacts are left alone
+    expected = full[(full.game_id == 2023090702) & (full.play_id == 51)]
+    pd.testing.assert_series_equal(subset['vis_score'].reset_index(drop=True),
+                                   expected['vis_score'].reset_index(drop=True))
+    assert full.play_id.nunique() == 2 and full.game_id.nunique() == 2
@@ -0,0 +1,92 @@
+import os
+import pandas as pd
+import numpy as np
+from src.stage_cache import StageCache, CachedTables
+from src.orchestrator import expand_forced_stages, run_full_pipeline
+from src.synthetic_data import SyntheticDataGenerator
+from src.physics_engine import PhysicsEngine
+from src.context_engine import ContextEngine
+
+def test_stage_cache_hit_and_miss(tmp_path):
+    """
+    Second run with the same key loads from disk instead of rebuilding.
+    """
+    cache = StageCache(str(tmp_path))
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {'frames': pd.DataFrame({'x': np.arange(3.0), 'role': ['a', None, 'c']})}
+
+    key = cache.key('physics', PhysicsEngine, 'upstream-key')
+    first = cache.run('physics', key, build)
+    second = cache.run('physics', key, build)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first['frames'], second['frames'])
+
+    # Forced stages always rebuild
+    forced = StageCache(str(tmp_path), force={'physics'})
+    forced.run('physics', key, build)
+    assert len(calls) == 2
+
+def test_stage_cache_key_chain():
+    """
+    Keys depend on code, config and upstream keys; a changed upstream ripples down.
+    """
+    cache = StageCache('unused')
+
+    phys_a = cache.key('physics', PhysicsEngine, 'raw-a')
+    phys_b = cache.key('physics', PhysicsEngine, 'raw-b')
+    assert phys_a != phys_b
+    assert phys_a == cache.key('physics', PhysicsEngine, 'raw-a')
+
+    assert cache.key('context', ContextEngine, phys_a) != cache.key('context', ContextEngine, phys_b)
+    assert cache.key('physics', PhysicsEngine, 'raw-a', config={'window': 7}) != phys_a
+
+def test_force_stage_expands_downstream():
+    assert expand_forced_stages(['benchmarking']) == {'benchmarking', 'export'}
+    assert expand_forced_stages(['context']) == {'context', 'eraser', 'benchmarking', 'export'}
+    assert expand_forced_stages(['all']) == set(expand_forced_stages(['preprocess']))
+    assert expand_forced_stages(None) == set()
+
+def test_stage_keys_cover_extra_modules_and_superseded_entries_are_evicted(tmp_path):
+    cache = StageCache(str(tmp_path))
+    assert cache.key('physics', PhysicsEngine, 'raw') != \
+        cache.key('physics', PhysicsEngine, 'raw', modules=('src.expectation_model',))
+
+    build = lambda: {'frames': pd.DataFrame({'x': [1.0]})}
+    old = cache.key('physics', PhysicsEngine, 'raw-a')
+    new = cache.key('physics', PhysicsEngine, 'raw-b')
+    cache.run('physics', old, build)
+    cache.run('physics', new, build)
+    assert os.listdir(os.path.join(str(tmp_path), 'physics')) == [new]
+
+    roomy = StageCache(str(tmp_path), keep_per_stage=2)
+    roomy.run('physics', old, build)
+    assert sorted(os.listdir(os.path.join(str(tmp_path), 'physics'))) == sorted([old, new])
+
+def test_cached_rerun_skips_frames_until_outputs_go_missing(tmp_path, monkeypatch):
+    paths = SyntheticDataGenerator(weeks=2, plays_per_week=10, players_per_play=7, seed=4).generate(str(tmp_path / 'raw'))
+    out_dir = str(tmp_path / 'out')
+    run_full_pipeline(paths['data_dir'], paths['supp_file'], out_dir)
+
+    loaded = []
+    original = CachedTables.__getitem__
+
+    def recording(self, name):
+        loaded.append((os.path.basename(os.path.dirname(self.stage_dir)), name))
+        return original(self, name)
+
+    monkeypatch.setattr(CachedTables, '__getitem__', recording)
+    run_full_pipeline(paths['data_dir'], paths['supp_file'], out_dir)
+    assert ('physics', 'frames') not in loaded and ('preprocess', 'frames') not in loaded
+
+    # Deleted outputs are rewritten even though the export key matches
+    # and the cached physics frames are streamed week by week, never loaded whole
+    animation = os.path.join(out_dir, 'master_animation_data.csv')
+    expected = pd.read_csv(animation)
+    os.remove(animation)
+    run_full_pipeline(paths['data_dir'], paths['supp_file'], out_dir)
+    pd.testing.assert_frame_equal(pd.read_csv(animation), expected)
+    assert ('physics', 'frames') not in loaded
@@ -0,0 +1,52 @@
+import os
+import pandas as pd
+from src.synthetic_data import SyntheticDataGenerator
+from src.schema import RawTrackingSchema, OutputTrackingSchema, RawSuppSchema
+from src.orchestrator import run_full_pipeline
+
+def test_generated_files_are_schema_valid_and_consistent(tmp_path):
+    generator = SyntheticDataGenerator(weeks=2, plays_per_week=30, players_per_play=9, seed=1, chunk_plays=7)
+    paths = generator.generate(str(tmp_path))
+
+    supp = RawSuppSchema.validate(pd.read_csv(paths['supp_file']))
+    assert len(supp) == 60
+    assert not supp.duplicated(['game_id', 'play_id']).any()
+
+    raw_inputs = pd.read_csv(os.path.join(paths['data_dir'], 'input_2023_w01.csv'))
+    outputs = pd.read_csv(os.path.join(paths['data_dir'], 'output_2023_w01.csv'))
+    inputs = RawTrackingSchema.validate(raw_inputs.copy())
+    OutputTrackingSchema.validate(outputs.copy())
+
+    # 9 players on every play, one passer and one target
+    per_play = raw_inputs.groupby(['game_id', 'play_id'])
+    assert (per_play['nfl_id'].nunique() == 9).all()
+    assert (raw_inputs.drop_duplicates(['game_id', 'play_id', 'nfl_id'])
+            .groupby(['game_id', 'play_id'])['player_role'].apply(lambda r: (r == 'Targeted Receiver').sum()) == 1).all()
+
+    # Output frames exist exactly for the players to predict, up to num_frames_output
+    predicted = raw_inputs[raw_inputs['player_to_predict']].groupby(['game_id', 'play_id', 'nfl_id'])['num_frames_output'].first()
+    last_frame = outputs.groupby(['game_id', 'play_id', 'nfl_id'])['frame_id'].max()
+    pd.testing.assert_series_equal(predicted.sort_index(), last_frame.sort_index(), check_names=False)
+    assert inputs['x'].between(0, 120).all() and inputs['y'].between(0, 53.3).all()
+
+def test_generation_is_deterministic_per_seed(tmp_path):
+    a = SyntheticDataGenerator(weeks=1, plays_per_week=10, seed=5).generate(str(tmp_path / 'a'))
+    b = SyntheticDataGenerator(weeks=1, plays_per_week=10, seed=5, chunk_plays=3).generate(str(tmp_path / 'b'))
+    c = SyntheticDataGenerator(weeks=1, plays_per_week=10, seed=6).generate(str(tmp_path / 'c'))
+
+    def read(paths):
+        return open(os.path.join(paths['data_dir'], 'output_2023_w01.csv')).read()
+
+    assert open(a['supp_file']).read() == open(b['supp_file']).read()
+    assert read(a) != read(c)
+
+def test_pipeline_runs_on_generated_season(tmp_path):
+    paths = SyntheticDataGenerator(weeks=2, plays_per_week=40, seed=3).generate(str(tmp_path / 'raw'))
+    output_dir = str(tmp_path / 'out')
+
+    run_full_pipeline(paths['data_dir'], paths['supp_file'], output_dir, use_cache=False, mode='weekly')
+
+    summary = pd.read_csv(os.path.join(output_dir, 'eraser_analysis_summary.csv'))
+    assert not summary.empty
+    assert summary['void_type'].nunique() > 1
+    assert summary['avg_closing_speed'].notna().any()
@@ -0,0 +1,51 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src.telemetry import Telemetry
+
+def test_telemetry_records_stages_and_writes_report(tmp_path):
+    telemetry = Telemetry('unit', str(tmp_path), trace_memory=True)
+
+    df_in = pd.DataFrame({'game_id': [1, 1, 2], 'play_id': [10, 10, 20], 'x': np.arange(3.0)})
+    with telemetry.stage('physics') as st:
+        st.inputs(df_in)
+        df_out = pd.DataFrame({'x': np.ones(1000)})
+        st.outputs(df_out)
+        st.groups = 2
+
+    with pytest.raises(ValueError):
+        with telemetry.stage('broken'):
+            raise ValueError("boom")
+
+    path = telemetry.write()
+    with open(path) as f:
+        report = json.load(f)
+
+    physics, broken = report['stages']
+    assert physics['name'] == 'physics' and physics['status'] == 'ok'
+    assert physics['rows_in'] == 3 and physics['rows_out'] == 1000
+    assert physics['bytes_out'] >= 8000
+    assert physics['groups'] == 2
+    assert physics['wall_s'] >= 0 and physics['tracemalloc_peak_mb'] is not None
+    assert broken['status'] == 'failed'
+    assert 'physics' in telemetry.summary_table()
+
+def test_memory_tracing_is_opt_in(tmp_path):
+    telemetry = Telemetry('unit', str(tmp_path))
+    names = pd.DataFrame({'name': ['a' * 200] * 100})
+    with telemetry.stage('load') as st:
+        st.outputs(names)
+
+    record = telemetry.stages[0]
+    assert record.tracemalloc_peak_mb is None
+    # Shallow sizes: object columns count at pointer size, not by their strings
+    assert record.bytes_out < names.memory_usage(index=True, deep=True).sum()
+
+def test_telemetry_disabled_is_noop(tmp_path):
+    telemetry = Telemetry('unit', str(tmp_path), enabled=False)
+    with telemetry.stage('physics') as st:
+        st.outputs(pd.DataFrame({'x': [1.0]}))
+
+    assert telemetry.stages == []
+    assert telemetry.write() is None
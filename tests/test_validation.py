@@ -0,0 +1,72 @@
+import os
+import pandas as pd
+import pytest
+from src.synthetic_data import SyntheticDataGenerator
+from src.load_data import DataLoader
+from src.data_preprocessor import DataPreProcessor
+from src.physics_engine import PhysicsEngine
+from src.orchestrator import run_full_pipeline
+from src.schema import RawTrackingSchema, PreprocessedSchema, PhysicsSchema
+from src.validation import ValidationPolicy, conform, configure_validation, validate
+
+@pytest.fixture(autouse=True)
+def reset_policy():
+    yield
+    configure_validation('full')
+
+@pytest.fixture
+def synthetic(tmp_path):
+    return SyntheticDataGenerator(weeks=2, plays_per_week=12, players_per_play=7, seed=3).generate(str(tmp_path / 'raw'))
+
+def test_conform_matches_full_validation(synthetic):
+    """
+    Skipping the checks still drops / casts exactly what validate() would.
+    """
+    raw = pd.read_csv(os.path.join(synthetic['data_dir'], 'input_2023_w01.csv'))
+    raw['not_in_schema'] = 1
+    pd.testing.assert_frame_equal(conform(RawTrackingSchema, raw), RawTrackingSchema.validate(raw))
+
+    loader = DataLoader(synthetic['data_dir'], synthetic['supp_file'])
+    frames = DataPreProcessor().run(loader.stream_weeks(), loader.load_supplementary())
+    pd.testing.assert_frame_equal(conform(PreprocessedSchema, frames), PreprocessedSchema.validate(frames))
+
+    physics = PhysicsEngine().derive_metrics(frames)
+    pd.testing.assert_frame_equal(conform(PhysicsSchema, physics), PhysicsSchema.validate(physics))
+
+def test_levels_route_checks_and_record_time(synthetic):
+    raw = pd.read_csv(os.path.join(synthetic['data_dir'], 'input_2023_w01.csv'))
+
+    policy = configure_validation('boundary')
+    with policy.stage('load'):
+        validate(RawTrackingSchema, raw, boundary=True)
+        validate(RawTrackingSchema, raw)
+    modes = {r['mode']: r for r in policy.records()}
+    assert set(modes) == {'full', 'conform'}
+    assert modes['full']['stage'] == 'load' and modes['full']['rows'] == len(raw)
+    assert policy.seconds > 0
+
+    sampled = ValidationPolicy('sample', sample_rows=10)
+    sampled.validate(RawTrackingSchema, raw)
+    sampled.validate(RawTrackingSchema, raw.head(5))
+    assert sorted(r['mode'] for r in sampled.records()) == ['full', 'sample']
+
+    # Off never raises on bad values, full does
+    bad = raw.assign(x=-500.0)
+    ValidationPolicy('off').validate(RawTrackingSchema, bad)
+    with pytest.raises(Exception):
+        ValidationPolicy('full').validate(RawTrackingSchema, bad)
+
+    with pytest.raises(ValueError):
+        ValidationPolicy('sometimes')
+
+def test_pipeline_outputs_identical_across_levels(synthetic, tmp_path):
+    outputs = {}
+    for level in ['full', 'off', 'sample']:
+        out_dir = str(tmp_path / level)
+        run_full_pipeline(synthetic['data_dir'], synthetic['supp_file'], out_dir, use_cache=False, validation=level)
+        outputs[level] = {name: pd.read_csv(os.path.join(out_dir, name))
+                          for name in ['eraser_analysis_summary.csv', 'master_animation_data.csv']}
+
+    for level in ['off', 'sample']:
+        for name, df in outputs['full'].items():
+            pd.testing.assert_frame_equal(df, outputs[level][name])
@@ -0,0 +1,39 @@
+import os
+import threading
+import time
+from src.watcher import DirectoryWatcher, watch
+
+def test_watcher_waits_for_new_files_to_settle(tmp_path):
+    data_dir = tmp_path / 'train'
+    data_dir.mkdir()
+    supp = tmp_path / 'supplementary_data.csv'
+    supp.write_text('game_id,play_id\n')
+    (data_dir / 'input_2023_w01.csv').write_text('a\n1\n')
+    (data_dir / 'notes.txt').write_text('ignored')
+
+    watcher = DirectoryWatcher(str(data_dir), str(supp), poll_seconds=0.02, settle_polls=2)
+    before = watcher.snapshot()
+    assert set(before) == {str(data_dir / 'input_2023_w01.csv'), str(supp)}
+    assert watcher.wait_for_change(before, timeout=0.2) is None
+
+    def arrive():
+        time.sleep(0.05)
+        (data_dir / 'input_2023_w02.csv').write_text('a\n1\n')
+    threading.Thread(target=arrive).start()
+    after = watcher.wait_for_change(before, timeout=5)
+    assert after is not None and str(data_dir / 'input_2023_w02.csv') in after
+
+def test_watch_keeps_going_after_a_failed_run(tmp_path):
+    calls = []
+
+    def run():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("bad week file")
+
+    class Instant(DirectoryWatcher):
+        def wait_for_change(self, previous, timeout=None):
+            return previous
+
+    assert watch(run, Instant(str(tmp_path), None), max_runs=3) == 3
+    assert len(calls) == 3
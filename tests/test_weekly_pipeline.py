@@ -0,0 +1,239 @@
+import os
+import glob
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from src.orchestrator import run_full_pipeline
+from src.config import DataPipelineConfig
+from src.data_exporter import DataExporter
+from src.load_data import DataLoader
+from src.weekly_pipeline import WeeklyPipeline, ParallelWeekExecutor
+
+def write_raw_weeks(root, weeks=(1, 2), plays_per_week=2, seed=0):
+    """
+    Minimal raw BDB layout (train/input_*, train/output_*, supplementary_data.csv)
+    whose plays all pass DataPreProcessor.filter_context.
+    """
+    rng = np.random.default_rng(seed)
+    train = os.path.join(root, 'train')
+    os.makedirs(train, exist_ok=True)
+    roles = [('Passer', 'QB', 'Offense'), ('Targeted Receiver', 'WR', 'Offense'),
+             ('Defensive Coverage', 'CB', 'Defense'), ('Defensive Coverage', 'FS', 'Defense'),
+             ('Defensive Coverage', 'SS', 'Defense')]
+    supp_rows = []
+    for w in weeks:
+        inp, out = [], []
+        game_id = 2023090700 + w
+        for p in range(1, plays_per_week + 1):
+            play_id = 50 + p
+            land_x, land_y = 60 + rng.uniform(0, 10), 20 + rng.uniform(0, 10)
+            for i, (role, pos, side) in enumerate(roles):
+                nfl_id = 40000 + i + 10 * p
+                x0, y0 = 40 + rng.uniform(0, 20), 10 + rng.uniform(0, 30)
+                for f in range(1, 11):
+                    inp.append(dict(
+                        game_id=game_id, play_id=play_id, player_to_predict=True, nfl_id=nfl_id,
+                        frame_id=f, play_direction='right', absolute_yardline_number=40,
+                        player_name=f'P{nfl_id}', player_height='6-0', player_weight=200,
+                        player_birth_date='1995-01-01', player_position=pos, player_side=side,
+                        player_role=role, x=x0 + 0.3 * f, y=y0, s=3.0, a=0.5, dir=90.0, o=90.0,
+                        num_frames_output=8, ball_land_x=land_x, ball_land_y=land_y))
+                if role == 'Passer':
+                    continue
+                for f in range(1, 9):
+                    t = 0.8 * f / 8
+                    out.append(dict(game_id=game_id, play_id=play_id, nfl_id=nfl_id, frame_id=f,
+                                    x=x0 + 3 + (land_x - x0 - 3) * t, y=y0 + (land_y - y0) * t))
+            supp_rows.append(dict(
+                game_id=game_id, season=2023, week=w, game_date='09/07/2023', game_time_eastern='20:20:00',
+                home_team_abbr='KC', visitor_team_abbr='DET', play_id=play_id, play_description='pass',
+                quarter=1, game_clock='10:00', down=1, yards_to_go=10, possession_team='KC',
+                defensive_team='DET', yardline_side='KC', yardline_number=40, pre_snap_home_score=0,
+                pre_snap_visitor_score=0, play_nullified_by_penalty='N', pass_result='C', pass_length=15,
+                offense_formation='SHOTGUN', receiver_alignment='2x2', route_of_targeted_receiver='GO',
+                play_action=False, dropback_type='TRADITIONAL', dropback_distance=5.0,
+                pass_location_type='INSIDE_BOX', defenders_in_the_box=6,
+                team_coverage_man_zone='ZONE_COVERAGE', team_coverage_type='COVER_3_ZONE',
+                penalty_yards=None, pre_penalty_yards_gained=12, yards_gained=12, expected_points=1.0,
+                expected_points_added=0.5, pre_snap_home_team_win_probability=0.5,
+                pre_snap_visitor_team_win_probability=0.5, home_team_win_probability_added=0.01,
+                visitor_team_win_probility_added=-0.01))
+        pd.DataFrame(inp).to_csv(os.path.join(train, f'input_2023_w{w:02d}.csv'), index=False)
+        pd.DataFrame(out).to_csv(os.path.join(train, f'output_2023_w{w:02d}.csv'), index=False)
+    pd.DataFrame(supp_rows).to_csv(os.path.join(root, 'supplementary_data.csv'), index=False)
+    return train, os.path.join(root, 'supplementary_data.csv')
+
+def test_weekly_mode_matches_batch(tmp_path):
+    """
+    Streaming week by week gives the same summary and animation export as the batch run.
+    """
+    data_dir, supp_file = write_raw_weeks(str(tmp_path / 'raw'))
+    batch_dir, weekly_dir = str(tmp_path / 'batch'), str(tmp_path / 'weekly')
+
+    run_full_pipeline(data_dir, supp_file, batch_dir, use_cache=False, mode='batch')
+    run_full_pipeline(data_dir, supp_file, weekly_dir, use_cache=False, mode='weekly')
+
+    for name in ['eraser_analysis_summary.csv', 'master_animation_data.csv']:
+        batch = pd.read_csv(os.path.join(batch_dir, name))
+        weekly = pd.read_csv(os.path.join(weekly_dir, name))
+        pd.testing.assert_frame_equal(batch, weekly, check_exact=False)
+
+    # One spill directory per week with the per-week partials
+    pipeline = WeeklyPipeline(os.path.join(weekly_dir, 'weekly'))
+    assert pipeline.completed_weeks() == [1, 2]
+    partials = pipeline.load_week(1, 'partials')
+    assert {'speed_count', 'speed_sum', 'speed_sum_sq'}.issubset(partials.columns)
+
+def test_parallel_weeks_collect_in_week_order(tmp_path):
+    """
+    Worker processes finish in any order; results and outputs come back in week order.
+    """
+    data_dir, supp_file = write_raw_weeks(str(tmp_path / 'raw'), weeks=(1, 2, 3))
+    loader = DataLoader(data_dir, supp_file)
+
+    serial = WeeklyPipeline(str(tmp_path / 'serial'))
+    parallel = WeeklyPipeline(str(tmp_path / 'parallel'))
+    clean_context = serial.processor.filter_context(loader.load_supplementary())
+
+    serial_stats = ParallelWeekExecutor(serial, workers=1).run(loader, clean_context)
+    parallel_stats = ParallelWeekExecutor(parallel, workers=2, max_memory_mb=4096).run(loader, clean_context)
+
+    assert [s['week'] for s in parallel_stats] == [1, 2, 3]
+    assert [s['plays'] for s in parallel_stats] == [s['plays'] for s in serial_stats]
+
+    pd.testing.assert_frame_equal(serial.reduce()['summary'], parallel.reduce()['summary'])
+    for df_serial, df_parallel in zip(serial.iter_frames(), parallel.iter_frames()):
+        pd.testing.assert_frame_equal(df_serial, df_parallel)
+
+def test_resume_after_crash_is_byte_identical(tmp_path, monkeypatch):
+    """
+    A run that dies in week 3 resumes there: weeks 1-2 are reused from their checkpoints and
+    the final outputs match an uninterrupted run byte for byte.
+    """
+    data_dir, supp_file = write_raw_weeks(str(tmp_path / 'raw'), weeks=(1, 2, 3))
+    clean_dir, crash_dir = str(tmp_path / 'clean'), str(tmp_path / 'crash')
+    run_full_pipeline(data_dir, supp_file, clean_dir, use_cache=False, mode='weekly')
+
+    original = WeeklyPipeline.process_week
+    processed = []
+
+    def crash_in_week_3(self, week_num, *args, **kwargs):
+        if int(week_num) == 3:
+            raise MemoryError("simulated OOM in week 3")
+        processed.append(int(week_num))
+        return original(self, week_num, *args, **kwargs)
+
+    monkeypatch.setattr(WeeklyPipeline, 'process_week', crash_in_week_3)
+    with pytest.raises(MemoryError):
+        run_full_pipeline(data_dir, supp_file, crash_dir, use_cache=False, mode='weekly')
+    manifest = WeeklyPipeline(os.path.join(crash_dir, 'weekly')).manifest()
+    assert [manifest['weeks'][w]['status'] for w in ('1', '2', '3')] == ['done', 'done', 'pending']
+
+    def counting(self, week_num, *args, **kwargs):
+        processed.append(int(week_num))
+        return original(self, week_num, *args, **kwargs)
+
+    processed.clear()
+    monkeypatch.setattr(WeeklyPipeline, 'process_week', counting)
+    run_full_pipeline(data_dir, supp_file, crash_dir, use_cache=False, mode='weekly', resume=True)
+    assert processed == [3]
+
+    for name in ['eraser_analysis_summary.csv', 'master_animation_data.csv']:
+        with open(os.path.join(clean_dir, name), 'rb') as a, open(os.path.join(crash_dir, name), 'rb') as b:
+            assert a.read() == b.read()
+    manifest = WeeklyPipeline(os.path.join(crash_dir, 'weekly')).manifest()
+    assert manifest['resumed'] and all(w['status'] == 'done' for w in manifest['weeks'].values())
+
+def test_resume_redoes_weeks_whose_inputs_changed(tmp_path):
+    data_dir, supp_file = write_raw_weeks(str(tmp_path / 'raw'), weeks=(1, 2))
+    loader = DataLoader(data_dir, supp_file)
+    pipeline = WeeklyPipeline(str(tmp_path / 'work'))
+    clean_context = pipeline.processor.filter_context(loader.load_supplementary())
+    keys = pipeline.compute_week_keys(loader, clean_context)
+    pipeline.start_run(keys)
+    ParallelWeekExecutor(pipeline).run(loader, clean_context)
+    assert pipeline.start_run(keys, resume=True) == [1, 2]
+
+    # A touched week file changes only that week's key
+    path = loader.input_map['02']
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    new_keys = pipeline.compute_week_keys(DataLoader(data_dir, supp_file), clean_context)
+    assert new_keys[1] == keys[1] and new_keys[2] != keys[2]
+    assert pipeline.start_run(new_keys, resume=True) == [1]
+    assert pipeline.completed_weeks() == [1]
+
+def stage_weeks(src_root, dst_root, weeks):
+    """
+    Copies the given weeks' raw files (mtimes kept) plus their supplementary rows into dst_root,
+    like a season whose later weeks have not arrived yet.
+    """
+    train = os.path.join(dst_root, 'train')
+    os.makedirs(train, exist_ok=True)
+    for w in weeks:
+        for kind in ('input', 'output'):
+            name = f'{kind}_2023_w{w:02d}.csv'
+            if not os.path.exists(os.path.join(train, name)):
+                shutil.copy2(os.path.join(src_root, 'train', name), os.path.join(train, name))
+    supp = pd.read_csv(os.path.join(src_root, 'supplementary_data.csv'))
+    supp[supp['week'].isin(weeks)].to_csv(os.path.join(dst_root, 'supplementary_data.csv'), index=False)
+    return train, os.path.join(dst_root, 'supplementary_data.csv')
+
+def test_incremental_processes_only_new_weeks(tmp_path, monkeypatch):
+    full_dir, full_supp = write_raw_weeks(str(tmp_path / 'raw'), weeks=(1, 2, 3))
+    fresh_dir, live_dir = str(tmp_path / 'fresh'), str(tmp_path / 'live')
+    run_full_pipeline(full_dir, full_supp, fresh_dir, use_cache=False, mode='weekly')
+
+    original = WeeklyPipeline.process_week
+    processed = []
+
+    def counting(self, week_num, *args, **kwargs):
+        processed.append(int(week_num))
+        return original(self, week_num, *args, **kwargs)
+
+    monkeypatch.setattr(WeeklyPipeline, 'process_week', counting)
+    data_dir, supp_file = stage_weeks(str(tmp_path / 'raw'), str(tmp_path / 'incoming'), (1, 2))
+    run_full_pipeline(data_dir, supp_file, live_dir, use_cache=False, mode='incremental')
+    assert processed == [1, 2]
+
+    # Week 3 lands: only it is processed, and the outputs match a run over the whole season
+    processed.clear()
+    stage_weeks(str(tmp_path / 'raw'), str(tmp_path / 'incoming'), (1, 2, 3))
+    run_full_pipeline(data_dir, supp_file, live_dir, use_cache=False, mode='incremental')
+    assert processed == [3]
+    for name in ['eraser_analysis_summary.csv', 'master_animation_data.csv']:
+        with open(os.path.join(fresh_dir, name), 'rb') as a, open(os.path.join(live_dir, name), 'rb') as b:
+            assert a.read() == b.read()
+    assert os.path.exists(os.path.join(live_dir, 'ceoe_leaderboard.csv'))
+
+    processed.clear()
+    summary_mtime = os.stat(os.path.join(live_dir, 'eraser_analysis_summary.csv')).st_mtime_ns
+    run_full_pipeline(data_dir, supp_file, live_dir, use_cache=False, mode='incremental')
+    assert processed == []
+    assert os.stat(os.path.join(live_dir, 'eraser_analysis_summary.csv')).st_mtime_ns == summary_mtime
+
+def test_incremental_star_export_keeps_unchanged_frame_partitions(tmp_path, monkeypatch):
+    class StarConfig(DataPipelineConfig):
+        EXPORT_FORMAT: str = 'parquet'
+        EXPORT_LAYOUT: str = 'star'
+
+    monkeypatch.setattr('src.orchestrator.DataPipelineConfig', StarConfig)
+    write_raw_weeks(str(tmp_path / 'raw'), weeks=(1, 2))
+    data_dir, supp_file = stage_weeks(str(tmp_path / 'raw'), str(tmp_path / 'incoming'), (1,))
+    out_dir = str(tmp_path / 'out')
+    run_full_pipeline(data_dir, supp_file, out_dir, use_cache=False, mode='incremental')
+
+    frames_dir = os.path.join(out_dir, DataExporter.STAR_DIR, 'frames.parquet')
+    week_1 = {p: os.stat(p).st_mtime_ns for p in glob.glob(os.path.join(frames_dir, 'week=1', '*'))}
+    assert week_1
+
+    stage_weeks(str(tmp_path / 'raw'), str(tmp_path / 'incoming'), (1, 2))
+    run_full_pipeline(data_dir, supp_file, out_dir, use_cache=False, mode='incremental')
+    assert {p: os.stat(p).st_mtime_ns for p in glob.glob(os.path.join(frames_dir, 'week=1', '*'))} == week_1
+
+    fresh_dir = str(tmp_path / 'fresh')
+    run_full_pipeline(data_dir, supp_file, fresh_dir, use_cache=False, mode='weekly')
+    keys = ['game_id', 'play_id', 'nfl_id', 'frame_id']
+    read = lambda root: pd.read_parquet(os.path.join(root, DataExporter.STAR_DIR, 'frames.parquet')) \
+        .sort_values(keys).reset_index(drop=True)
+    pd.testing.assert_frame_equal(read(out_dir), read(fresh_dir))
@@ -0,0 +1,113 @@
+import os
+import time
+import multiprocessing
+import pandas as pd
+import pytest
+from src.config import DataPipelineConfig
+from src.data_exporter import DataExporter
+from src.eraser_engine import EraserEngine
+from src.load_data import DataLoader
+from src.orchestrator import run_full_pipeline, run_queue_worker, run_queue_reducer
+from src.telemetry import Telemetry
+from src.work_queue import FileWorkQueue, LeaseLost
+from src.weekly_pipeline import WeeklyPipeline
+from tests.test_weekly_pipeline import write_raw_weeks
+
+def test_claims_are_exclusive_and_expired_leases_are_taken_over(tmp_path):
+    first = FileWorkQueue(str(tmp_path), lease_seconds=0.3, worker_id='a')
+    second = FileWorkQueue(str(tmp_path), lease_seconds=0.3, worker_id='b')
+    first.enqueue({'week_01': {'week': '01'}})
+    second.enqueue({'week_01': {'week': 'ignored'}})
+
+    assert first.claim() == ('week_01', 1)
+    assert second.claim() is None
+    assert second.spec('week_01') == {'week': '01'}
+
+    # 'a' crashes (no heartbeat); after the lease runs out 'b' takes over
+    time.sleep(0.4)
+    assert second.status()['expired'] == 1
+    assert second.claim() == ('week_01', 2)
+
+    with pytest.raises(LeaseLost):
+        first.complete('week_01', 1, {})
+    second.complete('week_01', 2, {'plays': 3})
+
+    assert second.all_done()
+    assert first.result('week_01')['worker'] == 'b'
+
+def _queue_worker(cfg_kwargs):
+    cfg = DataPipelineConfig(**cfg_kwargs)
+    loader = DataLoader(cfg.DATA_DIR, cfg.SUPP_FILE)
+    run_queue_worker(cfg, loader, EraserEngine(), Telemetry('worker', enabled=False))
+
+def test_queue_workers_and_reducer_match_batch(tmp_path):
+    """
+    Several local worker processes + a crashed claim; the reducer re-runs the orphaned
+    week after its lease expires and the outputs match the batch pipeline.
+    """
+    data_dir, supp_file = write_raw_weeks(str(tmp_path / 'raw'), weeks=(1, 2, 3))
+    cfg_kwargs = dict(DATA_DIR=data_dir, SUPP_FILE=supp_file, OUTPUT_DIR=str(tmp_path / 'queue_out'),
+                      EXECUTION_MODE='queue', QUEUE_DIR=str(tmp_path / 'queue'), QUEUE_LEASE_SECONDS=1)
+    cfg = DataPipelineConfig(**cfg_kwargs)
+
+    # A worker that claimed week 03 and died
+    crashed = FileWorkQueue(cfg.QUEUE_DIR, lease_seconds=1, worker_id='crashed')
+    crashed.enqueue({'week_03': {'week': '03'}})
+    assert crashed.claim() == ('week_03', 1)
+
+    ctx = multiprocessing.get_context('fork')
+    workers = [ctx.Process(target=_queue_worker, args=(cfg_kwargs,)) for _ in range(2)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(timeout=120)
+        assert p.exitcode == 0
+
+    loader = DataLoader(data_dir, supp_file)
+    exporter = DataExporter(cfg.OUTPUT_DIR)
+    run_queue_reducer(cfg, loader, exporter, EraserEngine(), Telemetry('reduce', enabled=False),
+                      poll_seconds=0.2, timeout=60)
+
+    queue = FileWorkQueue(cfg.QUEUE_DIR)
+    assert queue.all_done()
+    assert queue.result('week_03')['attempt'] == 2
+
+    batch_dir = str(tmp_path / 'batch')
+    run_full_pipeline(data_dir, supp_file, batch_dir, use_cache=False, mode='batch')
+    for name in ['eraser_analysis_summary.csv', 'master_animation_data.csv']:
+        pd.testing.assert_frame_equal(pd.read_csv(os.path.join(batch_dir, name)),
+                                      pd.read_csv(os.path.join(cfg.OUTPUT_DIR, name)), check_exact=False)
+
+def test_stale_writer_never_replaces_a_landed_week(tmp_path):
+    """
+    A worker that lost its lease discards its copy instead of swapping out the owner's week,
+    and the reducer's week list comes from the done records.
+    """
+    data_dir, supp_file = write_raw_weeks(str(tmp_path / 'raw'), weeks=(1,))
+    loader = DataLoader(data_dir, supp_file)
+    weekly = WeeklyPipeline(str(tmp_path / 'weekly'))
+    clean_context = weekly.processor.filter_context(loader.load_supplementary())
+
+    weekly.process_week('01', *loader.load_week('01'), clean_context)
+    landed = os.stat(os.path.join(weekly.week_dir(1), WeeklyPipeline.MARKER)).st_mtime_ns
+
+    with pytest.raises(LeaseLost):
+        weekly.process_week('01', *loader.load_week('01'), clean_context, owns=lambda: False)
+    assert os.stat(os.path.join(weekly.week_dir(1), WeeklyPipeline.MARKER)).st_mtime_ns == landed
+    assert not [d for d in os.listdir(weekly.work_dir) if '.tmp' in d]
+
+    queue = FileWorkQueue(str(tmp_path / 'queue'))
+    queue.enqueue({'week_01': {'week': '01'}, 'week_02': {'week': '02'}})
+    task, attempt = queue.claim()
+    queue.complete(task, attempt, {'week': 1})
+    assert [r['week'] for r in queue.results()] == [1]
+    with pytest.raises(TimeoutError):
+        queue.wait_all(poll_seconds=0.01, timeout=0.05)
+
+    def help_out():
+        claimed = queue.claim()
+        if claimed:
+            queue.complete(*claimed, {'week': 2})
+
+    queue.wait_all(poll_seconds=0.01, timeout=5, work=help_out)
+    assert [r['week'] for r in queue.results()] == [1, 2]